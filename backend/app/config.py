@@ -35,8 +35,29 @@ class Settings(BaseSettings):
     
     # AI Service
     GEMINI_MODEL: str = "gemini-1.5-flash"
-    AI_TIMEOUT: int = 30
+    AI_TIMEOUT: int = 30  # seconds per Gemini call, including the wait for a slot; then the mock answers
+    AI_MAX_CONCURRENCY: int = 4  # Gemini calls in flight per worker
     AI_PROVIDER: str = "gemini"
+    
+    # Simulation
+    MONTE_CARLO_CHUNK_SIZE: int = 65536
+    SCENARIO_DEFINITIONS_DIR: str = ""  # empty uses the bundled app/scenarios
+    SCENARIO_RELOAD_INTERVAL: float = 5.0  # seconds between checks for edited definitions
+    SIMULATION_CACHE_ENABLED: bool = True
+    SIMULATION_CACHE_PATH: str = "./simulation_cache.db"
+    SIMULATION_CACHE_SIZE: int = 4096  # entries kept in each worker's memory
+    SIMULATION_WORKERS: int = 0  # process pool size for background jobs; 0 uses every core
+    SIMULATION_JOB_RETENTION: int = 3600  # seconds finished jobs stay queryable
+    SIMULATION_JOBS_PER_USER: int = 4  # unfinished background jobs one user may have at once
+    SIMULATION_RETAINED_JOBS_PER_USER: int = 20  # finished jobs kept per user; older ones are dropped first
+    POPULATION_DATA_DIR: str = "./data/population"  # memory-mapped synthetic populations
+    POPULATION_AGENTS: int = 0  # population warmed in the background at startup; 0 generates on first use
+    POPULATION_SEED: int = 42
+    POPULATION_OPEN_LIMIT: int = 4  # populations each worker keeps memory-mapped
+    POPULATION_STORE_LIMIT: int = 6  # population directories kept on disk; least recently used are deleted
+    MICRO_AGENT_SIZES: List[int] = [100000, 1000000, 10000000]  # sizes any user may run at POPULATION_SEED; others are admin-only
+    CALIBRATION_DIR: str = "./data/calibration"  # versioned calibration artifacts
+    CALIBRATION_PATH: str = "./data/calibration/current.json"  # the active artifact every worker loads
 
 
     # Logging
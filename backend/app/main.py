@@ -1,14 +1,22 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from contextlib import asynccontextmanager
 from datetime import datetime
+import asyncio
 import logging
 
 from app.routers import transparency
 from app.config import get_settings
-from app.database import create_tables
+from app.database import create_tables, engine
+from app.services.result_cache import simulation_cache
+from app.services.job_manager import job_manager
+from app.services.ai_service import ai_service
+from app.services.synthetic_population import population_store
+from app.services.simulation_analytics import simulation_analytics
+from app.services.history import history_paginator
+from app.services.live_simulation import LiveSimulationSession
 from app.routers import auth, documents, dashboard, simulation, feedback
 from app.routers.documents_test import router as documents_test_router
 from app.utils.exceptions import CivicSimException
@@ -25,6 +33,10 @@ origins = [
     "http://127.0.0.1:3000",
 ]
 
+def _log_population_warming(future: asyncio.Future) -> None:
+    if not future.cancelled() and future.exception():
+        logger.error(f"Failed to prepare synthetic population: {future.exception()}")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Initialize database tables on startup
@@ -33,7 +45,37 @@ async def lifespan(app: FastAPI):
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.exception(f"Failed to initialize database: {e}")
+    
+    # Generated JSON columns and indexes for the simulation analytics API
+    try:
+        simulation_analytics.ensure_schema(engine)
+    except Exception as e:
+        logger.exception(f"Failed to prepare simulation analytics columns: {e}")
+    
+    # Composite indexes behind keyset-paginated history
+    try:
+        history_paginator.ensure_indexes(engine)
+    except Exception as e:
+        logger.exception(f"Failed to create history indexes: {e}")
+    
+    # Saved simulations remember their result cache key so explanations are shared
+    try:
+        simulation_cache.ensure_run_key_column(engine)
+    except Exception as e:
+        logger.exception(f"Failed to add the simulation result key column: {e}")
+    
+    # Drop cached results computed with scenario definitions that have since changed
+    simulation_cache.prune_stale()
+    
+    # Optionally warm a synthetic population without delaying startup; workers share the mapped files
+    if settings.POPULATION_AGENTS > 0:
+        warming = asyncio.get_running_loop().run_in_executor(
+            None, population_store.open, settings.POPULATION_AGENTS, settings.POPULATION_SEED
+        )
+        warming.add_done_callback(_log_population_warming)
     yield
+    job_manager.shutdown()
+    ai_service.shutdown()
 
 app = FastAPI(title="Civic-Sim API", lifespan=lifespan)
 
@@ -60,31 +102,130 @@ app.include_router(transparency.router)
 async def health():
     return {"status": "ok", "timestamp": datetime.utcnow().isoformat()}
 
+async def _websocket_user(message: dict, db):
+    """Resolve the user of a WebSocket message from its ``token``"""
+    from fastapi.security import HTTPAuthorizationCredentials
+    from app.services.auth_service import get_current_user
+    
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=message.get("token") or "")
+    return await get_current_user(credentials, db)
+
+async def _own_job(message: dict):
+    """The job named by a WebSocket message, if the message's token belongs to its owner"""
+    from fastapi import HTTPException
+    from app.database import SessionLocal
+    
+    job = job_manager.get(message.get("job_id"))
+    if job is None:
+        return None
+    db = SessionLocal()
+    try:
+        current_user = await _websocket_user(message, db)
+    except HTTPException:
+        return None
+    finally:
+        db.close()
+    return job if job.user_id == current_user.id else None
+
+async def _commit_live_simulation(message: dict, send) -> None:
+    """Persist a simulation the client committed over the WebSocket"""
+    from fastapi import HTTPException
+    from app.database import SessionLocal
+    from app.schemas.simulation import SimulationRequest
+    
+    db = SessionLocal()
+    try:
+        simulation_request = SimulationRequest(**{
+            key: value for key, value in message.items()
+            if key in ("scenario_name", "parameters", "mode", "projection")
+        })
+        current_user = await _websocket_user(message, db)
+        response = await simulation.save_simulation_run(simulation_request, current_user, db)
+        await send({"type": "committed", "seq": message.get("seq"), **response})
+    except HTTPException as e:
+        await send({"type": "error", "seq": message.get("seq"), "message": e.detail})
+    except ValueError as e:
+        await send({"type": "error", "seq": message.get("seq"), "message": str(e)})
+    except Exception as e:
+        # The run is saved even if the client left before the reply
+        logger.warning(f"Could not complete WebSocket commit: {e}")
+    finally:
+        db.close()
+
 # Add WebSocket endpoint
 @app.websocket("/ws")
-async def websocket_endpoint(websocket):
-    from fastapi import WebSocket, WebSocketDisconnect
+async def websocket_endpoint(websocket: WebSocket):
+    """Echo, live slider simulation, commits and background job progress.
+
+    ``simulate`` frames are coalesced and answered with numeric outcomes;
+    ``commit`` (with a ``token``) saves the run's outcomes and
+    completes even if the client disconnects;
+    ``subscribe_job`` and ``cancel_job`` (with the owner's ``token``) follow
+    or stop a background simulation job.
+    """
     import json
     
     await websocket.accept()
     logger.info("WebSocket connection established")
+    
+    send_lock = asyncio.Lock()
+    
+    async def send(message: dict):
+        async with send_lock:
+            await websocket.send_text(json.dumps(message))
+    
+    # Job progress is queued here and forwarded by a separate sender task
+    outgoing = asyncio.Queue()
+    
+    async def send_outgoing():
+        while True:
+            await send(await outgoing.get())
+    
+    sender = asyncio.create_task(send_outgoing())
+    live_session = LiveSimulationSession(send)
+    commits = set()
     try:
         while True:
             data = await websocket.receive_text()
             message = json.loads(data) if data else {}
-            logger.info(f"Received WebSocket message: {message}")
+            
+            if message.get("type") == "simulate":
+                live_session.update(message)
+                continue
+            
+            logger.info(f"Received WebSocket message: {message.get('type')}")
+            
+            if message.get("type") == "commit":
+                commit = asyncio.create_task(_commit_live_simulation(message, send))
+                commits.add(commit)
+                commit.add_done_callback(commits.discard)
+                continue
+            if message.get("type") == "subscribe_job":
+                job = await _own_job(message)
+                if job is None or not job_manager.subscribe(job.id, outgoing):
+                    outgoing.put_nowait({"type": "error", "message": "Unknown simulation job"})
+                continue
+            if message.get("type") == "cancel_job":
+                job = await _own_job(message)
+                if job and outgoing in job.subscribers:
+                    job_manager.cancel(job.id)
+                continue
             
             response = {
                 "type": "echo",
                 "message": f"Server received: {data}",
                 "timestamp": datetime.utcnow().isoformat()
             }
-            await websocket.send_text(json.dumps(response))
+            outgoing.put_nowait(response)
     except WebSocketDisconnect:
         logger.info("WebSocket connection closed")
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
         await websocket.close()
+    finally:
+        sender.cancel()
+        live_session.close()
+        job_manager.disconnect(outgoing)
 
 # Exception handlers
 @app.exception_handler(CivicSimException)
@@ -14,10 +14,11 @@ from app.schemas.corruption_analysis import CorruptionAnalysisResponse
 from app.database import get_database
 from app.models.user import User
 from app.models.document import Document
-from app.schemas.document import DocumentResponse, DocumentVerificationResult, DocumentUpload, BinaryVerificationRequest
+from app.schemas.document import DocumentResponse, DocumentHistoryPage, DocumentVerificationResult, DocumentUpload, BinaryVerificationRequest
 from app.services.auth_service import get_current_user
 from app.services.document_processor import document_processor
 from app.services.ai_service import ai_service
+from app.services.history import history_paginator
 from app.utils.exceptions import DocumentProcessingException, AIServiceException
 
 router = APIRouter()
@@ -195,19 +196,34 @@ async def verify_document(
             detail="Document verification failed"
         )
 
-@router.get("/history", response_model=List[DocumentResponse])
+@router.get("/history", response_model=DocumentHistoryPage)
 async def get_user_documents(
-    skip: int = 0,
-    limit: int = 20,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_database)
 ):
-    """Get user's document verification history"""
-    documents = db.query(Document).filter(
-        Document.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
-    
-    return documents
+    """Get user's document verification history, newest first.
+
+    Pass ``next_cursor`` from one page as ``cursor`` to get the next. Items
+    leave out the AI analysis text; fetch /{document_id} for the full record.
+    """
+    try:
+        return history_paginator.page(db, Document, current_user.id, [
+            Document.id,
+            Document.filename,
+            Document.document_type,
+            Document.verdict,
+            Document.confidence_score,
+            Document.suspicious_elements,
+            Document.processing_status,
+            Document.created_at,
+        ], cursor, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 @router.get("/{document_id}", response_model=DocumentResponse)
 async def get_document(
@@ -1,74 +1,163 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
+from datetime import datetime
+import json
 import time
 import logging
+import numpy as np
 
-from app.database import get_database
+from app.config import get_settings
+from app.database import SessionLocal, get_database
 from app.models.user import User
 from app.models.simulation import PolicySimulation
-from app.schemas.simulation import SimulationRequest, SimulationResponse, SimulationResult
-from app.services.auth_service import get_current_user
+from app.schemas.simulation import SimulationRequest, SimulationResponse, SimulationHistoryPage, SimulationResult, BatchSimulationRequest, SweepRequest, MonteCarloRequest, SensitivityRequest, GoalSeekRequest, ParetoRequest, PortfolioRequest, RegionalSimulationRequest, MonteCarloJobRequest, SpilloverRequest, MicroSimulationRequest, CompareRequest
+from app.services.auth_service import get_current_user, require_admin
+from app.services.scenario_registry import scenario_registry
+from app.services.result_cache import simulation_cache
 from app.services.simulation_engine import simulation_engine
+from app.services.regional_baselines import regional_baselines
+from app.services.monte_carlo import run_monte_carlo
+from app.services.job_manager import job_manager
+from app.services.sensitivity_analysis import sensitivity_service
+from app.services.goal_seek import goal_seek_service
+from app.services.pareto import pareto_service
+from app.services.portfolio import portfolio_service
+from app.services.microsimulation import micro_simulation
+from app.services.synthetic_population import population_store
+from app.services.calibration import calibration_service
+from app.services.simulation_analytics import simulation_analytics
+from app.services.comparison import comparison_service
+from app.services.history import history_paginator
+from app.services.simulation_export import EXPORT_FORMATS, simulation_exporter
 from app.services.ai_service import ai_service
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
-@router.post("/run", response_model=Dict[str, Any], status_code=status.HTTP_201_CREATED)
-async def run_policy_simulation(
-    simulation_request: SimulationRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_database)
-):
-    """Run a policy impact simulation"""
-    start_time = time.time()
+def compute_simulation_run(simulation_request: SimulationRequest) -> Dict[str, Any]:
+    """Numeric outcomes for one run, from the result cache when possible.
+
+    ``ai_explanation`` is None unless a cached result already has one.
+    """
+    parameters = simulation_request.parameters.dict()
+    options = {"mode": simulation_request.mode}
+    if simulation_request.mode == "projection":
+        options["projection"] = simulation_request.projection.dict()
+    cache_key = simulation_cache.make_key(simulation_request.scenario_name, parameters, options)
+    cached = simulation_cache.get(cache_key)
     
-    try:
-        # Run the simulation
-        outcomes = simulation_engine.run_simulation(
-            simulation_request.scenario_name, 
-            simulation_request.parameters
-        )
-        
+    if cached:
+        return {**cached, "cache_key": cache_key, "cached": True}
+    
+    # Run the simulation
+    outcomes = simulation_engine.run_simulation(
+        simulation_request.scenario_name, 
+        simulation_request.parameters,
+        mode=simulation_request.mode,
+        projection=simulation_request.projection.dict()
+    )
+    
+    return {
+        "outcomes": outcomes,
+        "ai_explanation": None,
+        "assumptions": simulation_engine.get_simulation_assumptions(simulation_request.scenario_name),
+        "cache_key": cache_key,
+        "cached": False,
+    }
+
+def store_simulation_run(simulation_request: SimulationRequest, user_id: Any, computed: Dict[str, Any], db: Session, start_time: float) -> PolicySimulation:
+    """Cache a computed run and save the record.
+
+    The explanation is left empty unless the cached result already had one;
+    GET /{simulation_id}/explanation generates it on first request.
+    """
+    outcomes = computed["outcomes"]
+    if not computed["cached"] and "error" not in outcomes:
+        simulation_cache.set(computed["cache_key"], simulation_request.scenario_name, {
+            "outcomes": outcomes,
+            "ai_explanation": None,
+            "assumptions": computed["assumptions"],
+        })
+    
+    processing_time = time.time() - start_time
+    
+    # Save simulation to database
+    simulation_record = PolicySimulation(
+        user_id=user_id,
+        scenario_name=simulation_request.scenario_name,
+        parameters=simulation_request.parameters.dict(),
+        predicted_outcomes=outcomes,
+        ai_explanation=computed["ai_explanation"],
+        confidence_level="medium",
+        assumptions=computed["assumptions"],
+        processing_time=processing_time
+    )
+    
+    db.add(simulation_record)
+    db.flush()
+    simulation_cache.link_run(db, simulation_record.id, computed["cache_key"])
+    db.commit()
+    db.refresh(simulation_record)
+    return simulation_record
+
+async def explain_stored_simulation(simulation: PolicySimulation, db: Session) -> bool:
+    """Store a saved simulation's explanation if it has none.
+
+    An explanation already cached for the same run is reused; otherwise one
+    is generated and written back to the cache entry, so later identical
+    runs are saved with it. Returns True when the row was updated. The row
+    is only updated while still empty, so concurrent first requests store
+    one text.
+    """
+    if simulation.ai_explanation:
+        return False
+    
+    cache_key = simulation_cache.run_key(db, simulation.id)
+    cached = simulation_cache.get(cache_key)
+    ai_explanation = cached.get("ai_explanation") if cached else None
+    if not ai_explanation:
         # Get AI explanation
         ai_explanation = await ai_service.explain_policy_simulation(
-            simulation_request.scenario_name,
-            simulation_request.parameters.dict(),
-            outcomes
+            simulation.scenario_name,
+            simulation.parameters,
+            simulation.predicted_outcomes
         )
-        
-        # Get simulation assumptions
-        assumptions = simulation_engine.get_simulation_assumptions(simulation_request.scenario_name)
-        
-        processing_time = time.time() - start_time
-        
-        # Save simulation to database
-        simulation_record = PolicySimulation(
-            user_id=current_user.id,
-            scenario_name=simulation_request.scenario_name,
-            parameters=simulation_request.parameters.dict(),
-            predicted_outcomes=outcomes,
-            ai_explanation=ai_explanation,
-            confidence_level="medium",
-            assumptions=assumptions,
-            processing_time=processing_time
-        )
-        
-        db.add(simulation_record)
-        db.commit()
-        db.refresh(simulation_record)
+        if cached:
+            simulation_cache.set(cache_key, simulation.scenario_name, {**cached, "ai_explanation": ai_explanation})
+    
+    db.query(PolicySimulation).filter(
+        PolicySimulation.id == simulation.id,
+        or_(PolicySimulation.ai_explanation.is_(None), PolicySimulation.ai_explanation == "")
+    ).update({PolicySimulation.ai_explanation: ai_explanation}, synchronize_session=False)
+    db.commit()
+    db.refresh(simulation)
+    return True
+
+async def save_simulation_run(simulation_request: SimulationRequest, current_user: User, db: Session) -> Dict[str, Any]:
+    """Simulate and persist one run; shared by POST /run and WebSocket commits"""
+    start_time = time.time()
+    
+    try:
+        computed = compute_simulation_run(simulation_request)
+        simulation_record = store_simulation_run(simulation_request, current_user.id, computed, db, start_time)
         
         return {
             "status": "success",
             "simulation_id": simulation_record.id,
             "results": {
                 "scenario_name": simulation_request.scenario_name,
-                "predicted_outcomes": outcomes,
-                "ai_explanation": ai_explanation,
+                "predicted_outcomes": simulation_record.predicted_outcomes,
+                "ai_explanation": simulation_record.ai_explanation,
+                "explanation_url": f"/simulation/{simulation_record.id}/explanation",
                 "confidence_level": "medium",
-                "assumptions": assumptions,
-                "processing_time": f"{processing_time:.2f}s",
+                "assumptions": computed["assumptions"],
+                "processing_time": f"{simulation_record.processing_time:.2f}s",
+                "cached": computed["cached"],
                 "disclaimer": "These are simplified projections for educational purposes. Real-world outcomes may vary significantly."
             }
         }
@@ -80,61 +169,939 @@ async def run_policy_simulation(
             detail="Simulation failed. Please try again."
         )
 
+def submit_simulation_run(simulation_request: SimulationRequest, current_user: User) -> Dict[str, Any]:
+    """Compute outcomes now and leave saving and explaining to a background job.
+
+    The job saves the run, generates its explanation ahead of the first
+    GET /{simulation_id}/explanation and publishes its status (and then the
+    simulation id and explanation) to WebSocket subscribers of its id. It
+    keeps running if the client disconnects, so the run is always stored.
+    """
+    start_time = time.time()
+    
+    try:
+        computed = compute_simulation_run(simulation_request)
+    except Exception as e:
+        logger.error(f"Simulation failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Simulation failed. Please try again."
+        )
+    
+    async def runner(job) -> Dict[str, Any]:
+        db = SessionLocal()
+        try:
+            simulation_record = store_simulation_run(simulation_request, current_user.id, computed, db, start_time)
+            await explain_stored_simulation(simulation_record, db)
+            job.summary = {
+                "simulation_id": simulation_record.id,
+                "ai_explanation": simulation_record.ai_explanation,
+            }
+            return job.summary
+        finally:
+            db.close()
+    
+    job = job_manager.submit_task("simulation_run", current_user.id, runner, cancellable=False)
+    
+    return {
+        "status": "accepted",
+        "job": job.to_dict(),
+        "results": {
+            "scenario_name": simulation_request.scenario_name,
+            "predicted_outcomes": computed["outcomes"],
+            "assumptions": computed["assumptions"],
+            "processing_time": f"{time.time() - start_time:.3f}s",
+            "cached": computed["cached"],
+            "disclaimer": "These are simplified projections for educational purposes. Real-world outcomes may vary significantly."
+        }
+    }
+
+@router.post("/run", response_model=Dict[str, Any], status_code=status.HTTP_201_CREATED)
+async def run_policy_simulation(
+    simulation_request: SimulationRequest,
+    response: Response,
+    background: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_database)
+):
+    """Run a policy impact simulation and save its outcomes.
+
+    The AI explanation is generated on demand by GET /{simulation_id}/explanation.
+    With ``background=true`` the numeric outcomes come back at once (202)
+    with a job id; subscribe to it over /ws or poll /jobs/{job_id} for the
+    saved simulation id and explanation.
+    """
+    if background:
+        response.status_code = status.HTTP_202_ACCEPTED
+        return submit_simulation_run(simulation_request, current_user)
+    return await save_simulation_run(simulation_request, current_user, db)
+
+def _to_columns(outcomes: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert batch outcome arrays (and nested projection series) to JSON lists"""
+    return {
+        key: _to_columns(value) if isinstance(value, dict)
+        else value if isinstance(value, str)
+        else simulation_engine.to_jsonable(value)
+        for key, value in outcomes.items()
+    }
+
+@router.post("/run-batch", response_model=Dict[str, Any])
+async def run_batch_simulation(
+    batch_request: BatchSimulationRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Evaluate many parameter combinations of one scenario in a single pass.
+
+    Results are columnar: each outcome maps to a list aligned with the input
+    parameter columns. Evaluation and conversion run on a worker thread.
+    Batch runs are not saved and carry no AI explanation.
+    """
+    start_time = time.time()
+    
+    def evaluate() -> Dict[str, Any]:
+        outcomes = simulation_engine.run_batch(
+            batch_request.scenario_name,
+            batch_request.parameters,
+            mode=batch_request.mode,
+            projection=batch_request.projection.dict()
+        )
+        return _to_columns(outcomes)
+    
+    try:
+        predicted_outcomes = await run_in_threadpool(evaluate)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Batch simulation failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Batch simulation failed. Please try again."
+        )
+    
+    processing_time = time.time() - start_time
+    
+    return {
+        "status": "success",
+        "results": {
+            "scenario_name": batch_request.scenario_name,
+            "count": len(next(iter(batch_request.parameters.values()))),
+            "predicted_outcomes": predicted_outcomes,
+            "assumptions": simulation_engine.get_simulation_assumptions(batch_request.scenario_name),
+            "processing_time": f"{processing_time:.2f}s",
+            "disclaimer": "These are simplified projections for educational purposes. Real-world outcomes may vary significantly."
+        }
+    }
+
+def _iter_sweep_ndjson(scenario_name: str, axes: Dict[str, np.ndarray], outcomes: Dict[str, Any]) -> Iterator[str]:
+    """Yield a sweep grid as NDJSON: a header, one line per first-axis slice, a footer"""
+    shape = [len(values) for values in axes.values()]
+    numeric = {key: value for key, value in outcomes.items() if not isinstance(value, str)}
+    
+    yield json.dumps({
+        "type": "header",
+        "scenario_name": scenario_name,
+        "axes": {name: values.tolist() for name, values in axes.items()},
+        "shape": shape,
+        "outcomes": list(numeric),
+        "error": outcomes.get("error")
+    }) + "\n"
+    
+    for index in range(shape[0]):
+        yield json.dumps({
+            "type": "slice",
+            "index": index,
+            "outcomes": {key: value[index].ravel().tolist() for key, value in numeric.items()}
+        }) + "\n"
+    
+    yield json.dumps({"type": "end", "cells": int(np.prod(shape))}) + "\n"
+
+@router.post("/sweep")
+async def run_parameter_sweep(
+    sweep_request: SweepRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Stream the outcome grid of a two or three parameter sweep as NDJSON.
+
+    The grid is evaluated in one vectorized pass on a worker thread, and
+    lines are encoded on worker threads as the response streams. Each
+    ``slice`` line holds the outcomes for one point of the first axis,
+    flattened in C order over the remaining axes. Sweeps are not saved and carry no AI explanation.
+    """
+    axes = {
+        name: np.linspace(sweep_range.start, sweep_range.stop, sweep_range.steps)
+        for name, sweep_range in sweep_request.ranges.items()
+    }
+    
+    try:
+        outcomes = await run_in_threadpool(
+            simulation_engine.run_sweep,
+            sweep_request.scenario_name,
+            axes,
+            sweep_request.fixed_parameters.dict()
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Parameter sweep failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Parameter sweep failed. Please try again."
+        )
+    
+    return StreamingResponse(
+        _iter_sweep_ndjson(sweep_request.scenario_name, axes, outcomes),
+        media_type="application/x-ndjson"
+    )
+
+@router.post("/monte-carlo", response_model=Dict[str, Any])
+async def run_monte_carlo_simulation(
+    monte_carlo_request: MonteCarloRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Run a seeded Monte Carlo simulation and return p5/p50/p95 bands per outcome.
+
+    Model constants and user parameters are sampled around their point values;
+    samples are reduced chunk by chunk so memory use is independent of the
+    sample count. Larger runs belong on /jobs/monte-carlo.
+    """
+    start_time = time.time()
+    
+    try:
+        # Up to MAX_MONTE_CARLO_SAMPLES draws: run on a worker thread so the event loop keeps serving
+        results = await run_in_threadpool(
+            run_monte_carlo,
+            monte_carlo_request.scenario_name,
+            monte_carlo_request.parameters.dict(),
+            samples=monte_carlo_request.samples,
+            seed=monte_carlo_request.seed,
+            parameter_uncertainty={name: spec.dict() for name, spec in monte_carlo_request.parameter_uncertainty.items()},
+            constant_uncertainty={name: spec.dict() for name, spec in monte_carlo_request.constant_uncertainty.items()}
+        )
+    except (ValueError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Monte Carlo simulation failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Monte Carlo simulation failed. Please try again."
+        )
+    
+    processing_time = time.time() - start_time
+    results["processing_time"] = f"{processing_time:.2f}s"
+    results["disclaimer"] = "Percentile bands reflect assumed input uncertainty only, not all real-world risk."
+    
+    return {
+        "status": "success",
+        "results": results
+    }
+
+def _get_own_job(job_id: str, current_user: User):
+    job = job_manager.get(job_id)
+    if not job or job.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Simulation job not found"
+        )
+    return job
+
+@router.post("/jobs/monte-carlo", response_model=Dict[str, Any], status_code=status.HTTP_202_ACCEPTED)
+async def submit_monte_carlo_job(
+    monte_carlo_request: MonteCarloJobRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Run a Monte Carlo simulation on the background process pool.
+
+    Returns a job id immediately. Send ``{"type": "subscribe_job", "job_id": ..., "token": ...}``
+    over /ws for progress; the job is cancelled if every subscriber disconnects.
+    """
+    try:
+        job = job_manager.submit_monte_carlo(
+            current_user.id,
+            monte_carlo_request.scenario_name,
+            monte_carlo_request.parameters.dict(),
+            samples=monte_carlo_request.samples,
+            seed=monte_carlo_request.seed,
+            parameter_uncertainty={name: spec.dict() for name, spec in monte_carlo_request.parameter_uncertainty.items()},
+            constant_uncertainty={name: spec.dict() for name, spec in monte_carlo_request.constant_uncertainty.items()}
+        )
+    except (ValueError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return {
+        "status": "success",
+        **job.to_dict()
+    }
+
+@router.post("/jobs/sweep", response_model=Dict[str, Any], status_code=status.HTTP_202_ACCEPTED)
+async def submit_sweep_job(
+    sweep_request: SweepRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Evaluate a parameter sweep on the background process pool.
+
+    The finished grid is streamed from ``/jobs/{job_id}/result`` in the same
+    NDJSON format as ``/sweep``.
+    """
+    axes = {
+        name: np.linspace(sweep_range.start, sweep_range.stop, sweep_range.steps)
+        for name, sweep_range in sweep_request.ranges.items()
+    }
+    job = job_manager.submit_sweep(
+        current_user.id,
+        sweep_request.scenario_name,
+        axes,
+        sweep_request.fixed_parameters.dict()
+    )
+    
+    return {
+        "status": "success",
+        **job.to_dict()
+    }
+
+@router.get("/jobs/{job_id}", response_model=Dict[str, Any])
+async def get_simulation_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Get a background job's status; finished Monte Carlo jobs include their results"""
+    job = _get_own_job(job_id, current_user)
+    response = {"status": "success", "job": job.to_dict()}
+    if job.status == "completed" and job.kind in ("monte_carlo", "simulation_run"):
+        response["results"] = job.result
+    return response
+
+@router.get("/jobs/{job_id}/result")
+async def get_sweep_job_result(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Stream the grid of a finished sweep job as NDJSON"""
+    job = _get_own_job(job_id, current_user)
+    if job.kind != "sweep" or job.status != "completed":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job has no sweep result to stream (status: {job.status})"
+        )
+    
+    return StreamingResponse(
+        _iter_sweep_ndjson(job.result["scenario_name"], job.result["axes"], job.result["outcomes"]),
+        media_type="application/x-ndjson"
+    )
+
+@router.delete("/jobs/{job_id}")
+async def cancel_simulation_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Cancel a queued or running background job"""
+    job = _get_own_job(job_id, current_user)
+    if not job_manager.cancel(job_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job already {job.status}"
+        )
+    
+    return {"status": "success", "message": "Simulation job cancelled"}
+
+@router.post("/sensitivity", response_model=Dict[str, Any])
+async def run_sensitivity_analysis(
+    sensitivity_request: SensitivityRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Rank which sliders matter most for each outcome (Morris and/or Sobol)"""
+    start_time = time.time()
+    
+    try:
+        results = sensitivity_service.analyze(
+            sensitivity_request.scenario_name,
+            method=sensitivity_request.method,
+            trajectories=sensitivity_request.trajectories,
+            levels=sensitivity_request.levels,
+            samples=sensitivity_request.samples,
+            seed=sensitivity_request.seed
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Sensitivity analysis failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Sensitivity analysis failed. Please try again."
+        )
+    
+    results["processing_time"] = f"{time.time() - start_time:.2f}s"
+    
+    return {
+        "status": "success",
+        "results": results
+    }
+
+@router.post("/goal-seek", response_model=Dict[str, Any])
+async def run_goal_seek(
+    goal_seek_request: GoalSeekRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Find parameters that meet outcome targets, optionally optimizing one outcome.
+
+    Returns the best parameters found, their outcomes and the per-round search
+    trace. When no candidate meets every constraint, ``feasible`` is false and
+    the closest candidate is returned.
+    """
+    start_time = time.time()
+    
+    try:
+        results = goal_seek_service.solve(
+            goal_seek_request.scenario_name,
+            [constraint.dict() for constraint in goal_seek_request.constraints],
+            objective=goal_seek_request.objective.dict() if goal_seek_request.objective else None,
+            fixed=goal_seek_request.fixed_parameters,
+            bounds=goal_seek_request.bounds,
+            seed=goal_seek_request.seed
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Goal seek failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Goal seek failed. Please try again."
+        )
+    
+    results["processing_time"] = f"{time.time() - start_time:.2f}s"
+    
+    return {
+        "status": "success",
+        "results": results
+    }
+
+@router.post("/pareto", response_model=Dict[str, Any])
+async def compute_pareto_frontier(
+    pareto_request: ParetoRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Return the non-dominated trade-off set across one or more scenarios.
+
+    ``samples`` parameter sets are drawn per scenario within its slider
+    ranges; the frontier is sorted by the first objective and thinned to
+    at most ``max_points`` points.
+    """
+    start_time = time.time()
+    
+    try:
+        results = await run_in_threadpool(
+            pareto_service.compute,
+            pareto_request.scenario_names,
+            [objective.dict() for objective in pareto_request.objectives],
+            samples=pareto_request.samples,
+            seed=pareto_request.seed,
+            max_points=pareto_request.max_points
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Pareto frontier computation failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Pareto frontier computation failed. Please try again."
+        )
+    
+    results["processing_time"] = f"{time.time() - start_time:.2f}s"
+    
+    return {
+        "status": "success",
+        "results": results
+    }
+
+@router.post("/regional", response_model=Dict[str, Any])
+async def run_regional_simulation(
+    regional_request: RegionalSimulationRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Simulate a scenario for all states/UTs at once.
+
+    ``outcomes`` maps each outcome to one value per region, aligned with
+    ``regions``; ``national`` holds the roll-up. Regional runs are not saved.
+    """
+    start_time = time.time()
+    
+    try:
+        results = simulation_engine.run_regional(
+            regional_request.scenario_name,
+            regional_request.parameters.dict()
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Regional simulation failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Regional simulation failed. Please try again."
+        )
+    
+    return {
+        "status": "success",
+        "results": {
+            "scenario_name": regional_request.scenario_name,
+            "regions": [
+                {"code": code, "name": name}
+                for code, name in zip(regional_baselines.codes, regional_baselines.names)
+            ],
+            "outcomes": _to_columns(results["regions"]),
+            "national": _to_columns(results["national"]),
+            "processing_time": f"{time.time() - start_time:.3f}s"
+        }
+    }
+
+@router.post("/spillover", response_model=Dict[str, Any])
+async def run_spillover_simulation(
+    spillover_request: SpilloverRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Break a scenario's spending down into output and jobs induced in each sector"""
+    start_time = time.time()
+    
+    try:
+        results = simulation_engine.run_spillover(
+            spillover_request.scenario_name,
+            spillover_request.parameters.dict()
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Spillover simulation failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Spillover simulation failed. Please try again."
+        )
+    
+    return {
+        "status": "success",
+        "results": {
+            "scenario_name": spillover_request.scenario_name,
+            **results,
+            "processing_time": f"{time.time() - start_time:.3f}s"
+        }
+    }
+
+@router.post("/micro", response_model=Dict[str, Any])
+async def run_micro_simulation(
+    micro_request: MicroSimulationRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Simulate the education or agriculture scenario household by household.
+
+    Outcomes carry the same keys as /run; the synthetic population for a
+    given (agents, seed) is generated once and reused. Users may run the
+    MICRO_AGENT_SIZES populations at POPULATION_SEED; other sizes and seeds
+    are admin-only unless already stored.
+    """
+    start_time = time.time()
+    
+    allowed = micro_request.agents in settings.MICRO_AGENT_SIZES and micro_request.seed == settings.POPULATION_SEED
+    if not allowed and current_user.role != "admin" and not population_store.is_stored(micro_request.agents, micro_request.seed):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Populations other than {settings.MICRO_AGENT_SIZES} agents with seed {settings.POPULATION_SEED} can only be generated by admins"
+        )
+    
+    def simulate():
+        population = micro_simulation.population(micro_request.agents, micro_request.seed)
+        return population, micro_simulation.run(
+            micro_request.scenario_name,
+            micro_request.parameters.dict(),
+            population=population
+        )
+    
+    try:
+        # Generating a new population takes seconds; keep it off the event loop
+        population, outcomes = await run_in_threadpool(simulate)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Micro-simulation failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Micro-simulation failed. Please try again."
+        )
+    
+    return {
+        "status": "success",
+        "results": {
+            "scenario_name": micro_request.scenario_name,
+            "predicted_outcomes": outcomes,
+            "agents": len(population),
+            "households_per_agent": population.households_per_agent,
+            "assumptions": simulation_engine.get_simulation_assumptions(micro_request.scenario_name),
+            "processing_time": f"{time.time() - start_time:.3f}s"
+        }
+    }
+
+@router.get("/regions")
+async def get_regions() -> Dict[str, Any]:
+    """Get the states/UTs and the baselines regional simulations are apportioned by"""
+    return {
+        "status": "success",
+        "regions": regional_baselines.regions()
+    }
+
+@router.post("/portfolio", response_model=Dict[str, Any])
+async def simulate_portfolio(
+    portfolio_request: PortfolioRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Simulate several scenarios funded from one shared budget.
+
+    With ``allocations`` the given split is evaluated; otherwise the split of
+    ``total_budget_percent`` that best meets ``objective`` on the joint
+    outcomes is searched for.
+    """
+    start_time = time.time()
+    
+    try:
+        parameters = {
+            name: params.dict() for name, params in portfolio_request.parameters.items()
+        }
+        if portfolio_request.allocations is not None:
+            results = portfolio_service.simulate(
+                portfolio_request.scenario_names,
+                portfolio_request.allocations,
+                portfolio_request.total_budget_percent,
+                parameters
+            )
+        else:
+            results = portfolio_service.optimize(
+                portfolio_request.scenario_names,
+                portfolio_request.total_budget_percent,
+                portfolio_request.objective.dict(),
+                parameters,
+                seed=portfolio_request.seed
+            )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Portfolio simulation failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Portfolio simulation failed. Please try again."
+        )
+    
+    results["processing_time"] = f"{time.time() - start_time:.2f}s"
+    
+    return {
+        "status": "success",
+        "results": results
+    }
+
 @router.get("/scenarios")
 async def get_available_scenarios() -> Dict[str, Any]:
     """Get list of available simulation scenarios"""
-    scenarios = [
-        {
-            "name": "education_subsidy_increase",
-            "display_name": "Education Subsidy Increase",
-            "description": "Analyze the impact of increasing education subsidies on literacy rates, beneficiaries, and budget",
-            "parameters": [
-                {"name": "subsidy_increase_percent", "type": "slider", "min": 0, "max": 50, "default": 25},
-                {"name": "budget_allocation_percent", "type": "slider", "min": 5, "max": 30, "default": 15},
-                {"name": "beneficiary_expansion_percent", "type": "slider", "min": 0, "max": 50, "default": 30}
-            ],
-            "outcomes": ["beneficiaries_gained", "literacy_improvement", "implementation_cost", "roi_years"]
-        },
-        {
-            "name": "healthcare_infrastructure_expansion", 
-            "display_name": "Healthcare Infrastructure Expansion",
-            "description": "Simulate expansion of healthcare facilities and analyze impact on access and employment",
-            "parameters": [
-                {"name": "budget_allocation_percent", "type": "slider", "min": 5, "max": 25, "default": 15}
-            ],
-            "outcomes": ["new_hospitals", "new_clinics", "jobs_created", "improved_access_percent"]
-        },
-        {
-            "name": "agricultural_support_program",
-            "display_name": "Agricultural Support Program", 
-            "description": "Evaluate agricultural subsidies impact on farmers, crop yields, and food security",
-            "parameters": [
-                {"name": "subsidy_increase_percent", "type": "slider", "min": 0, "max": 40, "default": 20},
-                {"name": "budget_allocation_percent", "type": "slider", "min": 5, "max": 20, "default": 12}
-            ],
-            "outcomes": ["farmers_benefited", "crop_yield_increase_percent", "food_security_improvement_percent"]
+    return {
+        "status": "success",
+        "scenarios": simulation_engine.get_scenario_catalog(),
+        "disclaimer": "Simulations are educational tools with simplified models. Consult experts for policy decisions."
+    }
+
+@router.post("/scenarios/reload")
+async def reload_scenarios(
+    current_user: User = Depends(require_admin)
+) -> Dict[str, Any]:
+    """Recompile the scenario definitions now instead of waiting for the periodic check"""
+    try:
+        fingerprints = scenario_registry.reload()
+        
+        logger.info(f"Scenario definitions reloaded by user {current_user.id}")
+        
+        return {
+            "status": "success",
+            "scenarios": fingerprints
+        }
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.post("/compare", response_model=Dict[str, Any])
+async def compare_simulations(
+    compare_request: CompareRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_database)
+):
+    """Compare saved simulations and/or parameter sets side by side.
+
+    Returns every numeric outcome aligned across runs with deltas and percent
+    changes against the baseline, plus one explanation covering all runs.
+    """
+    start_time = time.time()
+    
+    runs = []
+    if compare_request.simulation_ids:
+        saved = db.query(PolicySimulation).filter(
+            PolicySimulation.id.in_(compare_request.simulation_ids),
+            PolicySimulation.user_id == current_user.id
+        ).all()
+        by_id = {simulation.id: simulation for simulation in saved}
+        missing = [simulation_id for simulation_id in compare_request.simulation_ids if simulation_id not in by_id]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Simulations not found: {missing}"
+            )
+        runs.extend(
+            {
+                "label": f"Simulation #{simulation_id}",
+                "simulation_id": simulation_id,
+                "scenario_name": by_id[simulation_id].scenario_name,
+                "parameters": by_id[simulation_id].parameters,
+                "outcomes": by_id[simulation_id].predicted_outcomes,
+            }
+            for simulation_id in compare_request.simulation_ids
+        )
+    runs.extend(run.dict() for run in compare_request.runs)
+    
+    try:
+        comparison = comparison_service.compare(runs, compare_request.baseline)
+        explanation = None
+        if compare_request.explain:
+            explanation = await ai_service.explain_simulation_comparison(comparison)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Simulation comparison failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Simulation comparison failed. Please try again."
+        )
+    
+    return {
+        "status": "success",
+        "results": {
+            **comparison,
+            "ai_explanation": explanation,
+            "processing_time": f"{time.time() - start_time:.3f}s",
+            "disclaimer": "These are simplified projections for educational purposes. Real-world outcomes may vary significantly."
         }
-    ]
+    }
+
+@router.get("/analytics")
+async def get_simulation_analytics(
+    metric: str = "count",
+    field: Optional[str] = None,
+    group_by: List[str] = Query(["scenario_name"]),
+    scenario_name: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    bucket: float = 5.0,
+    order: str = "desc",
+    limit: int = 100,
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_database)
+) -> Dict[str, Any]:
+    """Aggregate all saved simulations in SQL, e.g. median implementation_cost by
+    scenario since the start of the month, or run counts by parameter bucket"""
+    start_time = time.time()
+    
+    try:
+        rows = simulation_analytics.aggregate(
+            db,
+            metric=metric,
+            field=field,
+            group_by=group_by,
+            scenario_name=scenario_name,
+            since=since,
+            until=until,
+            bucket=bucket,
+            order=order,
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Simulation analytics failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Simulation analytics failed. Please try again."
+        )
     
     return {
         "status": "success",
-        "scenarios": scenarios,
-        "disclaimer": "Simulations are educational tools with simplified models. Consult experts for policy decisions."
+        "results": {
+            "metric": metric,
+            "field": field,
+            "group_by": group_by,
+            "rows": rows,
+            "processing_time": f"{time.time() - start_time:.3f}s"
+        }
+    }
+
+@router.get("/calibration")
+async def get_calibration(
+    current_user: User = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """Get the active calibration and the stored versions"""
+    return {
+        "status": "success",
+        "active": calibration_service.current(),
+        "versions": calibration_service.versions()
     }
 
-@router.get("/history", response_model=List[SimulationResponse])
+@router.post("/calibration/run")
+async def run_calibration(
+    activate: bool = True,
+    current_user: User = Depends(require_admin)
+) -> Dict[str, Any]:
+    """Fit scenario cost constants to the latest sector budgets and store a new version"""
+    try:
+        artifact = await calibration_service.run(activate=activate)
+        
+        logger.info(f"Calibration version {artifact['version']} created by user {current_user.id}")
+        
+        return {
+            "status": "success",
+            "calibration": artifact,
+            "scenarios": scenario_registry.fingerprints()
+        }
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Calibration failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Calibration failed. Please try again."
+        )
+
+@router.post("/calibration/{version}/activate")
+async def activate_calibration(
+    version: int,
+    current_user: User = Depends(require_admin)
+) -> Dict[str, Any]:
+    """Switch every worker to a stored calibration version, e.g. to roll back"""
+    try:
+        artifact = calibration_service.activate(version)
+        
+        logger.info(f"Calibration version {version} activated by user {current_user.id}")
+        
+        return {
+            "status": "success",
+            "calibration": artifact,
+            "scenarios": scenario_registry.fingerprints()
+        }
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.get("/history", response_model=SimulationHistoryPage)
 async def get_simulation_history(
-    skip: int = 0,
-    limit: int = 20,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_database)
 ):
-    """Get user's simulation history"""
-    simulations = db.query(PolicySimulation).filter(
-        PolicySimulation.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
+    """Get user's simulation history, newest first.
+
+    Pass ``next_cursor`` from one page as ``cursor`` to get the next. Items
+    leave out the explanation text; ``has_explanation`` tells whether
+    /{simulation_id}/explanation will answer from storage.
+    """
+    try:
+        return history_paginator.page(db, PolicySimulation, current_user.id, [
+            PolicySimulation.id,
+            PolicySimulation.scenario_name,
+            PolicySimulation.parameters,
+            PolicySimulation.predicted_outcomes,
+            and_(PolicySimulation.ai_explanation.isnot(None), PolicySimulation.ai_explanation != "").label("has_explanation"),
+            PolicySimulation.confidence_level,
+            PolicySimulation.processing_time,
+            PolicySimulation.created_at,
+        ], cursor, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+def _iter_export(export_format: str, user_id: Any, scenario_name: Optional[str]) -> Iterator[Any]:
+    """Export stream with its own session, closed when the response ends"""
+    db = SessionLocal()
+    try:
+        iterate = simulation_exporter.iter_parquet if export_format == "parquet" else simulation_exporter.iter_csv
+        yield from iterate(db, PolicySimulation, user_id, scenario_name)
+    finally:
+        db.close()
+
+@router.get("/export")
+async def export_simulation_history(
+    format: str = "csv",
+    scenario_name: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """Download all of the user's saved simulations as CSV or Parquet.
+
+    Parameters and outcomes are flattened into ``parameters.<name>`` and
+    ``outcomes.<name>`` columns. Rows are streamed in fixed-size batches
+    from a server-side cursor, so any number of rows can be exported.
+    """
+    try:
+        simulation_exporter.validate(format, scenario_name)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
-    return simulations
+    filename = f"simulations-{datetime.utcnow():%Y%m%d}.{format}"
+    return StreamingResponse(
+        _iter_export(format, current_user.id, scenario_name),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 @router.get("/{simulation_id}", response_model=SimulationResponse)
 async def get_simulation(
@@ -156,6 +1123,43 @@ async def get_simulation(
     
     return simulation
 
+@router.get("/{simulation_id}/explanation", response_model=Dict[str, Any])
+async def get_simulation_explanation(
+    simulation_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_database)
+):
+    """Get a simulation's AI explanation, generating and storing it on first request"""
+    simulation = db.query(PolicySimulation).filter(
+        PolicySimulation.id == simulation_id,
+        PolicySimulation.user_id == current_user.id
+    ).first()
+    
+    if not simulation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Simulation not found"
+        )
+    
+    start_time = time.time()
+    
+    try:
+        generated = await explain_stored_simulation(simulation, db)
+    except Exception as e:
+        logger.error(f"Simulation explanation failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Simulation explanation failed. Please try again."
+        )
+    
+    return {
+        "status": "success",
+        "simulation_id": simulation.id,
+        "ai_explanation": simulation.ai_explanation,
+        "cached": not generated,
+        "processing_time": f"{time.time() - start_time:.3f}s"
+    }
+
 @router.delete("/{simulation_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_simulation(
     simulation_id: int,
@@ -34,6 +34,21 @@ class DocumentResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class DocumentSummary(BaseModel):
+    id: int
+    filename: str
+    document_type: str
+    verdict: Optional[str] = None
+    confidence_score: Optional[float] = None
+    suspicious_elements: Optional[List[str]] = None
+    processing_status: str
+    created_at: datetime
+
+class DocumentHistoryPage(BaseModel):
+    items: List[DocumentSummary]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+
 class DocumentVerificationResult(BaseModel):
     document_id: int
     filename: str
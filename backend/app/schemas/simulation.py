@@ -1,6 +1,7 @@
 from pydantic import BaseModel, validator
 from datetime import datetime
 from typing import Dict, Any, List, Optional
+from app.services.scenario_registry import scenario_registry
 
 class SimulationParameters(BaseModel):
     subsidy_increase_percent: Optional[float] = 0
@@ -13,23 +14,382 @@ class SimulationParameters(BaseModel):
             raise ValueError('Percentage values must be between 0 and 100')
         return v
 
+def validate_scenario_name(v: str) -> str:
+    """Check a scenario name against the loaded scenario definitions"""
+    allowed_scenarios = scenario_registry.names()
+    if v not in allowed_scenarios:
+        raise ValueError(f'Scenario must be one of: {allowed_scenarios}')
+    return v
+
+MAX_BATCH_SIZE = 100000
+MAX_SWEEP_STEPS = 201
+MAX_SWEEP_CELLS = 1100000
+MAX_MONTE_CARLO_SAMPLES = 2000000
+MAX_MONTE_CARLO_JOB_SAMPLES = 50000000
+MAX_PARETO_POINTS = 5000
+
+MAX_MICRO_AGENTS = 10000000
+
+MAX_COMPARE_RUNS = 10
+
+MAX_PROJECTION_YEARS = 50
+MAX_PROJECTION_CELLS = 1000000  # batch size x horizon years of projected series
+
+class ProjectionSettings(BaseModel):
+    """Options for the multi-year projection mode; rates are annual fractions"""
+    horizon_years: int = 10
+    discount_rate: float = 0.07
+    cost_growth_rate: float = 0.05
+    beneficiary_growth_rate: float = 0.02
+    rollout_years: int = 3
+    maintenance_rate: float = 0.02
+    
+    @validator('horizon_years', 'rollout_years')
+    def validate_years(cls, v):
+        if v < 1 or v > MAX_PROJECTION_YEARS:
+            raise ValueError(f'Years must be between 1 and {MAX_PROJECTION_YEARS}')
+        return v
+    
+    @validator('discount_rate', 'cost_growth_rate', 'beneficiary_growth_rate', 'maintenance_rate')
+    def validate_rates(cls, v):
+        if v < -0.5 or v > 1:
+            raise ValueError('Rates must be between -0.5 and 1')
+        return v
+
 class SimulationRequest(BaseModel):
     scenario_name: str
     parameters: SimulationParameters
+    mode: str = "snapshot"
+    projection: ProjectionSettings = ProjectionSettings()
+    
+    @validator('scenario_name')
+    def validate_scenario(cls, v):
+        return validate_scenario_name(v)
+    
+    @validator('mode')
+    def validate_mode(cls, v):
+        allowed_modes = ['snapshot', 'projection']
+        if v not in allowed_modes:
+            raise ValueError(f'Mode must be one of: {allowed_modes}')
+        return v
+
+class BatchSimulationRequest(BaseModel):
+    """Columnar parameters: each key maps to one value per simulation run"""
+    scenario_name: str
+    parameters: Dict[str, List[float]]
+    mode: str = "snapshot"
+    projection: ProjectionSettings = ProjectionSettings()
+    
+    @validator('scenario_name')
+    def validate_scenario(cls, v):
+        return validate_scenario_name(v)
+    
+    @validator('mode')
+    def validate_mode(cls, v):
+        allowed_modes = ['snapshot', 'projection']
+        if v not in allowed_modes:
+            raise ValueError(f'Mode must be one of: {allowed_modes}')
+        return v
+    
+    @validator('parameters')
+    def validate_parameter_columns(cls, v):
+        allowed_parameters = list(SimulationParameters.__fields__)
+        unknown = [name for name in v if name not in allowed_parameters]
+        if unknown:
+            raise ValueError(f'Parameters must be among: {allowed_parameters}')
+        lengths = {len(values) for values in v.values()}
+        if len(lengths) != 1:
+            raise ValueError('Parameter columns must be non-empty and of equal length')
+        size = lengths.pop()
+        if size < 1 or size > MAX_BATCH_SIZE:
+            raise ValueError(f'Batch size must be between 1 and {MAX_BATCH_SIZE}')
+        if any(value < 0 or value > 100 for values in v.values() for value in values):
+            raise ValueError('Percentage values must be between 0 and 100')
+        return v
+    
+    @validator('projection')
+    def validate_projection_size(cls, v, values):
+        parameters = values.get('parameters')
+        if values.get('mode') == 'projection' and parameters:
+            size = len(next(iter(parameters.values())))
+            if size * v.horizon_years > MAX_PROJECTION_CELLS:
+                raise ValueError(f'Batch size times horizon years must be at most {MAX_PROJECTION_CELLS} in projection mode')
+        return v
+
+class SweepRange(BaseModel):
+    start: float
+    stop: float
+    steps: int = 101
+    
+    @validator('start', 'stop')
+    def validate_bounds(cls, v):
+        if v < 0 or v > 100:
+            raise ValueError('Percentage values must be between 0 and 100')
+        return v
+    
+    @validator('steps')
+    def validate_steps(cls, v):
+        if v < 2 or v > MAX_SWEEP_STEPS:
+            raise ValueError(f'Steps must be between 2 and {MAX_SWEEP_STEPS}')
+        return v
+
+class SweepRequest(BaseModel):
+    """Grid sweep over two or three parameters; the rest stay at fixed_parameters"""
+    scenario_name: str
+    ranges: Dict[str, SweepRange]
+    fixed_parameters: SimulationParameters = SimulationParameters()
+    
+    @validator('scenario_name')
+    def validate_scenario(cls, v):
+        return validate_scenario_name(v)
+    
+    @validator('ranges')
+    def validate_ranges(cls, v):
+        allowed_parameters = list(SimulationParameters.__fields__)
+        if any(name not in allowed_parameters for name in v):
+            raise ValueError(f'Sweep parameters must be among: {allowed_parameters}')
+        if len(v) not in (2, 3):
+            raise ValueError('Sweep requires ranges for two or three parameters')
+        cells = 1
+        for sweep_range in v.values():
+            cells *= sweep_range.steps
+        if cells > MAX_SWEEP_CELLS:
+            raise ValueError(f'Sweep grid cannot exceed {MAX_SWEEP_CELLS} cells')
+        return v
+
+class UncertaintySpec(BaseModel):
+    """Distribution around a point value; spread is relative (sd for normal, half-width otherwise)"""
+    distribution: str = "normal"
+    spread: float = 0.1
+    
+    @validator('distribution')
+    def validate_distribution(cls, v):
+        allowed_distributions = ['normal', 'uniform', 'triangular']
+        if v not in allowed_distributions:
+            raise ValueError(f'Distribution must be one of: {allowed_distributions}')
+        return v
+    
+    @validator('spread')
+    def validate_spread(cls, v):
+        if v < 0 or v > 1:
+            raise ValueError('Spread must be between 0 and 1')
+        return v
+
+class MonteCarloRequest(BaseModel):
+    scenario_name: str
+    parameters: SimulationParameters = SimulationParameters()
+    samples: int = 100000
+    seed: int = 42
+    parameter_uncertainty: Dict[str, UncertaintySpec] = {}
+    constant_uncertainty: Dict[str, UncertaintySpec] = {}
+    
+    @validator('scenario_name')
+    def validate_scenario(cls, v):
+        return validate_scenario_name(v)
+    
+    @validator('samples')
+    def validate_samples(cls, v):
+        if v < 1 or v > MAX_MONTE_CARLO_SAMPLES:
+            raise ValueError(f'Samples must be between 1 and {MAX_MONTE_CARLO_SAMPLES}')
+        return v
+
+class MonteCarloJobRequest(MonteCarloRequest):
+    """Monte Carlo run on the background process pool; allows larger sample counts"""
+    
+    @validator('samples')
+    def validate_samples(cls, v):
+        if v < 1 or v > MAX_MONTE_CARLO_JOB_SAMPLES:
+            raise ValueError(f'Samples must be between 1 and {MAX_MONTE_CARLO_JOB_SAMPLES}')
+        return v
+
+class SensitivityRequest(BaseModel):
+    scenario_name: str
+    method: str = "both"
+    trajectories: int = 50
+    levels: int = 4
+    samples: int = 2048
+    seed: int = 42
+    
+    @validator('scenario_name')
+    def validate_scenario(cls, v):
+        return validate_scenario_name(v)
+    
+    @validator('method')
+    def validate_method(cls, v):
+        allowed_methods = ['morris', 'sobol', 'both']
+        if v not in allowed_methods:
+            raise ValueError(f'Method must be one of: {allowed_methods}')
+        return v
+    
+    @validator('trajectories')
+    def validate_trajectories(cls, v):
+        if v < 2 or v > 1000:
+            raise ValueError('Trajectories must be between 2 and 1000')
+        return v
+    
+    @validator('levels')
+    def validate_levels(cls, v):
+        if v < 2 or v > 20 or v % 2:
+            raise ValueError('Levels must be an even number between 2 and 20')
+        return v
+    
+    @validator('samples')
+    def validate_samples(cls, v):
+        if v < 64 or v > 65536:
+            raise ValueError('Samples must be between 64 and 65536')
+        return v
+
+class OutcomeConstraint(BaseModel):
+    outcome: str
+    operator: str = ">="
+    value: float
+    
+    @validator('operator')
+    def validate_operator(cls, v):
+        allowed_operators = ['>=', '<=', '==']
+        if v not in allowed_operators:
+            raise ValueError(f'Operator must be one of: {allowed_operators}')
+        return v
+
+class OutcomeObjective(BaseModel):
+    outcome: str
+    direction: str = "minimize"
+    
+    @validator('direction')
+    def validate_direction(cls, v):
+        if v not in ['minimize', 'maximize']:
+            raise ValueError("Direction must be 'minimize' or 'maximize'")
+        return v
+
+class GoalSeekRequest(BaseModel):
+    """Targets to meet; unfixed parameters are searched within bounds (slider ranges by default)"""
+    scenario_name: str
+    constraints: List[OutcomeConstraint] = []
+    objective: Optional[OutcomeObjective] = None
+    fixed_parameters: Dict[str, float] = {}
+    bounds: Dict[str, List[float]] = {}
+    seed: int = 42
+    
+    @validator('scenario_name')
+    def validate_scenario(cls, v):
+        return validate_scenario_name(v)
+    
+    @validator('bounds')
+    def validate_bounds(cls, v):
+        if any(len(limits) != 2 for limits in v.values()):
+            raise ValueError('Bounds must be [min, max] pairs')
+        return v
+
+class ParetoRequest(BaseModel):
+    scenario_names: List[str]
+    objectives: List[OutcomeObjective] = [
+        OutcomeObjective(outcome="implementation_cost", direction="minimize"),
+        OutcomeObjective(outcome="sector_impact_score", direction="maximize")
+    ]
+    samples: int = 20000
+    seed: int = 42
+    max_points: int = 1000
+    
+    @validator('scenario_names')
+    def validate_scenarios(cls, v):
+        if not v:
+            raise ValueError('Provide at least one scenario')
+        for name in v:
+            validate_scenario_name(name)
+        return list(dict.fromkeys(v))
+    
+    @validator('objectives')
+    def validate_objectives(cls, v):
+        if len(v) < 2 or len(v) > 4:
+            raise ValueError('Provide between 2 and 4 objectives')
+        return v
+    
+    @validator('samples')
+    def validate_samples(cls, v):
+        if v < 100 or v > MAX_BATCH_SIZE:
+            raise ValueError(f'Samples must be between 100 and {MAX_BATCH_SIZE}')
+        return v
+    
+    @validator('max_points')
+    def validate_max_points(cls, v):
+        if v < 2 or v > MAX_PARETO_POINTS:
+            raise ValueError(f'max_points must be between 2 and {MAX_PARETO_POINTS}')
+        return v
+
+class RegionalSimulationRequest(BaseModel):
+    scenario_name: str
+    parameters: SimulationParameters
     
     @validator('scenario_name')
     def validate_scenario(cls, v):
-        allowed_scenarios = [
-            'education_subsidy_increase',
-            'healthcare_infrastructure_expansion', 
-            'agricultural_support_program',
-            'social_welfare_enhancement',
-            'infrastructure_development'
-        ]
-        if v not in allowed_scenarios:
-            raise ValueError(f'Scenario must be one of: {allowed_scenarios}')
+        return validate_scenario_name(v)
+
+class SpilloverRequest(BaseModel):
+    scenario_name: str
+    parameters: SimulationParameters
+    
+    @validator('scenario_name')
+    def validate_scenario(cls, v):
+        return validate_scenario_name(v)
+
+class MicroSimulationRequest(BaseModel):
+    scenario_name: str
+    parameters: SimulationParameters = SimulationParameters()
+    agents: int = 1000000
+    seed: int = 42
+    
+    @validator('scenario_name')
+    def validate_scenario(cls, v):
+        return validate_scenario_name(v)
+    
+    @validator('agents')
+    def validate_agents(cls, v):
+        if v < 1000 or v > MAX_MICRO_AGENTS:
+            raise ValueError(f'Agents must be between 1000 and {MAX_MICRO_AGENTS}')
+        return v
+
+class PortfolioRequest(BaseModel):
+    """Scenarios sharing one budget; without ``allocations`` the split is optimized"""
+    scenario_names: List[str]
+    total_budget_percent: float
+    parameters: Dict[str, SimulationParameters] = {}
+    allocations: Optional[Dict[str, float]] = None
+    objective: OutcomeObjective = OutcomeObjective(outcome="beneficiaries", direction="maximize")
+    seed: int = 42
+    
+    @validator('scenario_names')
+    def validate_scenarios(cls, v):
+        if len(v) < 2 or len(set(v)) != len(v):
+            raise ValueError('Provide at least two distinct scenarios')
+        for name in v:
+            validate_scenario_name(name)
+        return v
+    
+    @validator('total_budget_percent')
+    def validate_total_budget(cls, v):
+        if v <= 0 or v > 100:
+            raise ValueError('Total budget must be between 0 and 100 percent')
         return v
 
+class CompareRun(BaseModel):
+    scenario_name: str
+    parameters: SimulationParameters
+    label: Optional[str] = None
+    
+    @validator('scenario_name')
+    def validate_scenario(cls, v):
+        return validate_scenario_name(v)
+
+class CompareRequest(BaseModel):
+    """Saved simulations and/or parameter sets, compared against the ``baseline`` entry.
+
+    Saved simulations come first, in the order given, followed by ``runs``.
+    """
+    simulation_ids: List[int] = []
+    runs: List[CompareRun] = []
+    baseline: int = 0
+    explain: bool = True
+
 class SimulationOutcome(BaseModel):
     beneficiaries_gained: int
     budget_deficit_increase: float
@@ -40,7 +400,7 @@ class SimulationOutcome(BaseModel):
 class SimulationResult(BaseModel):
     scenario_name: str
     predicted_outcomes: SimulationOutcome
-    ai_explanation: str
+    ai_explanation: Optional[str] = None
     confidence_level: str
     assumptions: List[str]
     simulation_version: str = "1.0"
@@ -50,10 +410,25 @@ class SimulationResponse(BaseModel):
     scenario_name: str
     parameters: Dict[str, Any]
     predicted_outcomes: Dict[str, Any]
-    ai_explanation: str
+    ai_explanation: Optional[str] = None
     confidence_level: str
     processing_time: Optional[float] = None
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class SimulationSummary(BaseModel):
+    id: int
+    scenario_name: str
+    parameters: Dict[str, Any]
+    predicted_outcomes: Dict[str, Any]
+    has_explanation: bool = False
+    confidence_level: str
+    processing_time: Optional[float] = None
+    created_at: datetime
+
+class SimulationHistoryPage(BaseModel):
+    items: List[SimulationSummary]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
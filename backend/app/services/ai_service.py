@@ -1,5 +1,7 @@
 import google.generativeai as genai
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional
+import asyncio
 import json
 import logging
 from app.config import get_settings
@@ -48,8 +50,23 @@ class MockAIService:
     async def explain_policy_simulation(self, scenario_name: str, parameters: Dict[str, Any], outcomes: Dict[str, Any]) -> str:
         return f"Mock explanation for {scenario_name}: This simulation shows potential outcomes. Fallback response - configure AI service for detailed analysis."
 
+    async def explain_simulation_comparison(self, comparison: Dict[str, Any]) -> str:
+        labels = ", ".join(run["label"] for run in comparison["runs"])
+        return f"Mock comparison of {labels}: Outcomes differ as shown in the deltas. Fallback response - configure AI service for detailed analysis."
+
 class GeminiAIService:
+    """Gemini calls run on a dedicated thread pool so they never block the event loop.
+
+    The client is synchronous, so each call occupies one pool thread. At most
+    AI_MAX_CONCURRENCY calls are in flight per worker; a slot is only freed
+    when its thread returns, even if the caller stopped waiting. Every call,
+    including the wait for a slot, must finish within AI_TIMEOUT seconds or
+    it raises AIServiceException.
+    """
+    
     def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=settings.AI_MAX_CONCURRENCY, thread_name_prefix="gemini")
+        self.semaphore = asyncio.Semaphore(settings.AI_MAX_CONCURRENCY)
         try:
             if not settings.GEMINI_API_KEY:
                 raise ValueError("GEMINI_API_KEY not configured")
@@ -61,6 +78,32 @@ class GeminiAIService:
             logger.warning(f"Failed to initialize Gemini AI: {e}")
             self.available = False
     
+    async def _generate(self, prompt: str) -> str:
+        """Text of one Gemini response, within the AI_TIMEOUT deadline"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.AI_TIMEOUT
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), timeout=settings.AI_TIMEOUT)
+            try:
+                future = loop.run_in_executor(self.executor, self.model.generate_content, prompt)
+            except Exception:
+                self.semaphore.release()
+                raise
+            # Hold the slot until the thread finishes; a timed-out call cannot be interrupted
+            future.add_done_callback(self._release)
+            response = await asyncio.wait_for(asyncio.shield(future), timeout=max(deadline - loop.time(), 0))
+        except asyncio.TimeoutError:
+            raise AIServiceException(f"Gemini did not respond within {settings.AI_TIMEOUT}s")
+        return response.text
+    
+    def _release(self, future: asyncio.Future) -> None:
+        self.semaphore.release()
+        if not future.cancelled():
+            future.exception()  # mark abandoned failures as retrieved
+    
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+    
     async def analyze_document_authenticity(self, text_content: str, document_type: str) -> Dict[str, Any]:
         """Analyze document for authenticity using Gemini AI"""
         if not self.available:
@@ -95,11 +138,11 @@ class GeminiAIService:
             Remember to emphasize that this is AI-assisted analysis and encourage human verification.
             """
             
-            response = self.model.generate_content(prompt)
+            response_text = await self._generate(prompt)
             
             # Parse JSON response
             try:
-                result = json.loads(response.text)
+                result = json.loads(response_text)
                 
                 # Add processing metadata
                 result["processing_metadata"] = {
@@ -116,7 +159,7 @@ class GeminiAIService:
                 return {
                     "verdict": "inconclusive",
                     "confidence_score": 50.0,
-                    "explanation": response.text,
+                    "explanation": response_text,
                     "suspicious_elements": [],
                     "authenticity_indicators": [],
                     "recommendations": "Unable to parse structured analysis. Please consult human experts.",
@@ -162,19 +205,65 @@ class GeminiAIService:
             Focus on helping citizens understand complex policy concepts while being transparent about limitations.
             """
             
-            response = self.model.generate_content(prompt)
-            return response.text
+            return await self._generate(prompt)
             
         except Exception as e:
             logger.error(f"Policy explanation failed: {e}")
             raise AIServiceException(f"Policy explanation failed: {str(e)}")
 
+    async def explain_simulation_comparison(self, comparison: Dict[str, Any]) -> str:
+        """Explain how several simulation runs differ, in one request for all of them"""
+        if not self.available:
+            raise AIServiceException("Gemini AI service not available")
+            
+        try:
+            baseline = comparison["runs"][comparison["baseline"]]["label"]
+            runs = [
+                {
+                    "label": run["label"],
+                    "scenario": run["scenario_name"],
+                    "parameters": run["parameters"],
+                    "outcomes": {key: values[index] for key, values in comparison["values"].items()},
+                    "percent_change_vs_baseline": {key: values[index] for key, values in comparison["percent_changes"].items()},
+                }
+                for index, run in enumerate(comparison["runs"])
+            ]
+            prompt = f"""
+            You are an AI policy analysis assistant helping citizens compare potential policy choices.
+            
+            IMPORTANT LIMITATIONS:
+            - These are simplified projections based on mathematical models
+            - Real-world outcomes may vary significantly due to unforeseen factors
+            - This tool is for educational and exploratory purposes only
+            - Policy decisions should involve comprehensive expert analysis
+            
+            Baseline: {baseline}
+            Simulations: {json.dumps(runs, indent=2)}
+            
+            Please provide one clear, accessible comparison (200-350 words) that:
+            1. Summarizes how each simulation differs from the baseline
+            2. Explains which parameter changes drive the largest differences
+            3. Describes the trade-offs between cost and benefits
+            4. Mentions possible risks and challenges
+            5. Emphasizes uncertainty and the need for expert consultation
+            6. Uses language accessible to general citizens
+            """
+            
+            return await self._generate(prompt)
+            
+        except Exception as e:
+            logger.error(f"Comparison explanation failed: {e}")
+            raise AIServiceException(f"Comparison explanation failed: {str(e)}")
+
 class AIServiceWithFallback:
-    """Service that tries Gemini first, falls back to mock"""
+    """Service that tries Gemini first, falls back to mock on errors and timeouts"""
     
     def __init__(self):
         self.gemini_service = GeminiAIService()
         self.mock_service = MockAIService()
+    
+    def shutdown(self) -> None:
+        self.gemini_service.shutdown()
         
     async def analyze_document_authenticity(self, text_content: str, document_type: str) -> Dict[str, Any]:
         # Try Gemini first
@@ -198,5 +287,16 @@ class AIServiceWithFallback:
         # Fall back to mock
         return await self.mock_service.explain_policy_simulation(scenario_name, parameters, outcomes)
 
+    async def explain_simulation_comparison(self, comparison: Dict[str, Any]) -> str:
+        # Try Gemini first
+        if self.gemini_service.available:
+            try:
+                return await self.gemini_service.explain_simulation_comparison(comparison)
+            except Exception as e:
+                logger.warning(f"Gemini failed, falling back to mock: {e}")
+        
+        # Fall back to mock
+        return await self.mock_service.explain_simulation_comparison(comparison)
+
 # Initialize service instance with fallback
 ai_service = AIServiceWithFallback()
\ No newline at end of file
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+from datetime import datetime
+from typing import Dict, Any, List, Mapping, Optional
+import numpy as np
+
+from app.config import get_settings
+from app.services.datagovindia_service import DataGovIndiaService
+from app.services.scenario_registry import PARAMETER_NAMES, scenario_registry
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+ARTIFACT_PATTERN = re.compile(r"^calibration-v(\d+)\.json$")
+
+class CalibrationService:
+    """Fits scenario constants to the sector budgets from data.gov.in.
+
+    Each scenario's ``calibration`` section names one cost constant, the
+    budget sectors that fund it and the share of those budgets the modelled
+    programme represents. Implementation cost is linear in that constant, so
+    one least-squares slope per scenario makes the cost at the default
+    sliders match ``budget_share`` x each promised and delivered sector
+    budget. All scenarios are solved together from one stacked set of
+    observations.
+
+    Fits are written as numbered artifacts; activating one copies it to
+    CALIBRATION_PATH, which the scenario registry watches, so every worker
+    switches to the new constants without a restart.
+    """
+
+    def __init__(self, directory: Optional[str] = None, current_path: Optional[str] = None):
+        self.directory = directory or settings.CALIBRATION_DIR
+        self.current_path = current_path or settings.CALIBRATION_PATH
+        self.budget_service = DataGovIndiaService()
+
+    def fit(self, budget_data: Mapping[str, Any]) -> Dict[str, Any]:
+        """Fit every calibrated scenario to one budget snapshot"""
+        budgets = {}
+        for sector in budget_data.get("sectors", []):
+            observed = [sector.get("promised_budget"), sector.get("delivered_budget")]
+            budgets[sector.get("sector")] = [float(value) for value in observed if value]
+
+        names, units, previous, rows, unit_costs, targets = [], [], [], [], [], []
+        for scenario_name in scenario_registry.names():
+            scenario = scenario_registry.get(scenario_name)
+            calibration = scenario.calibration if scenario else None
+            if not calibration:
+                continue
+            observed = [value for sector in calibration["budget_sectors"] for value in budgets.get(sector, [])]
+            if not observed:
+                logger.warning(f"No budget data for {scenario_name} sectors {calibration['budget_sectors']}")
+                continue
+
+            # Cost per unit of the constant at the default sliders
+            constant = calibration["constant"]
+            params = {name: np.asarray(0.0) for name in PARAMETER_NAMES}
+            params.update((parameter["name"], np.asarray(float(parameter["default"]))) for parameter in scenario.parameters)
+            probe = float(scenario.constants[constant])
+            cost = float(scenario.evaluate(params)["implementation_cost"])
+            unit = cost / probe if probe else 0.0
+            if unit <= 0:
+                logger.warning(f"Cannot calibrate {scenario_name}: cost does not grow with {constant}")
+                continue
+
+            index = len(names)
+            names.append(scenario_name)
+            units.append(constant)
+            previous.append(probe)
+            rows.extend([index] * len(observed))
+            unit_costs.extend([unit] * len(observed))
+            targets.extend(float(calibration["budget_share"]) * value for value in observed)
+
+        rows, x, y = np.array(rows, dtype=np.intp), np.array(unit_costs), np.array(targets)
+        count = len(names)
+        slope = np.bincount(rows, x * y, count) / np.maximum(np.bincount(rows, x * x, count), 1e-300)
+        residual = y - slope[rows] * x
+        rmse = np.sqrt(np.bincount(rows, residual ** 2, count) / np.maximum(np.bincount(rows, None, count), 1))
+        mean_target = np.bincount(rows, y, count) / np.maximum(np.bincount(rows, None, count), 1)
+
+        digest = hashlib.sha256(json.dumps(budgets, sort_keys=True).encode()).hexdigest()
+        return {
+            "created_at": datetime.utcnow().isoformat(),
+            "data_source": budget_data.get("data_source"),
+            "budget_last_updated": budget_data.get("last_updated"),
+            "budget_digest": digest,
+            "coefficients": {
+                name: {constant: round(float(value), 2)}
+                for name, constant, value in zip(names, units, slope)
+            },
+            "fit": {
+                name: {
+                    "constant": constant,
+                    "previous": old,
+                    "fitted": round(float(value), 2),
+                    "observations": int(observations),
+                    "relative_rmse": round(float(error / target), 6) if target else 0.0,
+                }
+                for name, constant, old, value, observations, error, target in zip(
+                    names, units, previous, slope, np.bincount(rows, None, count), rmse, mean_target
+                )
+            },
+        }
+
+    def versions(self) -> List[Dict[str, Any]]:
+        """Stored artifacts, newest first"""
+        try:
+            entries = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        active = self.current().get("version")
+        found = []
+        for entry in entries:
+            match = ARTIFACT_PATTERN.match(entry)
+            if match:
+                try:
+                    with open(os.path.join(self.directory, entry), encoding="utf-8") as handle:
+                        artifact = json.load(handle)
+                except (OSError, ValueError):
+                    continue  # still being written
+                found.append({
+                    "version": int(match.group(1)),
+                    "created_at": artifact.get("created_at"),
+                    "data_source": artifact.get("data_source"),
+                    "active": int(match.group(1)) == active,
+                })
+        return sorted(found, key=lambda item: item["version"], reverse=True)
+
+    def current(self) -> Dict[str, Any]:
+        try:
+            with open(self.current_path, encoding="utf-8") as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return {}
+
+    def _artifact_path(self, version: int) -> str:
+        return os.path.join(self.directory, f"calibration-v{version:04d}.json")
+
+    def save(self, artifact: Mapping[str, Any]) -> Dict[str, Any]:
+        """Store a fit under the next free version number"""
+        os.makedirs(self.directory, exist_ok=True)
+        version = max([item["version"] for item in self.versions()], default=0) + 1
+        while True:
+            try:
+                # Exclusive create, so two workers saving at once get different versions
+                descriptor = os.open(self._artifact_path(version), os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+                break
+            except FileExistsError:
+                version += 1
+        stored = {"version": version, **artifact}
+        with os.fdopen(descriptor, "w", encoding="utf-8") as handle:
+            json.dump(stored, handle, indent=2)
+        return stored
+
+    def activate(self, version: int) -> Dict[str, Any]:
+        """Make a stored artifact the active calibration and reload scenarios"""
+        path = self._artifact_path(version)
+        if not os.path.exists(path):
+            raise ValueError(f"Calibration version {version} does not exist")
+        with open(path, encoding="utf-8") as handle:
+            artifact = json.load(handle)
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.current_path)), exist_ok=True)
+        descriptor, staging = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.current_path)), suffix=".json")
+        with os.fdopen(descriptor, "w", encoding="utf-8") as handle:
+            json.dump(artifact, handle, indent=2)
+        os.replace(staging, self.current_path)
+
+        scenario_registry.reload()
+        logger.info(f"Activated calibration version {version}")
+        return artifact
+
+    async def run(self, activate: bool = True) -> Dict[str, Any]:
+        """Fetch the latest budget data, fit, store and (by default) activate"""
+        budget_data = await self.budget_service.get_budget_data()
+        artifact = self.fit(budget_data)
+        if not artifact["coefficients"]:
+            raise ValueError("Budget data covers none of the calibrated scenarios")
+        stored = self.save(artifact)
+        if activate:
+            self.activate(stored["version"])
+        return stored
+
+# Initialize calibration service
+calibration_service = CalibrationService()
@@ -0,0 +1,88 @@
+from typing import Dict, Any, List, Mapping
+import numpy as np
+
+from app.schemas.simulation import MAX_COMPARE_RUNS
+from app.services.scenario_registry import PARAMETER_NAMES
+from app.services.simulation_engine import simulation_engine
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+class SimulationComparison:
+    """Aligns outcomes of several runs and computes deltas against a baseline.
+
+    Runs are rows and outcome names columns of one matrix, so every delta and
+    percent change comes from a single array operation. Outcomes a run does
+    not have (different scenarios) are NaN and come back as None.
+    """
+
+    def evaluate_runs(self, runs: List[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        """Fill in ``outcomes`` for parameter-set runs, one batch per scenario"""
+        by_scenario: Dict[str, List[int]] = {}
+        for index, run in enumerate(runs):
+            if run.get("outcomes") is None:
+                by_scenario.setdefault(run["scenario_name"], []).append(index)
+
+        evaluated = [dict(run) for run in runs]
+        for scenario_name, indices in by_scenario.items():
+            params = {
+                name: np.array([float(runs[index]["parameters"][name]) for index in indices])
+                for name in PARAMETER_NAMES
+            }
+            outcomes = simulation_engine.run_batch(scenario_name, params)
+            for position, index in enumerate(indices):
+                evaluated[index]["outcomes"] = {
+                    key: value if isinstance(value, str) else value[position].item()
+                    for key, value in outcomes.items()
+                }
+        return evaluated
+
+    def compare(self, runs: List[Mapping[str, Any]], baseline: int = 0) -> Dict[str, Any]:
+        """Compare runs given as dicts with scenario_name, parameters and (optionally) outcomes"""
+        if len(runs) < 2 or len(runs) > MAX_COMPARE_RUNS:
+            raise ValueError(f"Compare between 2 and {MAX_COMPARE_RUNS} simulations")
+        if not 0 <= baseline < len(runs):
+            raise ValueError(f"Baseline must index one of the {len(runs)} simulations")
+
+        runs = self.evaluate_runs(runs)
+        outcome_names = list(dict.fromkeys(
+            key for run in runs for key, value in run["outcomes"].items() if _is_number(value)
+        ))
+        outcomes = np.array([
+            [float(run["outcomes"][key]) if _is_number(run["outcomes"].get(key)) else np.nan for key in outcome_names]
+            for run in runs
+        ]).reshape(len(runs), len(outcome_names))
+        parameters = np.array([
+            [float(run["parameters"].get(name, np.nan)) for name in PARAMETER_NAMES]
+            for run in runs
+        ])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            deltas = outcomes - outcomes[baseline]
+            reference = np.abs(outcomes[baseline])
+            percent = np.where(reference > 0, deltas / reference * 100, np.nan)
+        percent = np.round(percent, 2)
+
+        def columns(matrix: np.ndarray, names: List[str]) -> Dict[str, Any]:
+            return {name: simulation_engine.to_jsonable(matrix[:, index]) for index, name in enumerate(names)}
+
+        return {
+            "baseline": baseline,
+            "runs": [
+                {
+                    "label": run.get("label") or f"Simulation {index + 1}",
+                    "simulation_id": run.get("simulation_id"),
+                    "scenario_name": run["scenario_name"],
+                    "parameters": run["parameters"],
+                }
+                for index, run in enumerate(runs)
+            ],
+            "outcomes": outcome_names,
+            "values": columns(outcomes, outcome_names),
+            "deltas": columns(deltas, outcome_names),
+            "percent_changes": columns(percent, outcome_names),
+            "parameter_deltas": columns(parameters - parameters[baseline], list(PARAMETER_NAMES)),
+        }
+
+# Initialize comparison service
+comparison_service = SimulationComparison()
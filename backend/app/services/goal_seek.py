@@ -0,0 +1,144 @@
+from typing import Dict, Any, List, Mapping, Optional
+import logging
+import numpy as np
+
+from app.schemas.simulation import SimulationParameters
+from app.services.scenario_registry import scenario_registry
+from app.services.simulation_engine import simulation_engine
+
+logger = logging.getLogger(__name__)
+
+CONSTRAINT_OPERATORS = (">=", "<=", "==")
+
+class GoalSeekService:
+    """Inverse solver: find slider settings that meet outcome targets.
+
+    Each round evaluates a whole population of candidates with one
+    ``run_batch`` call; later rounds sample a shrinking box around the best
+    candidate so far. Candidates are ranked feasible-first, then by
+    objective, then by total constraint violation.
+    """
+
+    def __init__(self, candidates: int = 4096, rounds: int = 6, shrink: float = 0.35):
+        self.candidates = candidates
+        self.rounds = rounds
+        self.shrink = shrink
+
+    def _score(self, outcomes: Mapping[str, np.ndarray], constraints: List[Mapping[str, Any]], objective: Optional[Mapping[str, Any]]):
+        """Return (violation, objective value to minimise) per candidate"""
+        size = next(iter(outcomes.values())).shape[0]
+        violation = np.zeros(size)
+        for constraint in constraints:
+            values = outcomes[constraint["outcome"]]
+            target = constraint["value"]
+            scale = max(abs(target), 1.0)
+            if constraint["operator"] == ">=":
+                violation += np.maximum(target - values, 0) / scale
+            elif constraint["operator"] == "<=":
+                violation += np.maximum(values - target, 0) / scale
+            else:
+                violation += np.abs(values - target) / scale
+
+        if objective:
+            values = outcomes[objective["outcome"]].astype(np.float64)
+            cost = values if objective["direction"] == "minimize" else -values
+        else:
+            cost = np.zeros(size)
+        return violation, cost
+
+    def _validate(self, scenario_name: str, constraints: List[Mapping[str, Any]], objective: Optional[Mapping[str, Any]]) -> None:
+        scenario = scenario_registry.get(scenario_name)
+        if scenario is None:
+            raise ValueError(f"No simulation model for scenario: {scenario_name}")
+        if not constraints and not objective:
+            raise ValueError("Provide at least one constraint or an objective")
+
+        available = set(scenario.outcome_names)
+        for target in list(constraints) + ([objective] if objective else []):
+            if target["outcome"] not in available:
+                raise ValueError(f"Unknown outcome for {scenario_name}: {target['outcome']}")
+        for constraint in constraints:
+            if constraint["operator"] not in CONSTRAINT_OPERATORS:
+                raise ValueError(f"Operator must be one of: {list(CONSTRAINT_OPERATORS)}")
+        if objective and objective["direction"] not in ("minimize", "maximize"):
+            raise ValueError("Objective direction must be 'minimize' or 'maximize'")
+
+    def solve(self, scenario_name: str, constraints: List[Mapping[str, Any]], objective: Optional[Mapping[str, Any]] = None, fixed: Optional[Mapping[str, float]] = None, bounds: Optional[Mapping[str, Any]] = None, tolerance: float = 1e-6, seed: int = 42) -> Dict[str, Any]:
+        """Search the scenario's parameter space for the best parameters.
+
+        ``constraints`` are ``{"outcome", "operator", "value"}`` targets and
+        ``objective`` an optional ``{"outcome", "direction"}``. Parameters in
+        ``fixed`` are held constant; the rest are searched within ``bounds``,
+        which default to the scenario's slider ranges.
+        """
+        self._validate(scenario_name, constraints, objective)
+
+        fixed = dict(fixed or {})
+        search_bounds = dict(simulation_engine.get_parameter_bounds(scenario_name))
+        for name, limits in (bounds or {}).items():
+            if name not in search_bounds:
+                raise ValueError(f"{scenario_name} has no adjustable parameter {name}")
+            low, high = float(limits[0]), float(limits[1])
+            if not 0 <= low <= high <= 100:
+                raise ValueError(f"Bounds for {name} must satisfy 0 <= min <= max <= 100")
+            search_bounds[name] = (low, high)
+        bounds = {name: limits for name, limits in search_bounds.items() if name not in fixed}
+        names = list(bounds)
+        lower = np.array([bounds[name][0] for name in names])
+        upper = np.array([bounds[name][1] for name in names])
+        rng = np.random.default_rng(seed)
+
+        best_point = None
+        best_key = None
+        box_lower, box_upper = lower.copy(), upper.copy()
+        trace = []
+
+        for round_index in range(self.rounds):
+            points = box_lower + rng.random((self.candidates, len(names))) * (box_upper - box_lower)
+            if best_point is not None:
+                points[0] = best_point  # keep the incumbent so rounds never regress
+
+            params = dict(fixed)
+            params.update({name: points[:, index] for index, name in enumerate(names)})
+            outcomes = simulation_engine.run_batch(scenario_name, params)
+            violation, cost = self._score(outcomes, constraints, objective)
+
+            feasible = violation <= tolerance
+            # Lexicographic ranking: feasible first, then objective, then violation
+            ranked = np.lexsort((violation, np.where(feasible, cost, 0.0), ~feasible))
+            best = int(ranked[0])
+            best_point = points[best]
+            best_key = (bool(feasible[best]), float(cost[best]), float(violation[best]))
+
+            trace.append({
+                "round": round_index + 1,
+                "candidates": int(len(points)),
+                "feasible_candidates": int(feasible.sum()),
+                "best_objective": float(outcomes[objective["outcome"]][best]) if objective else None,
+                "best_violation": float(violation[best]),
+                "search_box": {
+                    name: [float(box_lower[index]), float(box_upper[index])]
+                    for index, name in enumerate(names)
+                },
+            })
+
+            # Refine: shrink the search box around the incumbent
+            half_width = (box_upper - box_lower) * self.shrink / 2
+            box_lower = np.maximum(lower, best_point - half_width)
+            box_upper = np.minimum(upper, best_point + half_width)
+
+        solution = dict(fixed)
+        solution.update({name: float(best_point[index]) for index, name in enumerate(names)})
+        parameters = SimulationParameters(**solution)
+
+        return {
+            "scenario_name": scenario_name,
+            "feasible": best_key[0],
+            "parameters": parameters.dict(),
+            "predicted_outcomes": simulation_engine.run_simulation(scenario_name, parameters),
+            "constraint_violation": best_key[2],
+            "trace": trace,
+        }
+
+# Initialize goal-seek service
+goal_seek_service = GoalSeekService()
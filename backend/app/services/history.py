@@ -0,0 +1,73 @@
+import base64
+import logging
+from typing import Dict, Any, Optional, Sequence
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Per-user history tables; each gets a (user_id, id) index
+HISTORY_TABLES = ("policy_simulations", "documents")
+MAX_HISTORY_PAGE = 100
+
+def encode_cursor(row_id: int) -> str:
+    """Opaque cursor for the position just after row ``row_id``"""
+    return base64.urlsafe_b64encode(str(row_id).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        return int(raw)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid history cursor")
+
+class KeysetPaginator:
+    """Newest-first pages of a user's rows, keyed on id.
+
+    Ids are assigned in insertion order, so they order rows like
+    ``created_at`` without its ties and mixed storage formats (SQLite keeps
+    server-default timestamps without fractional seconds). Each page
+    continues strictly after the last id of the previous one, so with the
+    composite (user_id, id) index a fetch is one index range scan however
+    deep the page is, unlike ``OFFSET`` which reads and discards every
+    earlier row. Only the requested columns are selected, which keeps large
+    text columns out of list views.
+    """
+
+    def ensure_indexes(self, engine: Engine) -> None:
+        """Create the composite history indexes (idempotent startup DDL)"""
+        inspector = inspect(engine)
+        with engine.begin() as connection:
+            for table_name in HISTORY_TABLES:
+                if inspector.has_table(table_name):
+                    connection.execute(text(
+                        f"CREATE INDEX IF NOT EXISTS ix_{table_name}_user_id_id "
+                        f"ON {table_name} (user_id, id)"
+                    ))
+        logger.info("History pagination indexes are in place")
+
+    def page(self, db: Session, model: Any, user_id: Any, columns: Sequence[Any], cursor: Optional[str] = None, limit: int = 20) -> Dict[str, Any]:
+        """One page of ``columns`` for ``user_id`` plus the cursor of the next page"""
+        limit = max(1, min(limit, MAX_HISTORY_PAGE))
+        query = db.query(*columns, model.id.label("_id")).filter(model.user_id == user_id)
+        if cursor:
+            query = query.filter(model.id < decode_cursor(cursor))
+
+        # One extra row tells whether another page follows
+        rows = query.order_by(model.id.desc()).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        return {
+            "items": [
+                {key: value for key, value in row._mapping.items() if key != "_id"}
+                for row in rows
+            ],
+            "next_cursor": encode_cursor(rows[-1]._id) if has_more else None,
+            "has_more": has_more,
+        }
+
+# Initialize history paginator; indexes are created at startup
+history_paginator = KeysetPaginator()
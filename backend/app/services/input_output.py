@@ -0,0 +1,114 @@
+import hashlib
+from typing import Dict, Any, List, Mapping
+import numpy as np
+
+# Simplified national input-output table. Each row is a supplying sector and
+# each of the first columns a purchasing sector: the rupees of the row's output
+# used per rupee of the column's output (technical coefficients, loosely after
+# the MoSPI supply-use tables). The last column is jobs per crore of output.
+# Precise enough to indicate spillovers, not for reporting.
+SECTOR_TABLE = """
+agriculture       0.12 0.00 0.12 0.00 0.01 0.03 0.00 0.02 0.01  45.0
+mining            0.00 0.03 0.08 0.18 0.05 0.01 0.00 0.00 0.00   3.0
+manufacturing     0.10 0.12 0.32 0.10 0.30 0.10 0.03 0.18 0.05   6.0
+utilities         0.02 0.06 0.04 0.12 0.02 0.02 0.01 0.03 0.02   2.0
+construction      0.01 0.02 0.01 0.04 0.02 0.01 0.03 0.02 0.02  14.0
+trade_transport   0.05 0.08 0.10 0.05 0.10 0.08 0.03 0.05 0.03  12.0
+finance_business  0.03 0.05 0.05 0.05 0.06 0.10 0.12 0.05 0.04   4.0
+health            0.00 0.00 0.00 0.00 0.00 0.00 0.00 0.02 0.00  10.0
+education         0.00 0.00 0.00 0.00 0.00 0.00 0.01 0.01 0.01  18.0
+"""
+
+RUPEES_PER_CRORE = 1e7
+MAX_LEONTIEF_CONDITION = 1e6  # beyond this multipliers amplify tiny coefficient errors
+
+class InputOutputModel:
+    """Leontief model propagating final demand through inter-sector purchases.
+
+    Spending ``f`` on sectors requires gross output ``x = (I - A)^-1 f``. The
+    Leontief inverse is computed once when the table is loaded, so each
+    request is a single matrix product; any number of demand vectors can be
+    passed as the columns of one right-hand side.
+    """
+
+    def __init__(self, table: str = SECTOR_TABLE):
+        sectors, rows = [], []
+        for line in table.strip().splitlines():
+            fields = line.split()
+            sectors.append(fields[0])
+            rows.append([float(value) for value in fields[1:]])
+
+        values = np.array(rows, dtype=np.float64)
+        if values.shape != (len(sectors), len(sectors) + 1):
+            raise ValueError("Input-output table must be square plus one employment column")
+
+        self.sectors = tuple(sectors)
+        self.index = {sector: position for position, sector in enumerate(sectors)}
+        self.coefficients = values[:, :-1]
+        self.jobs_per_rupee = values[:, -1] / RUPEES_PER_CRORE
+        if np.any(self.coefficients < 0) or np.any(self.coefficients.sum(axis=0) >= 1):
+            raise ValueError("Every sector must use less than one rupee of inputs per rupee of output")
+
+        # Column sums below one keep I - A invertible, but sums just below one make it near-singular
+        system = np.eye(len(sectors)) - self.coefficients
+        condition = np.linalg.cond(system)
+        if not condition < MAX_LEONTIEF_CONDITION:
+            raise ValueError(
+                f"Input-output table is near-singular (condition number {condition:.3g}, "
+                f"limit {MAX_LEONTIEF_CONDITION:.0e}); check for sectors using almost a rupee of inputs per rupee"
+            )
+        self.leontief = np.linalg.inv(system)
+        for array in (self.coefficients, self.jobs_per_rupee, self.leontief):
+            array.setflags(write=False)
+        self.fingerprint = hashlib.sha256(values.tobytes()).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self.sectors)
+
+    def demand_vector(self, sector_shares: Mapping[str, float]) -> np.ndarray:
+        """Dense per-sector split of spending; shares must name known sectors and sum to 1"""
+        unknown = set(sector_shares) - set(self.sectors)
+        if unknown:
+            raise ValueError(f"Unknown sectors: {sorted(unknown)}. Available: {list(self.sectors)}")
+        shares = np.zeros(len(self.sectors))
+        for sector, share in sector_shares.items():
+            shares[self.index[sector]] = float(share)
+        if np.any(shares < 0) or not np.isclose(shares.sum(), 1.0):
+            raise ValueError("Sector shares must be non-negative and sum to 1")
+        return shares
+
+    def solve(self, final_demand: np.ndarray) -> np.ndarray:
+        """Gross output per sector for demand shaped (sectors, ...); trailing axes are independent cases"""
+        final_demand = np.asarray(final_demand, dtype=np.float64)
+        columns = final_demand.reshape(len(self.sectors), -1)
+        return (self.leontief @ columns).reshape(final_demand.shape)
+
+    def sector_output(self, shares: np.ndarray, spending: Any) -> np.ndarray:
+        """Gross output per sector (sector axis first) for spending of any shape split by ``shares``"""
+        spending = np.asarray(spending, dtype=np.float64)
+        final_demand = shares.reshape((-1,) + (1,) * spending.ndim) * spending
+        return self.solve(final_demand)
+
+    def indirect_jobs(self, sector_output: np.ndarray, shares: np.ndarray, spending: Any) -> np.ndarray:
+        """Jobs supported by supplier output beyond the direct spending"""
+        spending = np.asarray(spending, dtype=np.float64)
+        final_demand = shares.reshape((-1,) + (1,) * spending.ndim) * spending
+        return np.tensordot(self.jobs_per_rupee, sector_output - final_demand, axes=1)
+
+    def breakdown(self, shares: np.ndarray, spending: float) -> List[Dict[str, Any]]:
+        """Direct and total output and jobs of every sector for one spending amount"""
+        direct = shares * spending
+        total = self.sector_output(shares, spending)
+        return [
+            {
+                "sector": sector,
+                "direct_output": float(direct[position]),
+                "total_output": float(total[position]),
+                "indirect_output": float(total[position] - direct[position]),
+                "indirect_jobs": int((total[position] - direct[position]) * self.jobs_per_rupee[position]),
+            }
+            for position, sector in enumerate(self.sectors)
+        ]
+
+# Build the input-output model and its Leontief inverse once at startup
+input_output_model = InputOutputModel()
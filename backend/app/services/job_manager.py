@@ -0,0 +1,272 @@
+import asyncio
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Awaitable, Callable, List, Mapping, Optional, Set
+
+import numpy as np
+
+from app.config import get_settings
+from app.services.monte_carlo import (
+    QuantileSketch,
+    build_sketches,
+    evaluate_chunk,
+    plan_monte_carlo,
+    summarize_monte_carlo,
+)
+from app.services.simulation_engine import simulation_engine
+from app.utils.exceptions import JobLimitException
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ("queued", "running", "completed", "failed", "cancelled")
+
+# Worker functions run in pool processes, so they must be importable module-level callables
+
+def _monte_carlo_pilot(plan: Mapping[str, Any], seed_sequence: np.random.SeedSequence, size: int) -> Dict[str, np.ndarray]:
+    return evaluate_chunk(
+        plan["scenario_name"], plan["parameters"], plan["parameter_spreads"],
+        plan["constant_spreads"], seed_sequence, size
+    )
+
+def _monte_carlo_partial(plan: Mapping[str, Any], layouts: Mapping[str, tuple], seed_sequence: np.random.SeedSequence, size: int) -> Dict[str, QuantileSketch]:
+    """Evaluate one chunk and reduce it to sketches with the job's bucket layout"""
+    outcomes = _monte_carlo_pilot(plan, seed_sequence, size)
+    sketches = {}
+    for key, (lower, upper, bins) in layouts.items():
+        sketches[key] = QuantileSketch(lower, upper, bins)
+        sketches[key].update(outcomes[key])
+    return sketches
+
+def _sweep_block(scenario_name: str, axes: Mapping[str, np.ndarray], fixed: Mapping[str, Any]) -> Dict[str, Any]:
+    outcomes = simulation_engine.run_sweep(scenario_name, axes, fixed)
+    return {
+        key: value if isinstance(value, str) else np.ascontiguousarray(value)
+        for key, value in outcomes.items()
+    }
+
+class SimulationJob:
+    """State of one background simulation job"""
+
+    def __init__(self, kind: str, user_id: Any, cancellable: bool = True):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.user_id = user_id
+        self.cancellable = cancellable
+        self.status = "queued"
+        self.progress = 0.0
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.summary: Optional[Dict[str, Any]] = None  # small result details sent with status messages
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.futures: List[asyncio.Future] = []
+        self.task: Optional[asyncio.Task] = None
+        self.subscribers: Set[asyncio.Queue] = set()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed", "cancelled")
+
+    def to_dict(self) -> Dict[str, Any]:
+        info = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": round(self.progress, 4),
+            "error": self.error,
+        }
+        if self.summary is not None:
+            info["summary"] = self.summary
+        return info
+
+class SimulationJobManager:
+    """Runs heavy simulations on a process pool without blocking the event loop.
+
+    Work is split into chunks submitted individually; partial results are
+    merged in the event loop as they arrive, and every merge publishes a
+    progress message to the job's WebSocket subscribers. Cancelling a job
+    drops its queued chunks; chunks already running finish but are ignored.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or settings.SIMULATION_WORKERS or os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.jobs: Dict[str, SimulationJob] = {}
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def shutdown(self) -> None:
+        for job in self.jobs.values():
+            self.cancel(job.id)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def get(self, job_id: str) -> Optional[SimulationJob]:
+        return self.jobs.get(job_id)
+
+    def _prune(self, user_id: Any) -> None:
+        """Drop expired jobs, and ``user_id``'s oldest finished jobs beyond its retention limit"""
+        cutoff = time.time() - settings.SIMULATION_JOB_RETENTION
+        for job_id in [job.id for job in self.jobs.values() if job.finished and job.finished_at < cutoff]:
+            del self.jobs[job_id]
+
+        finished = sorted(
+            (job for job in self.jobs.values() if job.user_id == user_id and job.finished),
+            key=lambda job: job.finished_at
+        )
+        # Leave room for the job about to start
+        for job in finished[:max(0, len(finished) - settings.SIMULATION_RETAINED_JOBS_PER_USER + 1)]:
+            del self.jobs[job.id]
+
+    def _publish(self, job: SimulationJob) -> None:
+        message = {"type": "job_progress", **job.to_dict()}
+        for queue in job.subscribers:
+            queue.put_nowait(message)
+
+    def subscribe(self, job_id: str, queue: asyncio.Queue) -> bool:
+        job = self.jobs.get(job_id)
+        if job is None:
+            return False
+        job.subscribers.add(queue)
+        queue.put_nowait({"type": "job_progress", **job.to_dict()})
+        return True
+
+    def disconnect(self, queue: asyncio.Queue, cancel: bool = True) -> None:
+        """Forget a WebSocket's subscriptions, cancelling unfinished jobs it was following"""
+        for job in list(self.jobs.values()):
+            if queue in job.subscribers:
+                job.subscribers.discard(queue)
+                if cancel and job.cancellable and not job.subscribers and not job.finished:
+                    logger.info(f"Cancelling simulation job {job.id}: client disconnected")
+                    self.cancel(job.id)
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.jobs.get(job_id)
+        if job is None or job.finished or not job.cancellable:
+            return False
+        for future in job.futures:
+            future.cancel()
+        started = job.status != "queued"
+        job.status = "cancelled"
+        job.finished_at = time.time()
+        job.task.cancel()
+        if not started:
+            self._publish(job)  # a task cancelled before its first step never reports back
+        return True
+
+    def _start(self, kind: str, user_id: Any, runner, cancellable: bool = True) -> SimulationJob:
+        self._prune(user_id)
+        active = sum(1 for job in self.jobs.values() if job.user_id == user_id and not job.finished)
+        if active >= settings.SIMULATION_JOBS_PER_USER:
+            raise JobLimitException(
+                f"Too many background jobs running ({active}); wait for one to finish or cancel it"
+            )
+        job = SimulationJob(kind, user_id, cancellable)
+        self.jobs[job.id] = job
+
+        async def run():
+            job.status = "running"
+            self._publish(job)
+            try:
+                job.result = await runner(job)
+                job.status = "completed"
+                job.progress = 1.0
+            except asyncio.CancelledError:
+                job.status = "cancelled"
+                job.result = None
+            except Exception as e:
+                logger.error(f"Simulation job {job.id} failed: {e}")
+                job.status = "failed"
+                job.error = str(e)
+            for future in job.futures:
+                future.cancel()
+            job.finished_at = time.time()
+            job.futures = []
+            self._publish(job)
+
+        job.task = asyncio.get_running_loop().create_task(run())
+        return job
+
+    def submit_task(self, kind: str, user_id: Any, runner: Callable[[SimulationJob], Awaitable[Any]], cancellable: bool = True) -> SimulationJob:
+        """Track an I/O-bound coroutine (e.g. an LLM call and a database write) as a job on the event loop"""
+        return self._start(kind, user_id, runner, cancellable)
+
+    def submit_monte_carlo(self, user_id: Any, scenario_name: str, parameters: Mapping[str, float], samples: int, seed: int, parameter_uncertainty: Optional[Mapping[str, Any]] = None, constant_uncertainty: Optional[Mapping[str, Any]] = None) -> SimulationJob:
+        """Start a Monte Carlo job; results match run_monte_carlo for the same seed"""
+        plan = plan_monte_carlo(
+            scenario_name, parameters, samples, seed,
+            parameter_uncertainty, constant_uncertainty
+        )
+
+        async def runner(job: SimulationJob) -> Dict[str, Any]:
+            loop = asyncio.get_running_loop()
+            chunks = plan["chunks"]
+            worker_plan = {key: value for key, value in plan.items() if key != "chunks"}
+
+            # The first chunk fixes every sketch's bucket range
+            pilot = loop.run_in_executor(self.pool, _monte_carlo_pilot, worker_plan, *chunks[0])
+            job.futures = [pilot]
+            outcomes = await pilot
+            sketches = build_sketches(outcomes)
+            for key, values in outcomes.items():
+                sketches[key].update(values)
+            job.progress = 1 / len(chunks)
+            self._publish(job)
+
+            layouts = {key: (sketch.lower, sketch.upper, sketch.bins) for key, sketch in sketches.items()}
+            job.futures = [
+                loop.run_in_executor(self.pool, _monte_carlo_partial, worker_plan, layouts, *chunk)
+                for chunk in chunks[1:]
+            ]
+            for done, future in enumerate(asyncio.as_completed(job.futures), start=2):
+                partial = await future
+                for key, sketch in partial.items():
+                    sketches[key].merge(sketch)
+                job.progress = done / len(chunks)
+                self._publish(job)
+
+            return summarize_monte_carlo(plan, sketches)
+
+        return self._start("monte_carlo", user_id, runner)
+
+    def submit_sweep(self, user_id: Any, scenario_name: str, axes: Mapping[str, np.ndarray], fixed: Optional[Mapping[str, Any]] = None) -> SimulationJob:
+        """Start a sweep job split into blocks along the first axis"""
+        names = list(axes)
+        first = np.asarray(axes[names[0]])
+        blocks = np.array_split(first, min(len(first), self.max_workers * 4))
+
+        async def runner(job: SimulationJob) -> Dict[str, Any]:
+            loop = asyncio.get_running_loop()
+            job.futures = [
+                loop.run_in_executor(self.pool, _sweep_block, scenario_name, {**axes, names[0]: block}, fixed or {})
+                for block in blocks
+            ]
+
+            parts: List[Optional[Dict[str, Any]]] = [None] * len(blocks)
+            index_of = {future: index for index, future in enumerate(job.futures)}
+            pending = set(job.futures)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    parts[index_of[future]] = future.result()
+                job.progress = 1 - len(pending) / len(blocks)
+                self._publish(job)
+
+            outcomes = {}
+            for key, value in parts[0].items():
+                outcomes[key] = value if isinstance(value, str) else np.concatenate([part[key] for part in parts])
+            return {"scenario_name": scenario_name, "axes": dict(axes), "outcomes": outcomes}
+
+        return self._start("sweep", user_id, runner)
+
+# Initialize simulation job manager; the process pool starts on first use
+job_manager = SimulationJobManager()
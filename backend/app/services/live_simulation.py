@@ -0,0 +1,117 @@
+import asyncio
+import logging
+from typing import Dict, Any, Awaitable, Callable, Mapping, Optional, Tuple
+import numpy as np
+
+from app.schemas.simulation import SimulationParameters, validate_scenario_name
+from app.services.regional_baselines import regional_baselines
+from app.services.scenario_registry import IncrementalEvaluator, scenario_registry
+from app.services.simulation_engine import SIMULATION_MODES, simulation_engine
+
+logger = logging.getLogger(__name__)
+
+class LiveSimulationSession:
+    """Streams outcomes for slider changes arriving over one WebSocket.
+
+    ``update`` only records the newest frame; a single loop evaluates
+    whatever is newest once the previous reply has been sent, so a burst of
+    slider events costs one evaluation and stale frames are never answered.
+    Nothing is persisted and no AI explanation is requested.
+    """
+
+    def __init__(self, send: Callable[[Dict[str, Any]], Awaitable[None]]):
+        self._send = send
+        self._latest: Optional[Mapping[str, Any]] = None
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._evaluators: Dict[Tuple[str, bool], Tuple[IncrementalEvaluator, Optional[Dict[str, Any]], Dict[str, Any]]] = {}
+        self.received = 0
+        self.evaluated = 0
+
+    def update(self, frame: Mapping[str, Any]) -> None:
+        self.received += 1
+        self._latest = frame
+        self._ready.set()
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+
+    async def _run(self) -> None:
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            frame, self._latest = self._latest, None
+            if frame is None:
+                continue
+            self.evaluated += 1
+            await self._send(self.evaluate(frame))
+
+    def _evaluator(self, scenario_name: str, regional: bool) -> Tuple[IncrementalEvaluator, Dict[str, Any]]:
+        """This session's evaluator for a scenario, rebuilt if the definition was reloaded"""
+        scenario = scenario_registry.get(scenario_name)
+        key = (scenario_name, regional)
+        cached = self._evaluators.get(key)
+        if cached is None or cached[0].scenario is not scenario:
+            constants = scenario.regionalize(regional_baselines.columns()) if regional else None
+            cached = (IncrementalEvaluator(scenario), constants, {})
+            self._evaluators[key] = cached
+        return cached
+
+    def evaluate(self, frame: Mapping[str, Any]) -> Dict[str, Any]:
+        """Compute the reply for one frame: numeric outcomes only.
+
+        Intermediate values and converted outcomes are cached per scenario,
+        so a slider move only recomputes the formulas downstream of it.
+        """
+        seq = frame.get("seq")
+        try:
+            scenario_name = validate_scenario_name(frame.get("scenario_name"))
+            parameters = SimulationParameters(**(frame.get("parameters") or {}))
+            regional = bool(frame.get("regional"))
+            mode = frame.get("mode", "snapshot")
+            if mode not in SIMULATION_MODES:
+                raise ValueError(f"Mode must be one of: {list(SIMULATION_MODES)}")
+
+            evaluator, constants, reply = self._evaluator(scenario_name, regional)
+            params = {name: np.asarray(float(value)) for name, value in parameters.dict().items()}
+            outcomes, changed = evaluator.update(params, constants)
+
+            if regional:
+                size = len(regional_baselines)
+                if changed:
+                    regions = {key: np.broadcast_to(outcomes[key], (size,)) for key in changed}
+                    reply.setdefault("regions", {}).update(
+                        (key, simulation_engine.to_jsonable(value)) for key, value in regions.items()
+                    )
+                    reply.setdefault("national", {}).update(
+                        (key, simulation_engine.to_jsonable(value))
+                        for key, value in simulation_engine.rollup_regions(regions).items()
+                    )
+                predicted_outcomes = {"regions": dict(reply["regions"]), "national": dict(reply["national"])}
+            else:
+                reply.update((key, np.asarray(outcomes[key]).item()) for key in changed)
+                if changed:
+                    reply.pop("projection", None)
+                predicted_outcomes = {key: reply[key] for key in evaluator.scenario.outcome_names}
+                if mode == "projection":
+                    projection = frame.get("projection")
+                    if "projection" not in reply or reply.get("projection_options") != projection:
+                        reply["projection"] = simulation_engine.projection_series(scenario_name, predicted_outcomes, projection)
+                        reply["projection_options"] = projection
+                    predicted_outcomes["projection"] = reply["projection"]
+        except (ValueError, TypeError) as e:
+            return {"type": "error", "seq": seq, "message": str(e)}
+        except Exception as e:
+            logger.error(f"Live simulation failed: {e}")
+            return {"type": "error", "seq": seq, "message": "Simulation failed"}
+
+        return {
+            "type": "outcomes",
+            "seq": seq,
+            "scenario_name": scenario_name,
+            "predicted_outcomes": predicted_outcomes,
+            "skipped_frames": self.received - self.evaluated,
+        }
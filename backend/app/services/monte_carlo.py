@@ -0,0 +1,228 @@
+from typing import Dict, Any, List, Mapping, Optional, Tuple
+import logging
+import numpy as np
+
+from app.config import get_settings
+from app.services.scenario_registry import PARAMETER_NAMES, scenario_registry
+from app.services.simulation_engine import simulation_engine
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+DISTRIBUTIONS = ("normal", "uniform", "triangular")
+PERCENTILES = (5, 50, 95)
+
+# Relative spread applied when a request does not describe an input's uncertainty
+DEFAULT_CONSTANT_SPREAD = {"distribution": "normal", "spread": 0.10}
+DEFAULT_PARAMETER_SPREAD = {"distribution": "normal", "spread": 0.05}
+
+class QuantileSketch:
+    """Fixed-memory, mergeable summary of a stream of samples.
+
+    Values are counted into ``bins`` equal-width buckets over [lower, upper);
+    anything outside is counted in an underflow/overflow bucket whose extent
+    is bounded by the exact running min/max. Quantiles are interpolated within
+    a bucket, so they are accurate to one bucket width.
+    """
+
+    def __init__(self, lower: float, upper: float, bins: int = 4096):
+        if not upper > lower:
+            upper = lower + max(abs(lower) * 1e-9, 1e-9)
+        self.lower = float(lower)
+        self.upper = float(upper)
+        self.counts = np.zeros(bins + 2, dtype=np.int64)  # [underflow, bins..., overflow]
+        self.count = 0
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+
+    @property
+    def bins(self) -> int:
+        return len(self.counts) - 2
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if values.size == 0:
+            return
+
+        width = (self.upper - self.lower) / self.bins
+        index = np.floor((values - self.lower) / width).astype(np.int64) + 1
+        np.clip(index, 0, self.bins + 1, out=index)
+        self.counts += np.bincount(index, minlength=self.bins + 2)
+
+        self.count += values.size
+        self.total += float(values.sum())
+        self.total_squares += float(np.square(values).sum())
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if (other.lower, other.upper, other.bins) != (self.lower, self.upper, self.bins):
+            raise ValueError("Cannot merge sketches with different bucket layouts")
+
+        self.counts += other.counts
+        self.count += other.count
+        self.total += other.total
+        self.total_squares += other.total_squares
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return float("nan")
+
+        # Bucket edges, with the outer buckets closed off by the exact extremes
+        edges = np.concatenate((
+            [min(self.minimum, self.lower)],
+            np.linspace(self.lower, self.upper, self.bins + 1),
+            [max(self.maximum, self.upper)],
+        ))
+        cumulative = np.cumsum(self.counts)
+        rank = q * self.count
+        bucket = int(np.searchsorted(cumulative, rank, side="left"))
+        bucket = min(bucket, len(self.counts) - 1)
+
+        below = cumulative[bucket - 1] if bucket > 0 else 0
+        inside = self.counts[bucket]
+        fraction = (rank - below) / inside if inside else 0.0
+        value = edges[bucket] + fraction * (edges[bucket + 1] - edges[bucket])
+        return float(min(max(value, self.minimum), self.maximum))
+
+    def summary(self, percentiles: Tuple[int, ...] = PERCENTILES) -> Dict[str, float]:
+        mean = self.total / self.count if self.count else float("nan")
+        variance = max(self.total_squares / self.count - mean * mean, 0.0) if self.count else float("nan")
+        result = {f"p{p}": self.quantile(p / 100) for p in percentiles}
+        result.update({
+            "mean": mean,
+            "std": float(np.sqrt(variance)),
+            "min": self.minimum,
+            "max": self.maximum,
+        })
+        return result
+
+def _resolve_spreads(names: List[str], overrides: Optional[Mapping[str, Mapping[str, Any]]], default: Mapping[str, Any], kind: str) -> Dict[str, Dict[str, Any]]:
+    """Merge per-input uncertainty overrides over the default spread"""
+    overrides = dict(overrides or {})
+    unknown = set(overrides) - set(names)
+    if unknown:
+        raise ValueError(f"Unknown {kind} for uncertainty: {sorted(unknown)}")
+
+    spreads = {}
+    for name in names:
+        spec = dict(default)
+        spec.update(overrides.get(name, {}))
+        if spec["distribution"] not in DISTRIBUTIONS:
+            raise ValueError(f"Distribution must be one of: {list(DISTRIBUTIONS)}")
+        if spec["spread"] < 0:
+            raise ValueError("Spread must be non-negative")
+        spreads[name] = spec
+    return spreads
+
+def _draw(rng: np.random.Generator, point: float, spec: Mapping[str, Any], size: int) -> np.ndarray:
+    """Draw samples around ``point`` with a relative spread"""
+    spread = spec["spread"]
+    if spread == 0 or point == 0:
+        return np.full(size, float(point))
+
+    if spec["distribution"] == "normal":
+        noise = rng.standard_normal(size)
+    elif spec["distribution"] == "uniform":
+        noise = rng.uniform(-1.0, 1.0, size)
+    else:
+        noise = rng.triangular(-1.0, 0.0, 1.0, size)
+    return point * (1.0 + spread * noise)
+
+def evaluate_chunk(scenario_name: str, parameters: Mapping[str, float], parameter_spreads: Mapping[str, Mapping[str, Any]], constant_spreads: Mapping[str, Mapping[str, Any]], seed_sequence: np.random.SeedSequence, size: int) -> Dict[str, np.ndarray]:
+    """Draw one chunk of inputs and evaluate the scenario on it.
+
+    Each chunk owns its own SeedSequence, so results do not depend on the
+    order (or process) in which chunks are evaluated.
+    """
+    rng = np.random.default_rng(seed_sequence)
+
+    params = {
+        name: np.clip(_draw(rng, parameters[name], parameter_spreads[name], size), 0.0, 100.0)
+        for name in PARAMETER_NAMES
+    }
+    constants = {
+        name: np.maximum(_draw(rng, point, constant_spreads[name], size), 0.0)
+        for name, point in scenario_registry.get(scenario_name).constants.items()
+    }
+
+    outcomes = simulation_engine.run_batch(scenario_name, params, constants)
+    return {key: value for key, value in outcomes.items() if not isinstance(value, str)}
+
+def build_sketches(outcomes: Mapping[str, np.ndarray]) -> Dict[str, QuantileSketch]:
+    """Create empty sketches whose bucket range is taken from a pilot chunk"""
+    sketches = {}
+    for key, values in outcomes.items():
+        low, high = float(values.min()), float(values.max())
+        margin = (high - low) * 0.05
+        sketches[key] = QuantileSketch(low - margin, high + margin)
+    return sketches
+
+def plan_monte_carlo(scenario_name: str, parameters: Mapping[str, float], samples: int, seed: int, parameter_uncertainty: Optional[Mapping[str, Mapping[str, Any]]] = None, constant_uncertainty: Optional[Mapping[str, Mapping[str, Any]]] = None, chunk_size: Optional[int] = None) -> Dict[str, Any]:
+    """Validate a Monte Carlo request and split it into seeded chunks"""
+    scenario = scenario_registry.get(scenario_name)
+    if scenario is None:
+        raise ValueError(f"No simulation model for scenario: {scenario_name}")
+    if samples < 1:
+        raise ValueError("Samples must be positive")
+
+    chunk_size = chunk_size or settings.MONTE_CARLO_CHUNK_SIZE
+    sizes = [chunk_size] * (samples // chunk_size)
+    if samples % chunk_size:
+        sizes.append(samples % chunk_size)
+
+    point_values = {name: float(parameters[name]) for name in PARAMETER_NAMES}
+    return {
+        "scenario_name": scenario_name,
+        "parameters": point_values,
+        "parameter_spreads": _resolve_spreads(list(PARAMETER_NAMES), parameter_uncertainty, DEFAULT_PARAMETER_SPREAD, "parameters"),
+        "constant_spreads": _resolve_spreads(list(scenario.constants), constant_uncertainty, DEFAULT_CONSTANT_SPREAD, "constants"),
+        "seed": seed,
+        "samples": samples,
+        "chunk_size": chunk_size,
+        "chunks": list(zip(np.random.SeedSequence(seed).spawn(len(sizes)), sizes)),
+    }
+
+def summarize_monte_carlo(plan: Mapping[str, Any], sketches: Mapping[str, QuantileSketch]) -> Dict[str, Any]:
+    """Turn merged sketches into the Monte Carlo response payload"""
+    return {
+        "scenario_name": plan["scenario_name"],
+        "samples": plan["samples"],
+        "seed": plan["seed"],
+        "chunk_size": plan["chunk_size"],
+        "percentiles": list(PERCENTILES),
+        "outcomes": {key: sketch.summary() for key, sketch in sketches.items()},
+        "uncertainty": {
+            "parameters": plan["parameter_spreads"],
+            "constants": plan["constant_spreads"],
+        },
+    }
+
+def run_monte_carlo(scenario_name: str, parameters: Mapping[str, float], samples: int = 100000, seed: int = 42, parameter_uncertainty: Optional[Mapping[str, Mapping[str, Any]]] = None, constant_uncertainty: Optional[Mapping[str, Mapping[str, Any]]] = None, chunk_size: Optional[int] = None) -> Dict[str, Any]:
+    """Run a seeded Monte Carlo simulation and return percentile bands.
+
+    Samples are drawn and evaluated ``chunk_size`` at a time and folded into
+    QuantileSketch summaries, so memory stays bounded by the chunk size no
+    matter how many samples are requested.
+    """
+    plan = plan_monte_carlo(
+        scenario_name, parameters, samples, seed,
+        parameter_uncertainty, constant_uncertainty, chunk_size
+    )
+
+    sketches = None
+    for seed_sequence, size in plan["chunks"]:
+        outcomes = evaluate_chunk(
+            scenario_name, plan["parameters"], plan["parameter_spreads"],
+            plan["constant_spreads"], seed_sequence, size
+        )
+        if sketches is None:
+            sketches = build_sketches(outcomes)
+        for key, values in outcomes.items():
+            sketches[key].update(values)
+
+    return summarize_monte_carlo(plan, sketches)
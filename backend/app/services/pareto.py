@@ -0,0 +1,151 @@
+from typing import Dict, Any, List, Mapping
+import logging
+import numpy as np
+
+from app.services.scenario_registry import scenario_registry
+from app.services.simulation_engine import simulation_engine
+
+logger = logging.getLogger(__name__)
+
+def _front_2d(points: np.ndarray) -> np.ndarray:
+    """Sort by the first objective and keep strict improvements in the second"""
+    order = np.lexsort((points[:, 1], points[:, 0]))
+    second = points[order, 1]
+    best_before = np.concatenate(([np.inf], np.minimum.accumulate(second)[:-1]))
+    return order[second < best_before]
+
+def _front_3d(points: np.ndarray) -> np.ndarray:
+    """Sweep in first-objective order, keeping prefix minima of the third objective.
+
+    A Fenwick tree over the ranks of the second objective answers "smallest
+    third objective among kept points no worse in the second" and records
+    each kept point in O(log n), so the sweep is O(n log n) whatever the
+    shape of the front.
+    """
+    order = np.lexsort((points[:, 2], points[:, 1], points[:, 0]))
+    levels = np.unique(points[:, 1])
+    ranks = (np.searchsorted(levels, points[:, 1]) + 1).tolist()  # 1-based tree positions
+    thirds = points[:, 2].tolist()
+    size = len(levels)
+    tree = [np.inf] * (size + 1)
+    kept = []
+    for index in order.tolist():
+        z = thirds[index]
+        position = ranks[index]
+        best = np.inf
+        while position:
+            if tree[position] < best:
+                best = tree[position]
+            position &= position - 1
+        if best <= z:
+            continue
+        kept.append(index)
+
+        position = ranks[index]
+        while position <= size:
+            if z < tree[position]:
+                tree[position] = z
+            position += position & -position
+    return np.array(kept, dtype=np.int64)
+
+def _front_nd(points: np.ndarray) -> np.ndarray:
+    """Sort-filter skyline for higher dimensions, comparing against the front in bulk"""
+    order = np.lexsort(points.T[::-1])
+    front = np.empty((0, points.shape[1]))
+    kept = []
+    for index in order:
+        point = points[index]
+        if len(front) and np.any(np.all(front <= point, axis=1)):
+            continue
+        kept.append(index)
+        front = np.vstack((front, point))
+    return np.array(kept, dtype=np.int64)
+
+def pareto_front(points: np.ndarray) -> np.ndarray:
+    """Indices of the non-dominated rows of ``points``, all objectives minimised.
+
+    Two and three objectives use O(n log n) sweeps; exact duplicates are
+    reported once.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim != 2 or points.shape[1] < 1:
+        raise ValueError("Points must be a 2-D array with at least one objective")
+    if len(points) == 0:
+        return np.array([], dtype=np.int64)
+    if points.shape[1] == 1:
+        return np.array([int(np.argmin(points[:, 0]))], dtype=np.int64)
+    if points.shape[1] == 2:
+        return _front_2d(points)
+    if points.shape[1] == 3:
+        return _front_3d(points)
+    return _front_nd(points)
+
+class ParetoFrontierService:
+    """Cost/impact trade-off curves over densely sampled parameter space"""
+
+    def compute(self, scenario_names: List[str], objectives: List[Mapping[str, str]], samples: int = 20000, seed: int = 42, max_points: int = 1000) -> Dict[str, Any]:
+        """Sample each scenario's slider ranges and return the joint non-dominated set.
+
+        ``objectives`` are ``{"outcome", "direction"}`` pairs; every scenario
+        must produce each objective outcome. Fronts larger than ``max_points``
+        are thinned to evenly spaced points along the first objective,
+        keeping both ends; ``frontier_size`` is the full size.
+        """
+        if not objectives:
+            raise ValueError("Provide at least one objective")
+        for objective in objectives:
+            if objective["direction"] not in ("minimize", "maximize"):
+                raise ValueError("Objective direction must be 'minimize' or 'maximize'")
+
+        rng = np.random.default_rng(seed)
+        names = [objective["outcome"] for objective in objectives]
+        signs = np.array([1.0 if objective["direction"] == "minimize" else -1.0 for objective in objectives])
+
+        candidates = []
+        for scenario_name in scenario_names:
+            if scenario_registry.get(scenario_name) is None:
+                raise ValueError(f"No simulation model for scenario: {scenario_name}")
+
+            bounds = simulation_engine.get_parameter_bounds(scenario_name)
+            params = {
+                name: rng.uniform(low, high, samples)
+                for name, (low, high) in bounds.items()
+            }
+            outcomes = simulation_engine.run_batch(scenario_name, params)
+            missing = [name for name in names if name not in outcomes]
+            if missing:
+                raise ValueError(f"{scenario_name} does not produce outcomes: {missing}")
+
+            values = np.column_stack([np.asarray(outcomes[name], dtype=np.float64) for name in names])
+            candidates.append((scenario_name, params, outcomes, values))
+
+        all_values = np.concatenate([values for _, _, _, values in candidates])
+        front = pareto_front(all_values * signs)
+        front = front[np.argsort(all_values[front, 0], kind="stable")]
+        frontier_size = len(front)
+        if frontier_size > max_points:
+            front = front[np.unique(np.linspace(0, frontier_size - 1, max_points).round().astype(np.int64))]
+
+        # Map global row indices back to (scenario, sample)
+        offsets = np.cumsum([0] + [len(values) for _, _, _, values in candidates])
+        frontier = []
+        for row in front:
+            block = int(np.searchsorted(offsets, row, side="right") - 1)
+            scenario_name, params, outcomes, _ = candidates[block]
+            local = row - offsets[block]
+            frontier.append({
+                "scenario_name": scenario_name,
+                "parameters": {name: float(column[local]) for name, column in params.items()},
+                "outcomes": {name: outcomes[name][local].item() for name in names},
+            })
+
+        return {
+            "objectives": list(objectives),
+            "evaluated": int(len(all_values)),
+            "frontier_size": frontier_size,
+            "truncated": frontier_size > len(frontier),
+            "frontier": frontier,
+        }
+
+# Initialize Pareto frontier service
+pareto_service = ParetoFrontierService()
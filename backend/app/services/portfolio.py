@@ -0,0 +1,192 @@
+from typing import Dict, Any, List, Mapping, Optional
+import logging
+import numpy as np
+
+from app.services.scenario_registry import scenario_registry
+from app.services.simulation_engine import simulation_engine
+
+logger = logging.getLogger(__name__)
+
+BUDGET_PARAMETER = "budget_allocation_percent"
+
+class PortfolioService:
+    """Several scenarios funded from one budget.
+
+    The shared ``total_budget_percent`` is split into each scenario's
+    ``budget_allocation_percent``. Joint outcomes add up count-like (integer)
+    outcomes such as beneficiaries, jobs and cost, and average rates, scores
+    and payback years weighted by each scenario's share of the allocation.
+    """
+
+    def __init__(self, candidates: int = 4096, rounds: int = 5, concentration: float = 50.0):
+        self.candidates = candidates
+        self.rounds = rounds
+        self.concentration = concentration
+
+    def _allocation_bounds(self, scenario_names: List[str], total_budget: float):
+        lower, upper = [], []
+        for scenario_name in scenario_names:
+            scenario = scenario_registry.get(scenario_name)
+            if scenario is None:
+                raise ValueError(f"No simulation model for scenario: {scenario_name}")
+            low, high = scenario.parameter_bounds.get(BUDGET_PARAMETER, (0.0, 100.0))
+            lower.append(low)
+            upper.append(high)
+
+        lower, upper = np.array(lower), np.array(upper)
+        if lower.sum() > total_budget:
+            raise ValueError(
+                f"Total budget {total_budget}% is below the combined minimum allocation of {lower.sum()}%"
+            )
+        return lower, upper
+
+    def evaluate(self, scenario_names: List[str], allocations: np.ndarray, parameters: Optional[Mapping[str, Mapping[str, float]]] = None) -> Dict[str, Any]:
+        """Evaluate allocation rows (candidates x scenarios) in one batch per scenario"""
+        allocations = np.atleast_2d(np.asarray(allocations, dtype=np.float64))
+        parameters = parameters or {}
+        shares = allocations / np.maximum(allocations.sum(axis=1, keepdims=True), 1e-12)
+
+        per_scenario = {}
+        counts: Dict[str, np.ndarray] = {}
+        rates: Dict[str, np.ndarray] = {}
+        rate_weights: Dict[str, np.ndarray] = {}
+        beneficiaries = np.zeros(len(allocations), dtype=np.int64)
+
+        for index, scenario_name in enumerate(scenario_names):
+            params = {
+                name: value for name, value in parameters.get(scenario_name, {}).items()
+                if name != BUDGET_PARAMETER
+            }
+            params[BUDGET_PARAMETER] = allocations[:, index]
+            outcomes = simulation_engine.run_batch(scenario_name, params)
+            outcomes = {key: value for key, value in outcomes.items() if not isinstance(value, str)}
+            per_scenario[scenario_name] = outcomes
+
+            beneficiary_outcome = scenario_registry.get(scenario_name).beneficiary_outcome
+            if beneficiary_outcome:
+                beneficiaries = beneficiaries + outcomes[beneficiary_outcome]
+
+            for key, values in outcomes.items():
+                if values.dtype.kind in "iu":
+                    counts[key] = counts.get(key, 0) + values
+                else:
+                    rates[key] = rates.get(key, 0) + values * shares[:, index]
+                    rate_weights[key] = rate_weights.get(key, 0) + shares[:, index]
+
+        joint = {"beneficiaries": beneficiaries}
+        joint.update(counts)
+        for key, total in rates.items():
+            joint[key] = total / np.maximum(rate_weights[key], 1e-12)
+        return {"per_scenario": per_scenario, "joint": joint}
+
+    def _sample(self, rng: np.random.Generator, lower: np.ndarray, upper: np.ndarray, total_budget: float, center: Optional[np.ndarray], concentration: float) -> np.ndarray:
+        """Draw allocations within [lower, upper] whose sum never exceeds the budget.
+
+        The spare budget above the minimums is split by a Dirichlet draw with
+        an extra "unallocated" component; later rounds concentrate the draw
+        around the incumbent's split, tighter as ``concentration`` grows.
+        """
+        spare = total_budget - lower.sum()
+        if center is None:
+            alpha = np.ones(len(lower) + 1)
+        else:
+            alpha = center * concentration + 0.05
+        splits = rng.dirichlet(alpha, self.candidates)
+        return np.minimum(lower + splits[:, :-1] * spare, upper)
+
+    def _split_of(self, allocation: np.ndarray, lower: np.ndarray, total_budget: float) -> np.ndarray:
+        spare = total_budget - lower.sum()
+        if spare <= 0:
+            return np.full(len(allocation) + 1, 1.0 / (len(allocation) + 1))
+        used = (allocation - lower) / spare
+        return np.append(used, max(1.0 - used.sum(), 0.0))
+
+    def _neighbours(self, allocation: np.ndarray, lower: np.ndarray, upper: np.ndarray, total_budget: float) -> np.ndarray:
+        """The allocation itself plus every move of unspent or another scenario's spare budget into one scenario.
+
+        Outcomes are step functions of the budget (facility counts are
+        truncated), so random draws rarely land exactly on a bound; these
+        moves do.
+        """
+        variants = [allocation]
+        unspent = total_budget - allocation.sum()
+        for target in range(len(allocation)):
+            for source in [None] + list(range(len(allocation))):
+                if source == target:
+                    continue
+                variant = allocation.copy()
+                moved = unspent
+                if source is not None:
+                    moved += variant[source] - lower[source]
+                    variant[source] = lower[source]
+                variant[target] = min(variant[target] + moved, upper[target])
+                variants.append(variant)
+        return np.array(variants)
+
+    def optimize(self, scenario_names: List[str], total_budget: float, objective: Mapping[str, str], parameters: Optional[Mapping[str, Mapping[str, float]]] = None, seed: int = 42) -> Dict[str, Any]:
+        """Search budget splits for the best joint ``objective`` outcome.
+
+        Each round scores a whole population of allocations at once; the
+        incumbent is carried over so rounds never regress.
+        """
+        if objective["direction"] not in ("minimize", "maximize"):
+            raise ValueError("Objective direction must be 'minimize' or 'maximize'")
+        lower, upper = self._allocation_bounds(scenario_names, total_budget)
+        rng = np.random.default_rng(seed)
+
+        best_allocation, best_value, trace = None, None, []
+        for round_index in range(self.rounds):
+            center = None if best_allocation is None else self._split_of(best_allocation, lower, total_budget)
+            concentration = self.concentration * 4 ** max(round_index - 1, 0)
+            allocations = self._sample(rng, lower, upper, total_budget, center, concentration)
+            if best_allocation is not None:
+                # Keep the incumbent and its budget-shifting neighbours
+                neighbours = self._neighbours(best_allocation, lower, upper, total_budget)
+                allocations[:len(neighbours)] = neighbours
+
+            joint = self.evaluate(scenario_names, allocations, parameters)["joint"]
+            if objective["outcome"] not in joint:
+                raise ValueError(f"Unknown joint outcome: {objective['outcome']}. Available: {sorted(joint)}")
+
+            values = joint[objective["outcome"]].astype(np.float64)
+            best = int(np.argmin(values) if objective["direction"] == "minimize" else np.argmax(values))
+            best_allocation, best_value = allocations[best].copy(), float(values[best])
+            trace.append({
+                "round": round_index + 1,
+                "candidates": int(len(allocations)),
+                "best_objective": best_value,
+            })
+
+        result = self.simulate(scenario_names, dict(zip(scenario_names, best_allocation.tolist())), total_budget, parameters)
+        result["objective"] = dict(objective)
+        result["trace"] = trace
+        return result
+
+    def simulate(self, scenario_names: List[str], allocations: Mapping[str, float], total_budget: float, parameters: Optional[Mapping[str, Mapping[str, float]]] = None) -> Dict[str, Any]:
+        """Evaluate one explicit allocation and report per-scenario and joint outcomes"""
+        lower, upper = self._allocation_bounds(scenario_names, total_budget)
+        missing = [name for name in scenario_names if name not in allocations]
+        if missing:
+            raise ValueError(f"Missing allocations for: {missing}")
+
+        allocation = np.array([float(allocations[name]) for name in scenario_names])
+        if np.any(allocation < lower) or np.any(allocation > upper):
+            raise ValueError("Allocations must stay within each scenario's budget slider range")
+        if allocation.sum() > total_budget + 1e-9:
+            raise ValueError(f"Allocations exceed the total budget of {total_budget}%")
+
+        evaluated = self.evaluate(scenario_names, allocation[np.newaxis, :], parameters)
+        return {
+            "scenario_names": list(scenario_names),
+            "total_budget_percent": total_budget,
+            "allocations": dict(zip(scenario_names, allocation.tolist())),
+            "unallocated_percent": float(total_budget - allocation.sum()),
+            "per_scenario": {
+                scenario_name: {key: values[0].item() for key, values in outcomes.items()}
+                for scenario_name, outcomes in evaluated["per_scenario"].items()
+            },
+            "joint_outcomes": {key: values[0].item() for key, values in evaluated["joint"].items()},
+        }
+
+# Initialize portfolio service
+portfolio_service = PortfolioService()
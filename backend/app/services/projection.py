@@ -0,0 +1,84 @@
+from typing import Dict, Any
+import numpy as np
+
+DEFAULT_PROJECTION_SETTINGS: Dict[str, Any] = {
+    "horizon_years": 10,
+    "discount_rate": 0.07,
+    "cost_growth_rate": 0.05,
+    "beneficiary_growth_rate": 0.02,
+    "rollout_years": 3,
+    "maintenance_rate": 0.02,
+}
+
+def project_outcomes(
+    implementation_cost,
+    beneficiaries,
+    roi_years,
+    horizon_years: int = 10,
+    discount_rate: float = 0.07,
+    cost_growth_rate: float = 0.05,
+    beneficiary_growth_rate: float = 0.02,
+    rollout_years: int = 3,
+    maintenance_rate: float = 0.02,
+) -> Dict[str, np.ndarray]:
+    """Project snapshot outcomes year by year over a horizon.
+
+    The implementation cost is spent evenly over the rollout years and then
+    costs ``maintenance_rate`` of it per year; spending compounds at
+    ``cost_growth_rate``. Beneficiaries and returns ramp up with rollout and
+    compound at ``beneficiary_growth_rate``. The full-deployment annual
+    return is ``implementation_cost / roi_years``; rollout, growth and
+    maintenance costs mean the projected payback generally differs from
+    ``roi_years``. All cumulative figures, and the payback year taken from
+    them, are discounted at ``discount_rate``.
+
+    Inputs may be scalars or arrays of any shape; yearly series come back with
+    shape ``(horizon_years,) + input shape`` and summaries with the input
+    shape.
+    """
+    if horizon_years < 1:
+        raise ValueError("Projection horizon must be at least one year")
+    if rollout_years < 1:
+        raise ValueError("Rollout must take at least one year")
+
+    implementation_cost = np.asarray(implementation_cost, dtype=np.float64)
+    beneficiaries = np.asarray(beneficiaries, dtype=np.float64)
+    roi_years = np.asarray(roi_years, dtype=np.float64)
+    implementation_cost, beneficiaries, roi_years = np.broadcast_arrays(implementation_cost, beneficiaries, roi_years)
+
+    # Year index along a leading axis so every series is years x variants
+    years = np.arange(1, horizon_years + 1, dtype=np.float64).reshape((-1,) + (1,) * implementation_cost.ndim)
+    deployed = np.minimum(years / rollout_years, 1.0)
+    cost_growth = (1 + cost_growth_rate) ** (years - 1)
+    beneficiary_growth = (1 + beneficiary_growth_rate) ** (years - 1)
+    discount = (1 + discount_rate) ** -years
+
+    annual_cost = np.where(
+        years <= rollout_years,
+        implementation_cost / rollout_years,
+        implementation_cost * maintenance_rate
+    ) * cost_growth
+
+    base_return = np.divide(implementation_cost, roi_years, out=np.zeros_like(implementation_cost), where=roi_years > 0)
+    annual_return = base_return * deployed * beneficiary_growth
+    projected_beneficiaries = beneficiaries * deployed * beneficiary_growth
+
+    cumulative_cost = np.cumsum(annual_cost * discount, axis=0)
+    cumulative_return = np.cumsum(annual_return * discount, axis=0)
+    cumulative_net_return = cumulative_return - cumulative_cost
+
+    # First year in which discounted returns cover discounted costs, NaN if never
+    paid_back = cumulative_net_return >= 0
+    payback_year = np.where(paid_back.any(axis=0), paid_back.argmax(axis=0) + 1.0, np.nan)
+
+    return {
+        "years": years.ravel().astype(np.int64),
+        "annual_cost": annual_cost,
+        "beneficiaries": projected_beneficiaries,
+        "annual_return": annual_return,
+        "cumulative_cost": cumulative_cost,
+        "cumulative_return": cumulative_return,
+        "cumulative_net_return": cumulative_net_return,
+        "net_present_value": cumulative_net_return[-1],
+        "discounted_payback_year": payback_year,
+    }
@@ -0,0 +1,93 @@
+from typing import Dict, Any, List
+import numpy as np
+
+# Approximate per-state/UT baselines: population and literacy from Census 2011
+# (mapped onto current boundaries), public hospitals from the National Health
+# Profile, farmers as Census 2011 cultivators. Precise enough to apportion the
+# simplified national models, not for reporting.
+BASELINE_COLUMNS = ("population", "literacy_rate", "hospitals", "farmers")
+
+REGION_TABLE = """
+AP Andhra Pradesh                             49386799 67.0  258  4023000
+AR Arunachal Pradesh                           1383727 65.4  218   347000
+AS Assam                                      31205576 72.2 1226  3331000
+BR Bihar                                     104099452 61.8 1147  7196000
+CT Chhattisgarh                               25545198 70.3  786  4004000
+GA Goa                                         1458545 88.7   35    31000
+GJ Gujarat                                    60439692 78.0  488  5447000
+HR Haryana                                    25351462 75.6  668  2481000
+HP Himachal Pradesh                            6864602 82.8  801  2062000
+JH Jharkhand                                  32988134 66.4  555  3815000
+KA Karnataka                                  61095297 75.4 2842  6581000
+KL Kerala                                     33406061 94.0 1280   671000
+MP Madhya Pradesh                             72626809 69.3  465  9844000
+MH Maharashtra                               112374333 82.3  711 12569000
+MN Manipur                                     2855794 76.9   30   574000
+ML Meghalaya                                   2966889 74.4  157   505000
+MZ Mizoram                                     1097206 91.3   90   229000
+NL Nagaland                                    1978502 79.6   36   538000
+OR Odisha                                     41974218 72.9 1806  4104000
+PB Punjab                                     27743338 75.8  682  1935000
+RJ Rajasthan                                  68548437 66.1 2850 13619000
+SK Sikkim                                       610577 81.4   33   132000
+TN Tamil Nadu                                 72147030 80.1 1217  4249000
+TG Telangana                                  35003674 66.5  863  2468000
+TR Tripura                                     3673917 87.2  156   310000
+UP Uttar Pradesh                             199812341 67.7 4635 19058000
+UT Uttarakhand                                10086292 78.8  410  1580000
+WB West Bengal                                91276115 76.3 1566  5117000
+AN Andaman and Nicobar Islands                  380581 86.6   30    18000
+CH Chandigarh                                  1055450 86.0   18     1000
+DH Dadra and Nagar Haveli and Daman and Diu     830203 80.8   14    36000
+DL Delhi                                      16787941 86.2  109    33000
+JK Jammu and Kashmir                          12267032 67.2 1000  1204000
+LA Ladakh                                       274289 77.2   40    40000
+LD Lakshadweep                                   64473 91.8    9      200
+PY Puducherry                                  1247953 85.8   14    11000
+"""
+
+class RegionalBaselines:
+    """States and union territories with their baselines as one float64 matrix.
+
+    Columns are addressed by name through ``columns()``, which also derives
+    ``<column>_share`` (each region's fraction of the national total) for the
+    count columns.
+    """
+
+    def __init__(self, table: str = REGION_TABLE):
+        codes, names, rows = [], [], []
+        for line in table.strip().splitlines():
+            fields = line.split()
+            codes.append(fields[0])
+            names.append(" ".join(fields[1:-len(BASELINE_COLUMNS)]))
+            rows.append([float(value) for value in fields[-len(BASELINE_COLUMNS):]])
+
+        self.codes = tuple(codes)
+        self.names = tuple(names)
+        self.values = np.array(rows, dtype=np.float64)
+        self.values.setflags(write=False)
+        self._columns = self._derive_columns()
+
+    def _derive_columns(self) -> Dict[str, np.ndarray]:
+        columns = {name: self.values[:, index] for index, name in enumerate(BASELINE_COLUMNS)}
+        for name in ("population", "hospitals", "farmers"):
+            columns[f"{name}_share"] = columns[name] / columns[name].sum()
+        columns["national_literacy_rate"] = np.float64(
+            np.average(columns["literacy_rate"], weights=columns["population"])
+        )
+        return columns
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        return self._columns
+
+    def regions(self) -> List[Dict[str, Any]]:
+        return [
+            {"code": code, "name": name, **dict(zip(BASELINE_COLUMNS, row.tolist()))}
+            for code, name, row in zip(self.codes, self.names, self.values)
+        ]
+
+# Load regional baselines once at startup
+regional_baselines = RegionalBaselines()
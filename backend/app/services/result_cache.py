@@ -0,0 +1,192 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Mapping, Optional
+
+from sqlalchemy import column, inspect, select, table, text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.services.scenario_registry import scenario_registry
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Bump when the engine changes in a way scenario fingerprints do not capture
+CACHE_FORMAT_VERSION = 1
+
+# Saved simulations record the key of the cached result they came from
+RUN_KEY_COLUMN = "result_cache_key"
+_simulations = table("policy_simulations", column("id"), column(RUN_KEY_COLUMN))
+
+class SimulationResultCache:
+    """Content-addressed cache of simulation results.
+
+    Entries are keyed by scenario name, the scenario definition's fingerprint,
+    the canonicalized parameters and the run options, so editing a scenario
+    definition makes its old entries unreachable. Lookups check an
+    in-process LRU first and then a SQLite file shared by all workers.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None):
+        self.path = path or settings.SIMULATION_CACHE_PATH
+        self.max_entries = settings.SIMULATION_CACHE_SIZE if max_entries is None else max_entries
+        self.enabled = settings.SIMULATION_CACHE_ENABLED
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self.run_keys = False
+
+        try:
+            self._connection().execute("""
+                CREATE TABLE IF NOT EXISTS simulation_cache (
+                    key TEXT PRIMARY KEY,
+                    scenario_name TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+        except sqlite3.Error as e:
+            logger.error(f"Simulation cache database unavailable, using memory only: {e}")
+            self.path = None
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def make_key(scenario_name: str, parameters: Mapping[str, Any], options: Optional[Mapping[str, Any]] = None) -> Optional[str]:
+        """Hash a request into a cache key, or None if the scenario is unknown"""
+        scenario = scenario_registry.get(scenario_name)
+        if scenario is None:
+            return None
+
+        canonical = json.dumps({
+            "version": CACHE_FORMAT_VERSION,
+            "scenario": scenario_name,
+            "fingerprint": scenario.fingerprint,
+            "parameters": {name: float(value) for name, value in parameters.items() if value is not None},
+            "options": options or {},
+        }, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def _remember(self, key: str, payload: str) -> None:
+        with self._lock:
+            self._memory[key] = payload
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        if key is None or not self.enabled:
+            return None
+
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+
+        if payload is None and self.path:
+            try:
+                row = self._connection().execute(
+                    "SELECT payload FROM simulation_cache WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Simulation cache read failed: {e}")
+                row = None
+            if row:
+                payload = row[0]
+                self._remember(key, payload)
+
+        if payload is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(payload)
+
+    def set(self, key: Optional[str], scenario_name: str, result: Mapping[str, Any]) -> None:
+        if key is None or not self.enabled:
+            return
+
+        scenario = scenario_registry.get(scenario_name)
+        if scenario is None:
+            return
+
+        payload = json.dumps(result)
+        self._remember(key, payload)
+        if self.path:
+            try:
+                self._connection().execute(
+                    "INSERT OR REPLACE INTO simulation_cache (key, scenario_name, fingerprint, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, scenario_name, scenario.fingerprint, payload, time.time())
+                )
+            except sqlite3.Error as e:
+                logger.warning(f"Simulation cache write failed: {e}")
+
+    def prune_stale(self) -> int:
+        """Delete persisted entries whose scenario definition has since changed"""
+        with self._lock:
+            self._memory.clear()
+        if not self.path:
+            return 0
+
+        current = scenario_registry.fingerprints()
+        removed = 0
+        try:
+            connection = self._connection()
+            for scenario_name, fingerprint in connection.execute(
+                "SELECT DISTINCT scenario_name, fingerprint FROM simulation_cache"
+            ).fetchall():
+                if current.get(scenario_name) != fingerprint:
+                    removed += connection.execute(
+                        "DELETE FROM simulation_cache WHERE scenario_name = ? AND fingerprint = ?",
+                        (scenario_name, fingerprint)
+                    ).rowcount
+        except sqlite3.Error as e:
+            logger.warning(f"Simulation cache prune failed: {e}")
+        if removed:
+            logger.info(f"Pruned {removed} stale simulation cache entries")
+        return removed
+
+    def ensure_run_key_column(self, engine: Engine) -> None:
+        """Add policy_simulations.result_cache_key (idempotent startup DDL)"""
+        inspector = inspect(engine)
+        if not inspector.has_table("policy_simulations"):
+            return
+        if RUN_KEY_COLUMN not in {item["name"] for item in inspector.get_columns("policy_simulations")}:
+            with engine.begin() as connection:
+                connection.execute(text(f"ALTER TABLE policy_simulations ADD COLUMN {RUN_KEY_COLUMN} VARCHAR(64)"))
+        self.run_keys = True
+
+    def link_run(self, db: Session, simulation_id: int, key: Optional[str]) -> None:
+        """Record which cache entry a saved simulation was computed from (caller commits)"""
+        if key and self.run_keys:
+            db.execute(update(_simulations).where(_simulations.c.id == simulation_id).values({RUN_KEY_COLUMN: key}))
+
+    def run_key(self, db: Session, simulation_id: int) -> Optional[str]:
+        if not self.run_keys:
+            return None
+        return db.execute(select(_simulations.c[RUN_KEY_COLUMN]).where(_simulations.c.id == simulation_id)).scalar()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "memory_entries": len(self._memory),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+# Initialize simulation result cache; drop stale entries whenever scenarios reload
+simulation_cache = SimulationResultCache()
+scenario_registry.add_reload_listener(simulation_cache.prune_stale)
@@ -0,0 +1,425 @@
+import ast
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from functools import reduce
+from typing import Dict, Any, Callable, List, Mapping, Optional, Tuple
+import numpy as np
+
+from app.config import get_settings
+from app.services.input_output import input_output_model
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Outcomes every scenario with a ``spillover`` section gains
+SPILLOVER_OUTCOMES = ("indirect_output", "indirect_jobs")
+
+PARAMETER_NAMES = (
+    "subsidy_increase_percent",
+    "budget_allocation_percent",
+    "beneficiary_expansion_percent",
+)
+
+DEFAULT_DEFINITIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "scenarios")
+
+def _split(values: np.ndarray):
+    """Dekker split of a float64 into two non-overlapping halves"""
+    scaled = 134217729.0 * values
+    high = scaled - (scaled - values)
+    return high, values - high
+
+def round_half_even(values, ndigits: int) -> np.ndarray:
+    """Vectorized equivalent of the built-in round(value, ndigits).
+
+    np.round scales by 10**ndigits before rounding, which misplaces ties such
+    as 2.675 -> 2.68. Here the exact scaled value is recovered with an
+    error-free product so batch results match the scalar path bit for bit.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scale = 10.0 ** ndigits
+    magnitude = np.abs(values)
+    product = magnitude * scale
+    value_high, value_low = _split(magnitude)
+    scale_high, scale_low = _split(np.float64(scale))
+    error = ((value_high * scale_high - product) + value_high * scale_low + value_low * scale_high) + value_low * scale_low
+    floor = np.floor(product)
+    floor = np.where((product == floor) & (error < 0), floor - 1, floor)
+    excess = ((product - floor) - 0.5) + error
+    round_up = (excess > 0) | ((excess == 0) & (np.fmod(floor, 2) == 1))
+    rounded = np.where(product >= 2.0 ** 52, magnitude, (floor + round_up) / scale)
+    return np.copysign(rounded, values)
+
+# Functions available to formulas, mapped to their vectorized implementations
+FORMULA_FUNCTIONS = {
+    "min": lambda *values: reduce(np.minimum, values),
+    "max": lambda *values: reduce(np.maximum, values),
+    "int": lambda value: np.asarray(value).astype(np.int64),
+    "round": round_half_even,
+    "abs": np.abs,
+    "clip": np.clip,
+}
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.USub, ast.UAdd,
+)
+
+class FormulaNode:
+    """One named quantity of a scenario, computed from its dependencies"""
+
+    def __init__(self, name: str, expression: str, dependencies: Tuple[str, ...], function):
+        self.name = name
+        self.expression = expression
+        self.dependencies = dependencies
+        self.function = function
+
+    def evaluate(self, values: Mapping[str, Any]) -> Any:
+        return self.function(*(values[name] for name in self.dependencies))
+
+def compile_formula(name: str, expression: str) -> FormulaNode:
+    """Parse a formula, check it only uses arithmetic and FORMULA_FUNCTIONS, and compile it"""
+    try:
+        tree = ast.parse(expression, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Formula for {name} is not valid: {e.msg}")
+
+    dependencies = []
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"Formula for {name} uses unsupported syntax: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            raise ValueError(f"Formula for {name} may only contain numeric literals")
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in FORMULA_FUNCTIONS or node.keywords:
+                raise ValueError(f"Formula for {name} calls an unsupported function")
+        elif isinstance(node, ast.Name) and node.id not in FORMULA_FUNCTIONS and node.id not in dependencies:
+            dependencies.append(node.id)
+
+    source = f"lambda {', '.join(dependencies)}: {expression}"
+    function = eval(compile(source, f"<formula {name}>", "eval"), {"__builtins__": {}, **FORMULA_FUNCTIONS})
+    return FormulaNode(name, expression, tuple(dependencies), function)
+
+class CompiledScenario:
+    """A scenario definition compiled into vectorized formula nodes"""
+
+    def __init__(self, definition: Mapping[str, Any]):
+        for key in ("name", "display_name", "parameters", "outcomes"):
+            if key not in definition:
+                raise ValueError(f"Scenario definition is missing '{key}'")
+
+        self.definition = dict(definition)
+        self.name = definition["name"]
+        self.display_name = definition["display_name"]
+        self.description = definition.get("description", "")
+        self.parameters = list(definition["parameters"])
+        self.constants = dict(definition.get("constants", {}))
+        self.outcome_names = list(definition["outcomes"])
+        self.headline_outcomes = list(definition.get("headline_outcomes", self.outcome_names))
+        self.beneficiary_outcome = definition.get("beneficiary_outcome")
+        self.assumptions = list(definition.get("assumptions", []))
+        self.fingerprint = hashlib.sha256(json.dumps(self.definition, sort_keys=True).encode()).hexdigest()
+
+        for parameter in self.parameters:
+            if parameter.get("name") not in PARAMETER_NAMES:
+                raise ValueError(f"{self.name}: unknown parameter {parameter.get('name')}")
+        if self.beneficiary_outcome and self.beneficiary_outcome not in self.outcome_names:
+            raise ValueError(f"{self.name}: beneficiary_outcome must be one of its outcomes")
+
+        # Per-region replacements for constants, computed from regional baseline columns
+        self.regional_constants = {
+            name: compile_formula(name, expression)
+            for name, expression in definition.get("regional", {}).items()
+        }
+        unknown = set(self.regional_constants) - set(self.constants)
+        if unknown:
+            raise ValueError(f"{self.name}: regional entries must name constants, got {sorted(unknown)}")
+
+        formulas = dict(definition.get("intermediates", {}))
+        formulas.update(definition["outcomes"])
+        nodes = [compile_formula(name, expression) for name, expression in formulas.items()]
+
+        # Spending propagated through the input-output model into supplier output and jobs
+        self.spillover = definition.get("spillover")
+        self.sector_shares = None
+        if self.spillover:
+            spending = self.spillover.get("spending")
+            if spending not in formulas:
+                raise ValueError(f"{self.name}: spillover spending must name a formula, got {spending}")
+            self.sector_shares = input_output_model.demand_vector(self.spillover.get("sector_shares", {}))
+            self.sector_shares.setflags(write=False)
+            nodes.extend(self._spillover_nodes(spending))
+            self.outcome_names.extend(SPILLOVER_OUTCOMES)
+            self.fingerprint = hashlib.sha256((self.fingerprint + input_output_model.fingerprint).encode()).hexdigest()
+        self.nodes = self._order_nodes(nodes)
+
+        # Constant fitted to ingested budget data by the calibration job
+        self.calibration = definition.get("calibration")
+        if self.calibration and self.calibration.get("constant") not in self.constants:
+            raise ValueError(f"{self.name}: calibration must name a constant, got {self.calibration.get('constant')}")
+        self.calibration_version = definition.get("calibration_version")
+
+    def _spillover_nodes(self, spending: str) -> List[FormulaNode]:
+        shares = self.sector_shares
+        return [
+            FormulaNode(
+                "sector_output", f"leontief({spending})", (spending,),
+                lambda value: input_output_model.sector_output(shares, value)
+            ),
+            FormulaNode(
+                "indirect_output", f"int(sum(sector_output) - {spending})", ("sector_output", spending),
+                lambda output, value: np.asarray(output.sum(axis=0) - value).astype(np.int64)
+            ),
+            FormulaNode(
+                "indirect_jobs", "int(jobs_per_rupee . (sector_output - direct))", ("sector_output", spending),
+                lambda output, value: np.asarray(input_output_model.indirect_jobs(output, shares, value)).astype(np.int64)
+            ),
+        ]
+
+    def _order_nodes(self, nodes: List[FormulaNode]) -> List[FormulaNode]:
+        """Topologically sort formula nodes so every dependency is computed first"""
+        inputs = set(PARAMETER_NAMES) | set(self.constants)
+        by_name = {}
+        for node in nodes:
+            if node.name in inputs or node.name in by_name:
+                raise ValueError(f"{self.name}: {node.name} is defined more than once")
+            by_name[node.name] = node
+
+        ordered, state = [], {}
+
+        def visit(node: FormulaNode, path: Tuple[str, ...]):
+            if state.get(node.name) == "done":
+                return
+            if state.get(node.name) == "visiting":
+                raise ValueError(f"{self.name}: circular formula {' -> '.join(path + (node.name,))}")
+            state[node.name] = "visiting"
+            for dependency in node.dependencies:
+                if dependency in by_name:
+                    visit(by_name[dependency], path + (node.name,))
+                elif dependency not in inputs:
+                    raise ValueError(f"{self.name}: {node.name} refers to unknown name {dependency}")
+            state[node.name] = "done"
+            ordered.append(node)
+
+        for node in nodes:
+            visit(node, ())
+        return ordered
+
+    @property
+    def parameter_bounds(self) -> Dict[str, Tuple[float, float]]:
+        return {
+            parameter["name"]: (float(parameter["min"]), float(parameter["max"]))
+            for parameter in self.parameters
+        }
+
+    def evaluate(self, params: Mapping[str, Any], constants: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+        """Evaluate every formula over (broadcastable) parameter and constant arrays"""
+        values = dict(self.constants)
+        if constants:
+            values.update(constants)
+        values.update(params)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for node in self.nodes:
+                values[node.name] = node.evaluate(values)
+        return {name: values[name] for name in self.outcome_names}
+
+    def regionalize(self, columns: Mapping[str, Any]) -> Dict[str, Any]:
+        """Evaluate the regional constant formulas over baseline columns (one value per region)"""
+        values = dict(self.constants)
+        values.update(columns)
+        missing = {
+            dependency for node in self.regional_constants.values()
+            for dependency in node.dependencies if dependency not in values
+        }
+        if missing:
+            raise ValueError(f"{self.name}: regional formulas refer to unknown baselines {sorted(missing)}")
+        return {name: node.evaluate(values) for name, node in self.regional_constants.items()}
+
+    def catalog_entry(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "display_name": self.display_name,
+            "description": self.description,
+            "parameters": self.parameters,
+            "outcomes": self.headline_outcomes,
+        }
+
+def _same_value(old: Any, new: Any) -> bool:
+    if old is new:
+        return True
+    if old is None:
+        return False
+    return np.shape(old) == np.shape(new) and bool(np.all(old == new))
+
+class IncrementalEvaluator:
+    """Evaluates one scenario repeatedly, recomputing only what changed.
+
+    Every input and formula value from the previous call is kept. On update,
+    nodes are visited in dependency order and re-evaluated only if one of
+    their inputs changed; a node whose new value equals its old one stops
+    the change from propagating further (e.g. a capped rate already at its
+    cap).
+    """
+
+    def __init__(self, scenario: CompiledScenario):
+        self.scenario = scenario
+        self.values: Dict[str, Any] = {}
+        self.recomputed = 0
+
+    def update(self, params: Mapping[str, Any], constants: Optional[Mapping[str, Any]] = None) -> Tuple[Dict[str, Any], set]:
+        """Return all outcomes plus the names of outcomes whose value changed"""
+        inputs = dict(self.scenario.constants)
+        if constants:
+            inputs.update(constants)
+        inputs.update(params)
+
+        first = not self.values
+        changed = {name for name, value in inputs.items() if first or not _same_value(self.values.get(name), value)}
+        self.values.update((name, inputs[name]) for name in changed)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for node in self.scenario.nodes:
+                if not first and changed.isdisjoint(node.dependencies):
+                    continue
+                value = node.evaluate(self.values)
+                self.recomputed += 1
+                if first or not _same_value(self.values[node.name], value):
+                    self.values[node.name] = value
+                    changed.add(node.name)
+
+        outcomes = {name: self.values[name] for name in self.scenario.outcome_names}
+        return outcomes, changed.intersection(self.scenario.outcome_names)
+
+class ScenarioRegistry:
+    """Scenario definitions loaded from JSON files and compiled once.
+
+    The directory is re-scanned at most every ``reload_interval`` seconds;
+    when files change they are recompiled and swapped in atomically. If any
+    definition fails to compile, the previously loaded set stays active.
+    """
+
+    def __init__(self, directory: Optional[str] = None, reload_interval: Optional[float] = None, calibration_path: Optional[str] = None):
+        self.directory = directory or settings.SCENARIO_DEFINITIONS_DIR or DEFAULT_DEFINITIONS_DIR
+        self.calibration_path = calibration_path or settings.CALIBRATION_PATH
+        self.reload_interval = settings.SCENARIO_RELOAD_INTERVAL if reload_interval is None else reload_interval
+        self._scenarios: Dict[str, CompiledScenario] = {}
+        self._signature = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[], Any]] = []
+
+        scenarios, errors = self._load_directory()
+        for filename, error in errors.items():
+            logger.error(f"Skipping scenario definition {filename}: {error}")
+        self._scenarios = scenarios
+        self._signature = self._directory_signature()
+        self._last_check = time.monotonic()
+        logger.info(f"Loaded {len(scenarios)} simulation scenarios from {self.directory}")
+
+    def _directory_signature(self) -> Tuple:
+        """Definition files plus the active calibration, each as (name, mtime, size)"""
+        try:
+            entries = sorted(entry for entry in os.listdir(self.directory) if entry.endswith(".json"))
+        except FileNotFoundError:
+            return ()
+        signature = []
+        for entry in entries:
+            stat = os.stat(os.path.join(self.directory, entry))
+            signature.append((entry, stat.st_mtime_ns, stat.st_size))
+        try:
+            stat = os.stat(self.calibration_path)
+            signature.append((None, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            pass
+        return tuple(signature)
+
+    def _read_calibration(self) -> Dict[str, Any]:
+        """The active calibration artifact, or an empty one if none has been activated"""
+        try:
+            with open(self.calibration_path, encoding="utf-8") as handle:
+                return json.load(handle)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.error(f"Ignoring unreadable calibration {self.calibration_path}: {e}")
+            return {}
+
+    def _load_directory(self) -> Tuple[Dict[str, CompiledScenario], Dict[str, str]]:
+        scenarios, errors = {}, {}
+        calibration = self._read_calibration()
+        coefficients = calibration.get("coefficients", {})
+        for filename, _, _ in self._directory_signature():
+            if filename is None:
+                continue
+            try:
+                with open(os.path.join(self.directory, filename), encoding="utf-8") as handle:
+                    definition = json.load(handle)
+                fitted = coefficients.get(definition.get("name"))
+                if fitted:
+                    constants = definition.get("constants", {})
+                    definition["constants"] = {**constants, **{name: value for name, value in fitted.items() if name in constants}}
+                    definition["calibration_version"] = calibration.get("version")
+                scenario = CompiledScenario(definition)
+                if scenario.name in scenarios:
+                    raise ValueError(f"duplicate scenario name {scenario.name}")
+                scenarios[scenario.name] = scenario
+            except (OSError, ValueError) as e:
+                errors[filename] = str(e)
+        return scenarios, errors
+
+    def reload(self) -> Dict[str, str]:
+        """Recompile every definition now; returns scenario fingerprints"""
+        with self._lock:
+            signature = self._directory_signature()
+            scenarios, errors = self._load_directory()
+            self._signature = signature
+            self._last_check = time.monotonic()
+            if errors:
+                raise ValueError(f"Invalid scenario definitions: {errors}")
+            self._scenarios = scenarios
+            logger.info(f"Reloaded simulation scenarios: {sorted(scenarios)}")
+
+        for listener in self._listeners:
+            try:
+                listener()
+            except Exception as e:
+                logger.error(f"Scenario reload listener failed: {e}")
+        return self.fingerprints()
+
+    def add_reload_listener(self, listener: Callable[[], Any]) -> None:
+        """Call ``listener`` after every successful reload"""
+        self._listeners.append(listener)
+
+    def fingerprints(self) -> Dict[str, str]:
+        return {name: scenario.fingerprint for name, scenario in self._scenarios.items()}
+
+    def reload_if_changed(self) -> None:
+        now = time.monotonic()
+        if now - self._last_check < self.reload_interval:
+            return
+        self._last_check = now
+        if self._directory_signature() == self._signature:
+            return
+        try:
+            self.reload()
+        except ValueError as e:
+            logger.error(f"Keeping previous scenarios: {e}")
+
+    def get(self, name: str) -> Optional[CompiledScenario]:
+        self.reload_if_changed()
+        return self._scenarios.get(name)
+
+    def names(self) -> List[str]:
+        self.reload_if_changed()
+        return list(self._scenarios)
+
+    def catalog(self) -> List[Dict[str, Any]]:
+        self.reload_if_changed()
+        return [scenario.catalog_entry() for scenario in self._scenarios.values()]
+
+# Load and compile scenario definitions at startup
+scenario_registry = ScenarioRegistry()
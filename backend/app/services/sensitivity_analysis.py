@@ -0,0 +1,140 @@
+from typing import Dict, Any, List, Tuple
+import logging
+import numpy as np
+
+from app.services.scenario_registry import scenario_registry
+from app.services.simulation_engine import simulation_engine
+
+logger = logging.getLogger(__name__)
+
+class SensitivityAnalysisService:
+    """Global sensitivity analysis of scenario outcomes to their slider parameters.
+
+    All sample points of an analysis are evaluated with a single
+    ``run_batch`` call over the scenario's slider ranges.
+    """
+
+    def _parameter_space(self, scenario_name: str) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        if scenario_registry.get(scenario_name) is None:
+            raise ValueError(f"No simulation model for scenario: {scenario_name}")
+
+        bounds = simulation_engine.get_parameter_bounds(scenario_name)
+        names = list(bounds)
+        lower = np.array([bounds[name][0] for name in names])
+        upper = np.array([bounds[name][1] for name in names])
+        return names, lower, upper
+
+    def _evaluate(self, scenario_name: str, names: List[str], lower: np.ndarray, upper: np.ndarray, unit_points: np.ndarray) -> Dict[str, np.ndarray]:
+        """Evaluate points given in unit-hypercube coordinates (last axis = parameter)"""
+        values = lower + unit_points * (upper - lower)
+        params = {name: values[..., index] for index, name in enumerate(names)}
+        outcomes = simulation_engine.run_batch(scenario_name, params)
+        return {
+            key: np.asarray(value, dtype=np.float64)
+            for key, value in outcomes.items() if not isinstance(value, str)
+        }
+
+    def morris(self, scenario_name: str, trajectories: int = 50, levels: int = 4, seed: int = 42) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Morris elementary effects (mu, mu_star, sigma) per outcome and parameter.
+
+        Effects are expressed per full slider range, so they are comparable
+        across parameters.
+        """
+        names, lower, upper = self._parameter_space(scenario_name)
+        rng = np.random.default_rng(seed)
+        k = len(names)
+        delta = levels / (2 * (levels - 1))
+
+        # One-at-a-time trajectories: a random grid start, then +delta along a random order
+        grid = np.arange(levels) / (levels - 1)
+        starts = rng.choice(grid[grid <= 1 - delta + 1e-12], size=(trajectories, k))
+        order = np.argsort(rng.random((trajectories, k)), axis=1)
+        steps = np.zeros((trajectories, k, k))
+        steps[np.arange(trajectories)[:, None], np.arange(k)[None, :], order] = delta
+        points = starts[:, None, :] + np.concatenate((np.zeros((trajectories, 1, k)), np.cumsum(steps, axis=1)), axis=1)
+
+        outcomes = self._evaluate(scenario_name, names, lower, upper, points)
+
+        results = {}
+        for key, values in outcomes.items():
+            effects = np.empty((trajectories, k))
+            effects[np.arange(trajectories)[:, None], order] = np.diff(values, axis=1) / delta
+            sigma = effects.std(axis=0, ddof=1) if trajectories > 1 else np.zeros(k)
+            results[key] = {
+                name: {
+                    "mu": float(effects[:, index].mean()),
+                    "mu_star": float(np.abs(effects[:, index]).mean()),
+                    "sigma": float(sigma[index]),
+                }
+                for index, name in enumerate(names)
+            }
+        return results
+
+    def sobol(self, scenario_name: str, samples: int = 2048, seed: int = 42) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """First-order and total Sobol indices per outcome and parameter.
+
+        Uses the Saltelli A/B/AB_i design with the Saltelli (2010) first-order
+        and Jansen total-effect estimators: ``samples * (k + 2)`` evaluations.
+        """
+        names, lower, upper = self._parameter_space(scenario_name)
+        rng = np.random.default_rng(seed)
+        k = len(names)
+
+        a = rng.random((samples, k))
+        b = rng.random((samples, k))
+        ab = np.repeat(a[None, :, :], k, axis=0)
+        ab[np.arange(k), :, np.arange(k)] = b.T
+        points = np.concatenate((a[None], b[None], ab), axis=0)
+
+        outcomes = self._evaluate(scenario_name, names, lower, upper, points)
+
+        results = {}
+        for key, values in outcomes.items():
+            f_a, f_b, f_ab = values[0], values[1], values[2:]
+            variance = np.concatenate((f_a, f_b)).var()
+            if variance > 0:
+                first_order = (f_b * (f_ab - f_a)).mean(axis=1) / variance
+                total_order = 0.5 * np.square(f_a - f_ab).mean(axis=1) / variance
+            else:
+                first_order = total_order = np.zeros(k)
+            results[key] = {
+                name: {
+                    "first_order": float(first_order[index]),
+                    "total_order": float(total_order[index]),
+                }
+                for index, name in enumerate(names)
+            }
+        return results
+
+    def analyze(self, scenario_name: str, method: str = "both", trajectories: int = 50, levels: int = 4, samples: int = 2048, seed: int = 42) -> Dict[str, Any]:
+        """Run the requested analyses and rank parameters by influence for each outcome"""
+        if method not in ("morris", "sobol", "both"):
+            raise ValueError("Method must be one of: ['morris', 'sobol', 'both']")
+
+        names, lower, upper = self._parameter_space(scenario_name)
+        result: Dict[str, Any] = {
+            "scenario_name": scenario_name,
+            "parameters": {
+                name: {"min": float(lower[index]), "max": float(upper[index])}
+                for index, name in enumerate(names)
+            },
+        }
+
+        if method in ("morris", "both"):
+            result["morris"] = self.morris(scenario_name, trajectories, levels, seed)
+        if method in ("sobol", "both"):
+            result["sobol"] = self.sobol(scenario_name, samples, seed)
+
+        # Prefer total Sobol indices for the ranking, Morris mu* otherwise
+        if "sobol" in result:
+            scores = {key: {name: v["total_order"] for name, v in indices.items()} for key, indices in result["sobol"].items()}
+        else:
+            scores = {key: {name: v["mu_star"] for name, v in effects.items()} for key, effects in result["morris"].items()}
+        result["ranking"] = {
+            key: sorted(values, key=values.get, reverse=True)
+            for key, values in scores.items()
+        }
+        return result
+
+# Initialize sensitivity analysis service
+sensitivity_service = SensitivityAnalysisService()
@@ -0,0 +1,160 @@
+import logging
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Sequence
+
+from sqlalchemy import Float, and_, column, func, inspect, literal_column, select, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.services.scenario_registry import PARAMETER_NAMES
+
+logger = logging.getLogger(__name__)
+
+TABLE_NAME = "policy_simulations"
+
+# Numeric JSON fields exposed as generated columns: name -> (JSON column, key)
+ANALYTICS_FIELDS = {
+    **{name: ("parameters", name) for name in PARAMETER_NAMES},
+    "implementation_cost": ("predicted_outcomes", "implementation_cost"),
+    "roi_years": ("predicted_outcomes", "roi_years"),
+    "sector_impact_score": ("predicted_outcomes", "sector_impact_score"),
+    "indirect_jobs": ("predicted_outcomes", "indirect_jobs"),
+}
+
+AGGREGATES = ("count", "sum", "avg", "min", "max", "median")
+PERIODS = {"day": ("%Y-%m-%d", "YYYY-MM-DD"), "month": ("%Y-%m", "YYYY-MM"), "year": ("%Y", "YYYY")}
+MAX_ANALYTICS_ROWS = 1000
+
+def generated_column(field: str) -> str:
+    return f"analytics_{field}"
+
+def _json_number(dialect: str, source: str, key: str) -> str:
+    if dialect == "postgresql":
+        return f"(({source} ->> '{key}')::double precision)"
+    return f"json_extract({source}, '$.{key}')"
+
+class SimulationAnalytics:
+    """Aggregate queries over every saved simulation, evaluated in SQL.
+
+    Numeric parameters and outcomes live inside the ``parameters`` and
+    ``predicted_outcomes`` JSON columns. ``ensure_schema`` adds one generated
+    column per ANALYTICS_FIELDS entry plus indexes, so filters, grouping and
+    ordering read indexed columns instead of parsing JSON per row. Where
+    generated columns are unavailable queries fall back to JSON extraction.
+    """
+
+    def __init__(self):
+        self.generated: set = set()
+
+    def ensure_schema(self, engine: Engine) -> None:
+        """Add missing generated columns and indexes (idempotent startup DDL)"""
+        dialect = engine.dialect.name
+        if dialect not in ("sqlite", "postgresql"):
+            logger.warning(f"Simulation analytics uses JSON extraction on {dialect}")
+            return
+
+        inspector = inspect(engine)
+        if not inspector.has_table(TABLE_NAME):
+            return
+        existing = {item["name"] for item in inspector.get_columns(TABLE_NAME)}
+        kind = "STORED" if dialect == "postgresql" else "VIRTUAL"
+
+        with engine.begin() as connection:
+            for field, (source, key) in ANALYTICS_FIELDS.items():
+                name = generated_column(field)
+                if name not in existing:
+                    connection.execute(text(
+                        f"ALTER TABLE {TABLE_NAME} ADD COLUMN {name} DOUBLE PRECISION "
+                        f"GENERATED ALWAYS AS ({_json_number(dialect, source, key)}) {kind}"
+                    ))
+                connection.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS ix_{TABLE_NAME}_scenario_{field} "
+                    f"ON {TABLE_NAME} (scenario_name, {name})"
+                ))
+            connection.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_{TABLE_NAME}_scenario_created "
+                f"ON {TABLE_NAME} (scenario_name, created_at)"
+            ))
+        self.generated = set(ANALYTICS_FIELDS)
+        logger.info("Simulation analytics columns and indexes are in place")
+
+    def _field(self, dialect: str, field: str):
+        if field not in ANALYTICS_FIELDS:
+            raise ValueError(f"Unknown field: {field}. Available: {list(ANALYTICS_FIELDS)}")
+        if field in self.generated:
+            return column(generated_column(field), Float)
+        source, key = ANALYTICS_FIELDS[field]
+        return literal_column(_json_number(dialect, source, key), Float)
+
+    def _group(self, dialect: str, name: str, bucket: float):
+        if name in ("scenario_name", "user_id"):
+            return column(name)
+        if name in PERIODS:
+            if dialect == "postgresql":
+                return func.to_char(column("created_at"), PERIODS[name][1])
+            return func.strftime(PERIODS[name][0], column("created_at"))
+        if name in PARAMETER_NAMES:
+            # Floor, not a cast: integer casts round on PostgreSQL and truncate negatives toward zero
+            return func.floor(self._field(dialect, name) / bucket) * bucket
+        raise ValueError(
+            f"Cannot group by {name}. Use scenario_name, user_id, {', '.join(PERIODS)} or a parameter"
+        )
+
+    def aggregate(self, db: Session, metric: str = "count", field: Optional[str] = None, group_by: Sequence[str] = ("scenario_name",), scenario_name: Optional[str] = None, since: Optional[datetime] = None, until: Optional[datetime] = None, bucket: float = 5.0, order: str = "desc", limit: int = 100) -> List[Dict[str, Any]]:
+        """Group saved simulations and aggregate one numeric field per group.
+
+        ``metric`` is one of AGGREGATES (``count`` needs no field). Parameters
+        in ``group_by`` are bucketed ``bucket`` wide, so grouping by all three
+        sliders and ordering by count finds the most-run parameter region.
+        Rows come back ordered by value.
+        """
+        if metric not in AGGREGATES:
+            raise ValueError(f"Metric must be one of: {list(AGGREGATES)}")
+        if metric != "count" and not field:
+            raise ValueError(f"Metric {metric} needs a field")
+        if bucket <= 0:
+            raise ValueError("Bucket width must be positive")
+        if order not in ("asc", "desc"):
+            raise ValueError("Order must be 'asc' or 'desc'")
+        limit = max(1, min(limit, MAX_ANALYTICS_ROWS))
+
+        dialect = db.get_bind().dialect.name
+        groups = {name: self._group(dialect, name, bucket).label(name) for name in dict.fromkeys(group_by)}
+        value = self._field(dialect, field) if field else None
+
+        conditions = []
+        if scenario_name:
+            conditions.append(column("scenario_name") == scenario_name)
+        if since:
+            conditions.append(column("created_at") >= since)
+        if until:
+            conditions.append(column("created_at") < until)
+        if value is not None:
+            conditions.append(value.isnot(None))
+        source = table(TABLE_NAME)
+
+        if metric == "median":
+            # Middle row(s) of each group by window rank; portable across SQLite and PostgreSQL
+            partition = list(groups.values())
+            ranked = select(
+                *partition,
+                value.label("value"),
+                func.row_number().over(partition_by=[group.element for group in partition] or None, order_by=value).label("rank"),
+                func.count().over(partition_by=[group.element for group in partition] or None).label("total"),
+            ).select_from(source).where(and_(*conditions)).subquery()
+            keys = [ranked.c[name] for name in groups]
+            middle = ranked.c.rank.in_([(ranked.c.total + 1) // 2, (ranked.c.total + 2) // 2])
+            aggregated = func.avg(ranked.c.value)
+            query = select(*keys, aggregated.label("value"), func.max(ranked.c.total).label("count")).where(middle)
+        else:
+            keys = list(groups.values())
+            aggregated = func.count() if metric == "count" else getattr(func, metric)(value)
+            query = select(*keys, aggregated.label("value"), func.count().label("count")).select_from(source).where(and_(*conditions))
+
+        if keys:
+            query = query.group_by(*keys)
+        query = query.order_by(aggregated.desc() if order == "desc" else aggregated.asc()).limit(limit)
+        return [dict(row._mapping) for row in db.execute(query)]
+
+# Initialize simulation analytics; generated columns are added at startup
+simulation_analytics = SimulationAnalytics()
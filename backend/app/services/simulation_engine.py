@@ -1,100 +1,26 @@
-import math
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Mapping
 import logging
+import numpy as np
 from app.schemas.simulation import SimulationParameters
+from app.services.projection import project_outcomes, DEFAULT_PROJECTION_SETTINGS
+from app.services.scenario_registry import PARAMETER_NAMES, scenario_registry
+from app.services.regional_baselines import regional_baselines
+from app.services.input_output import input_output_model
 
 logger = logging.getLogger(__name__)
 
+SIMULATION_MODES = ("snapshot", "projection")
+
 class PolicySimulationEngine:
     """Engine for running policy impact simulations"""
     
     @staticmethod
-    def simulate_education_subsidy_increase(params: SimulationParameters) -> Dict[str, Any]:
-        """Simulate education subsidy increase policy"""
-        try:
-            # Base values (simplified model)
-            base_beneficiaries = 10000000
-            base_literacy_rate = 74.0
-            base_budget = 50000000000  # 50B
-            
-            # Calculate impacts based on parameters
-            subsidy_multiplier = 1 + (params.subsidy_increase_percent / 100)
-            budget_multiplier = 1 + (params.budget_allocation_percent / 100)
-            expansion_multiplier = 1 + (params.beneficiary_expansion_percent / 100)
-            
-            # Projected outcomes
-            new_beneficiaries = int(base_beneficiaries * expansion_multiplier * 0.3)
-            implementation_cost = int(base_budget * budget_multiplier * subsidy_multiplier * 0.15)
-            literacy_improvement = min(params.subsidy_increase_percent * 0.5, 25.0)  # Cap at 25%
-            roi_years = max(3.0, 8.0 - (params.budget_allocation_percent / 10))
-            budget_deficit_increase = params.budget_allocation_percent * 0.6
-            
-            return {
-                "beneficiaries_gained": new_beneficiaries,
-                "budget_deficit_increase": round(budget_deficit_increase, 2),
-                "implementation_cost": implementation_cost,
-                "literacy_improvement": round(literacy_improvement, 2),
-                "roi_years": round(roi_years, 1),
-                "sector_impact_score": round(min(95.0, 60 + params.subsidy_increase_percent * 0.8), 1)
-            }
-            
-        except Exception as e:
-            logger.error(f"Education simulation failed: {e}")
-            return PolicySimulationEngine._get_default_outcomes()
-    
-    @staticmethod
-    def simulate_healthcare_infrastructure_expansion(params: SimulationParameters) -> Dict[str, Any]:
-        """Simulate healthcare infrastructure expansion"""
-        try:
-            # Base calculations for healthcare expansion
-            budget_allocation = params.budget_allocation_percent
-            
-            new_hospitals = int(budget_allocation * 8)  # 8 hospitals per % of budget
-            new_clinics = int(budget_allocation * 25)   # 25 clinics per % of budget
-            jobs_created = int((new_hospitals * 150) + (new_clinics * 25))
-            improved_access_percent = min(budget_allocation * 1.2, 30.0)
-            implementation_cost = int(budget_allocation * 2500000000)  # 2.5B per %
-            roi_years = max(5.0, 12.0 - (budget_allocation / 5))
-            
-            return {
-                "new_hospitals": new_hospitals,
-                "new_clinics": new_clinics,
-                "jobs_created": jobs_created,
-                "improved_access_percent": round(improved_access_percent, 1),
-                "implementation_cost": implementation_cost,
-                "roi_years": round(roi_years, 1),
-                "sector_impact_score": round(min(90.0, 50 + budget_allocation * 1.5), 1)
-            }
-            
-        except Exception as e:
-            logger.error(f"Healthcare simulation failed: {e}")
-            return PolicySimulationEngine._get_default_outcomes()
-    
-    @staticmethod
-    def simulate_agricultural_support_program(params: SimulationParameters) -> Dict[str, Any]:
-        """Simulate agricultural support program"""
-        try:
-            subsidy_increase = params.subsidy_increase_percent
-            budget_allocation = params.budget_allocation_percent
-            
-            farmers_benefited = int(budget_allocation * 50000)  # 50k farmers per %
-            crop_yield_increase = min(subsidy_increase * 0.8, 40.0)
-            food_security_improvement = min(budget_allocation * 0.6, 20.0)
-            implementation_cost = int(budget_allocation * 1800000000)  # 1.8B per %
-            roi_years = max(2.0, 6.0 - (subsidy_increase / 15))
-            
-            return {
-                "farmers_benefited": farmers_benefited,
-                "crop_yield_increase_percent": round(crop_yield_increase, 1),
-                "food_security_improvement_percent": round(food_security_improvement, 1),
-                "implementation_cost": implementation_cost,
-                "roi_years": round(roi_years, 1),
-                "sector_impact_score": round(min(85.0, 55 + subsidy_increase * 0.9), 1)
-            }
-            
-        except Exception as e:
-            logger.error(f"Agriculture simulation failed: {e}")
-            return PolicySimulationEngine._get_default_outcomes()
+    def _evaluate_single(scenario_name: str, params: SimulationParameters) -> Dict[str, Any]:
+        """Evaluate a compiled scenario for one parameter set and return plain Python values"""
+        scenario = scenario_registry.get(scenario_name)
+        arrays = {name: np.asarray(float(getattr(params, name)), dtype=np.float64) for name in PARAMETER_NAMES}
+        outcomes = scenario.evaluate(arrays)
+        return {key: np.asarray(value).item() for key, value in outcomes.items()}
     
     @staticmethod
     def _get_default_outcomes() -> Dict[str, Any]:
@@ -108,49 +34,230 @@ class PolicySimulationEngine:
         }
     
     @staticmethod
-    def run_simulation(scenario_name: str, parameters: SimulationParameters) -> Dict[str, Any]:
-        """Run simulation based on scenario name"""
-        simulation_map = {
-            "education_subsidy_increase": PolicySimulationEngine.simulate_education_subsidy_increase,
-            "healthcare_infrastructure_expansion": PolicySimulationEngine.simulate_healthcare_infrastructure_expansion,
-            "agricultural_support_program": PolicySimulationEngine.simulate_agricultural_support_program,
-        }
+    def run_simulation(scenario_name: str, parameters: SimulationParameters, mode: str = "snapshot", projection: Mapping[str, Any] = None) -> Dict[str, Any]:
+        """Run simulation based on scenario name.
+
+        ``mode="projection"`` adds a year-by-year ``projection`` of cost,
+        beneficiaries and discounted returns; ``projection`` overrides the
+        DEFAULT_PROJECTION_SETTINGS.
+        """
+        if mode not in SIMULATION_MODES:
+            raise ValueError(f"Mode must be one of: {list(SIMULATION_MODES)}")
         
-        simulation_func = simulation_map.get(scenario_name)
-        if not simulation_func:
+        outcomes = PolicySimulationEngine._run_snapshot(scenario_name, parameters)
+        if mode == "projection":
+            outcomes["projection"] = PolicySimulationEngine.projection_series(scenario_name, outcomes, projection)
+        return outcomes
+    
+    @staticmethod
+    def projection_series(scenario_name: str, outcomes: Mapping[str, Any], projection: Mapping[str, Any] = None) -> Dict[str, Any]:
+        """Year-by-year projection of single-point outcomes as JSON-friendly lists"""
+        series = PolicySimulationEngine._project(scenario_name, outcomes, projection)
+        return {key: PolicySimulationEngine.to_jsonable(value) for key, value in series.items()}
+    
+    @staticmethod
+    def _run_snapshot(scenario_name: str, parameters: SimulationParameters) -> Dict[str, Any]:
+        """Evaluate a single-point simulation with the scenario's compiled formulas"""
+        if scenario_registry.get(scenario_name) is None:
             logger.error(f"Unknown simulation scenario: {scenario_name}")
             return PolicySimulationEngine._get_default_outcomes()
         
-        return simulation_func(parameters)
+        try:
+            return PolicySimulationEngine._evaluate_single(scenario_name, parameters)
+            
+        except Exception as e:
+            logger.error(f"Simulation of {scenario_name} failed: {e}")
+            return PolicySimulationEngine._get_default_outcomes()
+    
+    @staticmethod
+    def run_batch(scenario_name: str, params: Mapping[str, Any], constants: Mapping[str, Any] = None, mode: str = "snapshot", projection: Mapping[str, Any] = None) -> Dict[str, Any]:
+        """Run a scenario over array-shaped parameters in a single vectorized pass.
+
+        ``params`` maps parameter names to scalars or array-likes; they are
+        broadcast against each other and missing names take the
+        SimulationParameters defaults. Every outcome comes back as an array of
+        the broadcast shape, holding the same numbers run_simulation would
+        produce for each element. ``constants`` optionally overrides the
+        scenario definition's constants, again with scalars or broadcastable
+        arrays. ``mode="projection"`` adds yearly series shaped years x batch
+        shape.
+        """
+        if mode not in SIMULATION_MODES:
+            raise ValueError(f"Mode must be one of: {list(SIMULATION_MODES)}")
+        
+        outcomes = PolicySimulationEngine._run_kernel(scenario_name, params, constants)
+        if mode == "projection":
+            outcomes["projection"] = PolicySimulationEngine._project(scenario_name, outcomes, projection)
+        return outcomes
     
     @staticmethod
-    def get_simulation_assumptions(scenario_name: str) -> List[str]:
-        """Get assumptions for each simulation type"""
-        assumptions_map = {
-            "education_subsidy_increase": [
-                "Current enrollment trends continue",
-                "Infrastructure capacity can support expansion", 
-                "Teacher recruitment meets demand",
-                "No major economic disruptions",
-                "Policy implementation is effective"
-            ],
-            "healthcare_infrastructure_expansion": [
-                "Healthcare worker availability scales with infrastructure",
-                "Land acquisition costs remain stable",
-                "No major regulatory changes",
-                "Population health trends continue",
-                "Equipment and technology costs remain predictable"
-            ],
-            "agricultural_support_program": [
-                "Weather patterns remain within normal ranges",
-                "Market prices for crops remain stable",
-                "Farmer adoption rates meet expectations",
-                "No major pest or disease outbreaks",
-                "Distribution systems function effectively"
-            ]
+    def _run_kernel(scenario_name: str, params: Mapping[str, Any], constants: Mapping[str, Any] = None) -> Dict[str, Any]:
+        """Evaluate a compiled scenario over broadcast parameters and constants"""
+        arrays = PolicySimulationEngine._broadcast_parameters(params)
+        
+        scenario = scenario_registry.get(scenario_name)
+        if not scenario:
+            logger.error(f"Unknown simulation scenario: {scenario_name}")
+            return PolicySimulationEngine._get_default_batch_outcomes(arrays[0].shape)
+        
+        constants = dict(constants or {})
+        unknown = set(constants) - set(scenario.constants)
+        if unknown:
+            raise ValueError(f"Unknown constants for {scenario_name}: {sorted(unknown)}")
+        
+        outcomes = scenario.evaluate(dict(zip(PARAMETER_NAMES, arrays)), constants)
+        shape = np.broadcast_shapes(arrays[0].shape, *(np.shape(value) for value in constants.values()))
+        return {key: np.broadcast_to(value, shape) for key, value in outcomes.items()}
+    
+    @staticmethod
+    def run_regional(scenario_name: str, params: Mapping[str, Any]) -> Dict[str, Any]:
+        """Evaluate a scenario for every state/UT in one vectorized pass.
+
+        The scenario's ``regional`` formulas turn national constants into one
+        value per region; parameters may be scalars or arrays, with the region
+        axis first in every outcome. ``national`` rolls regions up: count
+        outcomes are summed and the rest are population-weighted means.
+        """
+        scenario = scenario_registry.get(scenario_name)
+        if not scenario:
+            raise ValueError(f"No simulation model for scenario: {scenario_name}")
+        
+        param_ndim = max((np.ndim(value) for value in params.values()), default=0)
+        params = {name: np.asarray(value, dtype=np.float64)[np.newaxis, ...] for name, value in params.items()}
+        constants = {
+            name: np.reshape(values, (-1,) + (1,) * param_ndim)
+            for name, values in scenario.regionalize(regional_baselines.columns()).items()
+        }
+        shape = (len(regional_baselines),) + np.broadcast_shapes(*(value.shape[1:] for value in params.values()))
+        outcomes = {
+            key: np.broadcast_to(value, shape)
+            for key, value in PolicySimulationEngine._run_kernel(scenario_name, params, constants).items()
         }
         
-        return assumptions_map.get(scenario_name, ["General economic assumptions apply"])
+        return {"regions": outcomes, "national": PolicySimulationEngine.rollup_regions(outcomes)}
+    
+    @staticmethod
+    def rollup_regions(outcomes: Mapping[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """National totals of per-region outcomes (region axis first).
+
+        Count outcomes are summed; the rest are population-weighted means.
+        """
+        population = regional_baselines.columns()["population"]
+        national = {}
+        for key, values in outcomes.items():
+            if values.dtype.kind in "iu":
+                national[key] = values.sum(axis=0)
+            else:
+                weights = population.reshape((-1,) + (1,) * (values.ndim - 1))
+                national[key] = (values * weights).sum(axis=0) / population.sum()
+        return national
+    
+    @staticmethod
+    def run_spillover(scenario_name: str, params: Mapping[str, Any]) -> Dict[str, Any]:
+        """Per-sector output and jobs induced by one parameter set's spending.
+
+        The scenario's ``spillover`` section names the spending outcome and how
+        it splits across sectors; the input-output model propagates it through
+        supplier purchases.
+        """
+        scenario = scenario_registry.get(scenario_name)
+        if not scenario:
+            raise ValueError(f"No simulation model for scenario: {scenario_name}")
+        if not scenario.spillover:
+            raise ValueError(f"Scenario {scenario_name} has no spillover model")
+        
+        outcomes = PolicySimulationEngine._run_kernel(scenario_name, params)
+        spending = float(outcomes[scenario.spillover["spending"]])
+        return {
+            "spending": spending,
+            "sectors": input_output_model.breakdown(scenario.sector_shares, spending),
+            "indirect_output": int(outcomes["indirect_output"]),
+            "indirect_jobs": int(outcomes["indirect_jobs"]),
+            "output_multiplier": round((spending + int(outcomes["indirect_output"])) / spending, 3) if spending else 0.0,
+        }
+    
+    @staticmethod
+    def _project(scenario_name: str, outcomes: Mapping[str, Any], projection: Mapping[str, Any] = None) -> Dict[str, np.ndarray]:
+        """Project snapshot outcomes (scalars or arrays) over the configured horizon"""
+        options = dict(DEFAULT_PROJECTION_SETTINGS)
+        options.update(projection or {})
+        scenario = scenario_registry.get(scenario_name)
+        beneficiaries = outcomes.get(scenario.beneficiary_outcome, 0) if scenario else 0
+        return project_outcomes(
+            outcomes["implementation_cost"],
+            beneficiaries,
+            outcomes["roi_years"],
+            **options
+        )
+    
+    @staticmethod
+    def to_jsonable(value: Any) -> Any:
+        """Convert an array or numpy scalar to JSON-friendly Python values (NaN becomes None)"""
+        array = np.asarray(value)
+        if array.dtype.kind == "f" and np.isnan(array).any():
+            array = np.where(np.isnan(array), None, array)
+        return array.tolist()
+    
+    @staticmethod
+    def run_sweep(scenario_name: str, axes: Mapping[str, Any], fixed: Mapping[str, Any] = None) -> Dict[str, Any]:
+        """Evaluate a scenario over the full grid spanned by ``axes``.
+
+        Each axis maps a parameter name to its 1-D sample points; outcomes are
+        arrays indexed in axis order (``indexing="ij"``). Parameters not swept
+        are taken from ``fixed``.
+        """
+        points = [np.asarray(values, dtype=np.float64) for values in axes.values()]
+        if any(axis.ndim != 1 for axis in points):
+            raise ValueError("Sweep axes must be one-dimensional")
+        
+        params = {name: value for name, value in (fixed or {}).items() if name not in axes}
+        params.update(zip(axes, np.meshgrid(*points, indexing="ij")))
+        return PolicySimulationEngine.run_batch(scenario_name, params)
+    
+    @staticmethod
+    def _broadcast_parameters(params: Mapping[str, Any]) -> List[np.ndarray]:
+        """Validate batch parameters and broadcast them to a common shape"""
+        unknown = set(params) - set(PARAMETER_NAMES)
+        if unknown:
+            raise ValueError(f"Unknown simulation parameters: {sorted(unknown)}")
+        
+        defaults = SimulationParameters().dict()
+        arrays = []
+        for name in PARAMETER_NAMES:
+            values = np.asarray(params.get(name, defaults[name]), dtype=np.float64)
+            if not np.all(np.isfinite(values)) or np.any((values < 0) | (values > 100)):
+                raise ValueError(f"{name} values must be between 0 and 100")
+            arrays.append(values)
+        
+        return list(np.broadcast_arrays(*arrays))
+    
+    @staticmethod
+    def _get_default_batch_outcomes(shape) -> Dict[str, Any]:
+        """Default outcomes broadcast over a batch when simulation fails"""
+        defaults = PolicySimulationEngine._get_default_outcomes()
+        return {
+            key: value if isinstance(value, str) else np.full(shape, value)
+            for key, value in defaults.items()
+        }
+    
+    @staticmethod
+    def get_scenario_catalog() -> List[Dict[str, Any]]:
+        """Get metadata (sliders and headline outcomes) for the available scenarios"""
+        return scenario_registry.catalog()
+    
+    @staticmethod
+    def get_parameter_bounds(scenario_name: str) -> Dict[str, tuple]:
+        """Get the (min, max) slider range of each parameter a scenario exposes"""
+        scenario = scenario_registry.get(scenario_name)
+        return scenario.parameter_bounds if scenario else {}
+    
+    @staticmethod
+    def get_simulation_assumptions(scenario_name: str) -> List[str]:
+        """Get assumptions for each simulation type"""
+        scenario = scenario_registry.get(scenario_name)
+        if scenario and scenario.assumptions:
+            return scenario.assumptions
+        return ["General economic assumptions apply"]
 
 # Initialize simulation engine
-simulation_engine = PolicySimulationEngine()
\ No newline at end of file
+simulation_engine = PolicySimulationEngine()
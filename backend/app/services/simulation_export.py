@@ -0,0 +1,144 @@
+import csv
+import io
+import json
+from typing import Any, Iterator, List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.services.scenario_registry import PARAMETER_NAMES, scenario_registry
+
+EXPORT_FORMATS = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+EXPORT_BATCH_SIZE = 1000
+
+# Row columns exported as-is, ahead of the flattened JSON columns
+BASE_COLUMNS = ("id", "scenario_name", "created_at", "confidence_level", "processing_time")
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back whatever was written since the last drain"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+class SimulationExporter:
+    """Streams a user's saved simulations as CSV or Parquet.
+
+    Rows are read through a server-side cursor ``batch_size`` at a time and
+    each batch is encoded and handed to the response before the next is
+    fetched, so memory does not grow with the number of rows. ``parameters``
+    and ``predicted_outcomes`` are flattened to ``parameters.<name>`` and
+    ``outcomes.<name>`` columns; outcome columns are the union of the
+    registered scenarios' outcomes, so every batch has the same header and
+    schema. Nested values (projection series) are written as JSON text.
+    """
+
+    def columns(self, scenario_name: Optional[str] = None) -> List[str]:
+        names = [scenario_name] if scenario_name else scenario_registry.names()
+        outcomes = []
+        for name in names:
+            scenario = scenario_registry.get(name)
+            if scenario is None:
+                raise ValueError(f"Unknown scenario: {name}")
+            outcomes.extend(scenario.outcome_names)
+        outcomes.append("projection")
+        return [
+            *BASE_COLUMNS,
+            *(f"parameters.{name}" for name in PARAMETER_NAMES),
+            *(f"outcomes.{name}" for name in dict.fromkeys(outcomes)),
+        ]
+
+    def batches(self, db: Session, model: Any, user_id: Any, scenario_name: Optional[str] = None, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[List[Any]]]:
+        """Flattened rows, oldest first, in lists of at most ``batch_size``"""
+        outcome_names = [name[len("outcomes."):] for name in self.columns(scenario_name) if name.startswith("outcomes.")]
+        query = select(
+            *(getattr(model, name) for name in BASE_COLUMNS),
+            model.parameters,
+            model.predicted_outcomes,
+        ).where(model.user_id == user_id).order_by(model.id)
+        if scenario_name:
+            query = query.where(model.scenario_name == scenario_name)
+
+        result = db.execute(query.execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            rows = []
+            for row in partition:
+                parameters = row.parameters or {}
+                outcomes = row.predicted_outcomes or {}
+                rows.append([
+                    *row[:len(BASE_COLUMNS)],
+                    *(parameters.get(name) for name in PARAMETER_NAMES),
+                    *(
+                        json.dumps(value) if isinstance(value, (dict, list)) else value
+                        for value in (outcomes.get(name) for name in outcome_names)
+                    ),
+                ])
+            yield rows
+
+    def iter_csv(self, db: Session, model: Any, user_id: Any, scenario_name: Optional[str] = None, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(self.columns(scenario_name))
+        for rows in self.batches(db, model, user_id, scenario_name, batch_size):
+            writer.writerows(
+                [value.isoformat() if hasattr(value, "isoformat") else value for value in row]
+                for row in rows
+            )
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+
+    def iter_parquet(self, db: Session, model: Any, user_id: Any, scenario_name: Optional[str] = None, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+        """Parquet file written one row group per batch"""
+        columns = self.columns(scenario_name)
+        types = {"id": pa.int64(), "created_at": pa.timestamp("us"), "processing_time": pa.float64()}
+        schema = pa.schema([
+            (name, types.get(name, pa.string() if name in BASE_COLUMNS or name == "outcomes.projection" else pa.float64()))
+            for name in columns
+        ])
+
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(sink, schema)
+        try:
+            for rows in self.batches(db, model, user_id, scenario_name, batch_size):
+                arrays = []
+                for index, field in enumerate(schema):
+                    values = [row[index] for row in rows]
+                    if pa.types.is_floating(field.type):
+                        values = [value if _is_number(value) else None for value in values]
+                    arrays.append(pa.array(values, type=field.type))
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                yield sink.drain()
+        finally:
+            writer.close()
+        yield sink.drain()
+
+    def validate(self, export_format: str, scenario_name: Optional[str] = None) -> None:
+        """Reject bad requests before any bytes are streamed"""
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Format must be one of: {list(EXPORT_FORMATS)}")
+        self.columns(scenario_name)
+
+# Initialize simulation exporter
+simulation_exporter = SimulationExporter()
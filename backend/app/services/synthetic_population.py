@@ -0,0 +1,242 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Mapping, Optional, Tuple
+import numpy as np
+
+from app.config import get_settings
+from app.services.regional_baselines import regional_baselines
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Bump when the generator changes so stored populations are regenerated
+POPULATION_FORMAT_VERSION = 1
+
+# Assumptions behind the synthetic households. Incomes are annual household
+# incomes in rupees.
+POPULATION_SETTINGS: Dict[str, Any] = {
+    "household_size": 4.8,
+    "household_income_median": 120000.0,
+    "household_income_sigma": 0.8,
+    "farm_income_factor": 0.8,
+    "landholding_median_hectares": 0.8,
+    "landholding_sigma": 0.9,
+    "people_per_district": 2200000,
+}
+
+# Heads of household with at least this much schooling count as literate
+LITERATE_SCHOOLING_YEARS = 5
+
+# Region index is encoded in the district id: district = region * stride + local district
+DISTRICT_STRIDE = 100
+
+class AgentPopulation:
+    """Synthetic households held as one NumPy column per attribute.
+
+    Columns are compact dtypes (about 11 bytes per agent), so 10M agents fit
+    in roughly 110 MB. Each agent stands for ``households_per_agent`` real
+    households; rules are evaluated as whole-column masks. Columns may be
+    read-only memory maps shared by every process that opens the same files.
+    """
+
+    COLUMNS = {
+        "income": np.float32,
+        "schooling": np.uint8,
+        "landholding": np.float32,
+        "district": np.uint16,
+    }
+
+    def __init__(self, columns: Mapping[str, np.ndarray], households: float):
+        sizes = {len(values) for values in columns.values()}
+        if set(columns) != set(self.COLUMNS) or len(sizes) != 1:
+            raise ValueError(f"Agent population needs equally long columns {list(self.COLUMNS)}")
+        self.columns = {name: np.asarray(columns[name], dtype=dtype) for name, dtype in self.COLUMNS.items()}
+        self.size = sizes.pop()
+        self.households = float(households)
+        self.households_per_agent = self.households / max(self.size, 1)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        try:
+            return self.__dict__["columns"][name]
+        except KeyError:
+            raise AttributeError(name)
+
+    @property
+    def region(self) -> np.ndarray:
+        return (self.columns["district"] // DISTRICT_STRIDE).astype(np.uint8)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(values.nbytes for values in self.columns.values())
+
+def generate_population(size: int, seed: int = 42, options: Optional[Mapping[str, Any]] = None) -> AgentPopulation:
+    """Draw households region by region from the state/UT baselines.
+
+    Region follows population share; schooling follows the region's literacy
+    rate; a household farms with the region's cultivator share and then has
+    a log-normal landholding. Draws are float32 to keep temporaries at 4
+    bytes per agent.
+    """
+    options = {**POPULATION_SETTINGS, **(options or {})}
+    rng = np.random.default_rng(seed)
+    baselines = regional_baselines.columns()
+
+    region = rng.choice(len(regional_baselines), size=size, p=baselines["population_share"]).astype(np.uint8)
+    literacy = (baselines["literacy_rate"] / 100).astype(np.float32)
+    households_by_region = baselines["population"] / options["household_size"]
+    farm_share = np.minimum(baselines["farmers"] / households_by_region, 0.9).astype(np.float32)
+    districts = np.maximum(np.round(baselines["population"] / options["people_per_district"]), 1).astype(np.float32)
+    median_income = (options["household_income_median"] * baselines["literacy_rate"] / 75).astype(np.float32)
+
+    local = (rng.random(size, dtype=np.float32) * districts[region]).astype(np.uint16)
+    district = region.astype(np.uint16) * DISTRICT_STRIDE + np.minimum(local, DISTRICT_STRIDE - 1)
+
+    literate = rng.random(size, dtype=np.float32) < literacy[region]
+    schooling = np.where(
+        literate,
+        rng.integers(LITERATE_SCHOOLING_YEARS, 16, size, dtype=np.uint8),
+        rng.integers(0, LITERATE_SCHOOLING_YEARS, size, dtype=np.uint8),
+    )
+    del literate
+
+    farms = rng.random(size, dtype=np.float32) < farm_share[region]
+    landholding = rng.standard_normal(size, dtype=np.float32)
+    landholding *= np.float32(options["landholding_sigma"])
+    np.exp(landholding, out=landholding)
+    landholding *= np.float32(options["landholding_median_hectares"])
+    landholding[~farms] = 0
+
+    income = rng.standard_normal(size, dtype=np.float32)
+    income *= np.float32(options["household_income_sigma"])
+    np.exp(income, out=income)
+    income *= median_income[region]
+    income[farms] *= np.float32(options["farm_income_factor"])
+
+    columns = {"income": income, "schooling": schooling, "landholding": landholding, "district": district}
+    return AgentPopulation(columns, households_by_region.sum())
+
+class PopulationStore:
+    """Seeded synthetic populations persisted as one ``.npy`` file per column.
+
+    A population is generated once per (agents, seed, generator inputs) into
+    a temporary directory and renamed into place, so concurrent workers never
+    see a partial write. Opening maps the files read-only: every worker
+    process shares one physical copy through the page cache, and nothing is
+    read from disk until a column is touched.
+
+    Each worker keeps at most ``open_limit`` populations mapped and the
+    directory holds at most ``store_limit``; the least recently opened are
+    dropped first. Deleting files another process still maps is safe on
+    POSIX, its mapping stays valid until released.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, directory: Optional[str] = None, options: Optional[Mapping[str, Any]] = None, open_limit: Optional[int] = None, store_limit: Optional[int] = None):
+        self.directory = directory or settings.POPULATION_DATA_DIR
+        self.options = {**POPULATION_SETTINGS, **(options or {})}
+        self.open_limit = max(1, open_limit or settings.POPULATION_OPEN_LIMIT)
+        self.store_limit = max(1, store_limit or settings.POPULATION_STORE_LIMIT)
+        self._opened: "OrderedDict[Tuple[int, int], AgentPopulation]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _digest(self, agents: int, seed: int) -> str:
+        inputs = json.dumps({
+            "version": POPULATION_FORMAT_VERSION,
+            "agents": agents,
+            "seed": seed,
+            "options": self.options,
+            "baselines": hashlib.sha256(regional_baselines.values.tobytes()).hexdigest(),
+        }, sort_keys=True)
+        return hashlib.sha256(inputs.encode()).hexdigest()[:16]
+
+    def path_for(self, agents: int, seed: int) -> str:
+        return os.path.join(self.directory, f"agents{agents}_seed{seed}_{self._digest(agents, seed)}")
+
+    def is_stored(self, agents: int, seed: int) -> bool:
+        return os.path.exists(os.path.join(self.path_for(agents, seed), self.MANIFEST))
+
+    def _prune(self, keep: str) -> None:
+        """Delete the least recently opened stored populations beyond ``store_limit``"""
+        try:
+            entries = [os.path.join(self.directory, entry) for entry in os.listdir(self.directory) if entry.startswith("agents")]
+        except FileNotFoundError:
+            return
+        stored = []
+        for path in entries:
+            try:
+                stored.append((os.path.getmtime(os.path.join(path, self.MANIFEST)), path))
+            except OSError:
+                continue
+        stored.sort(reverse=True)
+        for _, path in stored[self.store_limit:]:
+            if path != keep:
+                shutil.rmtree(path, ignore_errors=True)
+                logger.info(f"Removed stored synthetic population {path}")
+
+    def generate(self, agents: int, seed: int) -> str:
+        """Write the population's columns unless an identical one is already stored"""
+        path = self.path_for(agents, seed)
+        if os.path.exists(os.path.join(path, self.MANIFEST)):
+            return path
+
+        os.makedirs(self.directory, exist_ok=True)
+        started = time.time()
+        population = generate_population(agents, seed, self.options)
+        staging = tempfile.mkdtemp(prefix=".staging-", dir=self.directory)
+        try:
+            for name, values in population.columns.items():
+                np.save(os.path.join(staging, f"{name}.npy"), values)
+            with open(os.path.join(staging, self.MANIFEST), "w", encoding="utf-8") as handle:
+                json.dump({
+                    "agents": agents,
+                    "seed": seed,
+                    "households": population.households,
+                    "columns": {name: np.dtype(dtype).str for name, dtype in AgentPopulation.COLUMNS.items()},
+                    "options": self.options,
+                    "format_version": POPULATION_FORMAT_VERSION,
+                }, handle)
+            os.rename(staging, path)
+            logger.info(f"Stored {agents} synthetic households at {path} in {time.time() - started:.1f}s")
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            if not os.path.exists(os.path.join(path, self.MANIFEST)):
+                raise
+            # Another worker stored the same population first
+        return path
+
+    def open(self, agents: int, seed: int) -> AgentPopulation:
+        """Memory-map a stored population, generating it on first use"""
+        with self._lock:
+            population = self._opened.get((agents, seed))
+            if population is not None:
+                self._opened.move_to_end((agents, seed))
+            else:
+                path = self.generate(agents, seed)
+                manifest_path = os.path.join(path, self.MANIFEST)
+                with open(manifest_path, encoding="utf-8") as handle:
+                    manifest = json.load(handle)
+                os.utime(manifest_path)  # marks it recently used for pruning
+                columns = {
+                    name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+                    for name in AgentPopulation.COLUMNS
+                }
+                population = AgentPopulation(columns, manifest["households"])
+                self._opened[(agents, seed)] = population
+                while len(self._opened) > self.open_limit:
+                    self._opened.popitem(last=False)
+                self._prune(keep=path)
+            return population
+
+# Initialize population store; populations are generated or mapped on first use
+population_store = PopulationStore()
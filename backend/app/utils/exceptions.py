@@ -25,4 +25,8 @@ class AuthenticationException(CivicSimException):
 class ValidationException(CivicSimException):
     """Exception for validation errors"""
     def __init__(self, message: str, status_code: int = 422):
-        super().__init__(message, status_code)
\ No newline at end of file
+        super().__init__(message, status_code)
+class JobLimitException(CivicSimException):
+    """Exception for users with too many background jobs"""
+    def __init__(self, message: str, status_code: int = 429):
+        super().__init__(message, status_code)
@@ -0,0 +1,27 @@
+import os
+import tempfile
+
+import pytest
+
+# Point every data path at a scratch directory before the app reads its settings
+DATA_DIR = tempfile.mkdtemp(prefix="civicsim-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{DATA_DIR}/civicsim.db")
+os.environ.setdefault("SIMULATION_CACHE_PATH", f"{DATA_DIR}/simulation_cache.db")
+os.environ.setdefault("POPULATION_DATA_DIR", f"{DATA_DIR}/population")
+os.environ.setdefault("CALIBRATION_DIR", f"{DATA_DIR}/calibration")
+os.environ.setdefault("CALIBRATION_PATH", f"{DATA_DIR}/calibration/current.json")
+os.environ.setdefault("SIMULATION_WORKERS", "2")
+
+@pytest.fixture(scope="session")
+def client():
+    """One TestClient for the session; entering it runs the lifespan and keeps one event loop"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+@pytest.fixture
+def auth_headers():
+    # Without Firebase credentials any bearer token resolves to the development user
+    return {"Authorization": "Bearer test-token"}
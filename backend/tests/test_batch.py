@@ -0,0 +1,27 @@
+def batch_request(size, **fields):
+    return {
+        "scenario_name": "education_subsidy_increase",
+        "parameters": {"subsidy_increase_percent": [10.0] * size, "budget_allocation_percent": [5.0] * size},
+        **fields,
+    }
+
+def test_projection_batch_returns_series(client, auth_headers):
+    response = client.post("/simulation/run-batch", headers=auth_headers, json=batch_request(
+        3, mode="projection", projection={"horizon_years": 5}
+    ))
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results["count"] == 3
+    assert len(results["predicted_outcomes"]["projection"]["annual_cost"]) == 5
+
+def test_projection_batch_size_is_bounded(client, auth_headers):
+    response = client.post("/simulation/run-batch", headers=auth_headers, json=batch_request(
+        100000, mode="projection", projection={"horizon_years": 20}
+    ))
+    assert response.status_code == 422
+
+    # The same batch is fine as a snapshot
+    response = client.post("/simulation/run-batch", headers=auth_headers, json=batch_request(
+        100000, projection={"horizon_years": 20}
+    ))
+    assert response.status_code == 200
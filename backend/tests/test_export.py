@@ -0,0 +1,30 @@
+import csv
+import io
+
+import pyarrow.parquet as pq
+
+def save_run(client, auth_headers):
+    response = client.post("/simulation/run", headers=auth_headers, json={
+        "scenario_name": "infrastructure_development",
+        "parameters": {"subsidy_increase_percent": 5, "budget_allocation_percent": 15, "beneficiary_expansion_percent": 10},
+    })
+    assert response.status_code == 201
+
+def test_export_csv_and_parquet_agree(client, auth_headers):
+    save_run(client, auth_headers)
+    params = {"scenario_name": "infrastructure_development"}
+
+    response = client.get("/simulation/export", headers=auth_headers, params={**params, "format": "csv"})
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+
+    response = client.get("/simulation/export", headers=auth_headers, params={**params, "format": "parquet"})
+    assert response.status_code == 200
+    exported = pq.read_table(io.BytesIO(response.content))
+    assert exported.num_rows == len(rows) >= 1
+    assert exported.column("id").to_pylist() == [int(row["id"]) for row in rows]
+    assert exported.column("parameters.budget_allocation_percent").to_pylist()[-1] == 15
+
+def test_export_rejects_unknown_format(client, auth_headers):
+    response = client.get("/simulation/export", headers=auth_headers, params={"format": "xlsx"})
+    assert response.status_code == 400
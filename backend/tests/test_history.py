@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import text
+
+from app.database import engine
+
+def development_user_id(client, auth_headers):
+    client.get("/simulation/history", headers=auth_headers)
+    with engine.connect() as connection:
+        return connection.execute(text("SELECT id FROM users WHERE firebase_uid = 'mock_user_id'")).scalar()
+
+def insert_rows(table, user_id, count):
+    """Rows stamped like the database default: same second, no fractional part"""
+    values = {
+        "policy_simulations": "(:user_id, 'education_subsidy_increase', '{}', '{}', 'medium', '2024-01-01 10:00:00')",
+        "documents": "(:user_id, 'notice.pdf', 'application/pdf', 1, 'budget_document', 'completed', '2024-01-01 10:00:00')",
+    }
+    columns = {
+        "policy_simulations": "(user_id, scenario_name, parameters, predicted_outcomes, confidence_level, created_at)",
+        "documents": "(user_id, filename, file_type, file_size, document_type, processing_status, created_at)",
+    }
+    with engine.begin() as connection:
+        connection.execute(text(f"DELETE FROM {table} WHERE user_id = :user_id"), {"user_id": user_id})
+        for _ in range(count):
+            connection.execute(text(f"INSERT INTO {table} {columns[table]} VALUES {values[table]}"), {"user_id": user_id})
+        return [row[0] for row in connection.execute(
+            text(f"SELECT id FROM {table} WHERE user_id = :user_id ORDER BY id DESC"), {"user_id": user_id}
+        )]
+
+@pytest.mark.parametrize("table, path", [
+    ("policy_simulations", "/simulation/history"),
+    ("documents", "/documents/history"),
+])
+def test_history_pages_rows_sharing_a_timestamp(client, auth_headers, table, path):
+    expected = insert_rows(table, development_user_id(client, auth_headers), 6)
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get(path, headers=auth_headers, params=params).json()
+        seen.extend(item["id"] for item in page["items"])
+        pages += 1
+        if not page["has_more"]:
+            break
+        cursor = page["next_cursor"]
+        assert pages < 10, "pagination did not terminate"
+
+    assert seen == expected
+    assert pages == 3
+
+def test_history_rejects_bad_cursor(client, auth_headers):
+    response = client.get("/simulation/history", headers=auth_headers, params={"cursor": "not a cursor"})
+    assert response.status_code == 400
@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+
+from app.services.input_output import InputOutputModel, SECTOR_TABLE
+
+def test_sector_table_loads():
+    model = InputOutputModel(SECTOR_TABLE)
+    identity = (np.eye(len(model)) - model.coefficients) @ model.leontief
+    assert np.allclose(identity, np.eye(len(model)))
+
+def test_near_singular_table_is_rejected():
+    # Each sector uses 0.9999999 rupees of inputs per rupee: valid coefficients, useless inverse
+    table = """
+    first   0.49999995 0.49999995  1.0
+    second  0.49999995 0.49999995  1.0
+    """
+    with pytest.raises(ValueError, match="near-singular"):
+        InputOutputModel(table)
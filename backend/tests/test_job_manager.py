@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from app.config import get_settings
+from app.services.job_manager import SimulationJobManager
+from app.utils.exceptions import JobLimitException
+
+settings = get_settings()
+
+async def _wait_forever(job):
+    await asyncio.Event().wait()
+
+async def _finish(job):
+    return {"done": True}
+
+def test_cancel_before_start_then_submit():
+    async def scenario():
+        manager = SimulationJobManager(max_workers=1)
+        queue = asyncio.Queue()
+        job = manager.submit_task("task", 1, _wait_forever)
+        manager.subscribe(job.id, queue)
+        assert manager.cancel(job.id)
+        assert job.finished_at is not None
+
+        # Pruning on the next submit compares finished_at against the cutoff
+        follow_up = manager.submit_task("task", 1, _finish)
+        await follow_up.task
+        await asyncio.sleep(0)
+        return job, follow_up, [queue.get_nowait() for _ in range(queue.qsize())]
+
+    job, follow_up, messages = asyncio.run(scenario())
+    assert job.status == "cancelled"
+    assert follow_up.status == "completed"
+    assert messages[-1]["status"] == "cancelled"
+
+def test_active_jobs_per_user_are_limited():
+    async def scenario():
+        manager = SimulationJobManager(max_workers=1)
+        jobs = [manager.submit_task("task", 1, _wait_forever) for _ in range(settings.SIMULATION_JOBS_PER_USER)]
+        with pytest.raises(JobLimitException) as error:
+            manager.submit_task("task", 1, _wait_forever)
+        assert error.value.status_code == 429
+
+        # Other users are unaffected, and a cancelled job frees its slot
+        manager.submit_task("task", 2, _finish)
+        manager.cancel(jobs[0].id)
+        manager.submit_task("task", 1, _finish)
+        manager.shutdown()
+
+    asyncio.run(scenario())
+
+def test_finished_jobs_per_user_are_bounded():
+    async def scenario():
+        manager = SimulationJobManager(max_workers=1)
+        first = manager.submit_task("task", 1, _finish)
+        await first.task
+        for _ in range(settings.SIMULATION_RETAINED_JOBS_PER_USER):
+            await manager.submit_task("task", 1, _finish).task
+        return manager, first
+
+    manager, first = asyncio.run(scenario())
+    retained = [job for job in manager.jobs.values() if job.user_id == 1]
+    assert len(retained) == settings.SIMULATION_RETAINED_JOBS_PER_USER
+    assert manager.get(first.id) is None
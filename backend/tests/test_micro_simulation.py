@@ -0,0 +1,29 @@
+import os
+
+from app.services.synthetic_population import PopulationStore
+
+def test_population_store_bounds_opened_and_stored(tmp_path):
+    store = PopulationStore(directory=str(tmp_path), open_limit=1, store_limit=2)
+    for seed in (1, 2, 3):
+        store.open(1000, seed)
+
+    assert list(store._opened) == [(1000, 3)]
+    stored = sorted(entry for entry in os.listdir(tmp_path) if entry.startswith("agents"))
+    assert len(stored) == 2
+    assert store.is_stored(1000, 3)
+
+def test_micro_rejects_unlisted_population_for_users(client, auth_headers):
+    response = client.post("/simulation/micro", headers=auth_headers, json={
+        "scenario_name": "education_subsidy_increase",
+        "agents": 12345,
+        "seed": 99,
+    })
+    assert response.status_code == 403
+
+def test_micro_runs_listed_population(client, auth_headers):
+    response = client.post("/simulation/micro", headers=auth_headers, json={
+        "scenario_name": "agricultural_support_program",
+        "agents": 100000,
+    })
+    assert response.status_code == 200
+    assert response.json()["results"]["agents"] == 100000
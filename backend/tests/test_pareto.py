@@ -0,0 +1,31 @@
+import numpy as np
+
+from app.services.pareto import _front_3d, _front_nd
+
+def test_three_objective_sweep_matches_reference():
+    # Few distinct values give many ties and exact duplicates
+    points = np.random.default_rng(3).integers(0, 6, size=(3000, 3)).astype(np.float64)
+    assert sorted(_front_3d(points)) == sorted(_front_nd(points))
+
+def test_three_objective_sweep_keeps_a_full_antichain():
+    x = np.arange(50000, dtype=np.float64)
+    points = np.column_stack((x, -x, x))  # every point is non-dominated
+    assert len(_front_3d(points)) == len(points)
+
+def test_pareto_endpoint_caps_frontier(client, auth_headers):
+    response = client.post("/simulation/pareto", headers=auth_headers, json={
+        "scenario_names": ["education_subsidy_increase"],
+        "objectives": [
+            {"outcome": "implementation_cost", "direction": "minimize"},
+            {"outcome": "sector_impact_score", "direction": "maximize"},
+            {"outcome": "beneficiaries_gained", "direction": "maximize"},
+        ],
+        "samples": 20000,
+        "max_points": 25,
+    })
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert len(results["frontier"]) <= 25
+    assert results["truncated"] == (results["frontier_size"] > 25)
+    costs = [point["outcomes"]["implementation_cost"] for point in results["frontier"]]
+    assert costs == sorted(costs)
@@ -0,0 +1,28 @@
+import json
+
+from sqlalchemy import text
+
+from app.database import SessionLocal, engine
+from app.services.simulation_analytics import simulation_analytics
+
+SCENARIO = "analytics_bucket_check"
+
+def test_parameter_buckets_floor(client):
+    # .5 boundaries would round up under an integer cast; negatives would truncate toward zero
+    values = [7.5, 5.0, 12.5, 4.99, -2.5]
+    with engine.begin() as connection:
+        connection.execute(text("DELETE FROM policy_simulations WHERE scenario_name = :scenario"), {"scenario": SCENARIO})
+        for value in values:
+            connection.execute(text(
+                "INSERT INTO policy_simulations (user_id, scenario_name, parameters, predicted_outcomes, confidence_level, created_at) "
+                "VALUES (0, :scenario, :parameters, '{}', 'medium', '2024-01-01 10:00:00')"
+            ), {"scenario": SCENARIO, "parameters": json.dumps({"subsidy_increase_percent": value})})
+
+    db = SessionLocal()
+    try:
+        rows = simulation_analytics.aggregate(
+            db, group_by=["subsidy_increase_percent"], scenario_name=SCENARIO, bucket=5.0
+        )
+    finally:
+        db.close()
+    assert {row["subsidy_increase_percent"]: row["count"] for row in rows} == {-5.0: 1, 0.0: 1, 5.0: 2, 10.0: 1}
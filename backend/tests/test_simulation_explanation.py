@@ -0,0 +1,30 @@
+from app.services.ai_service import ai_service
+
+RUN = {
+    "scenario_name": "healthcare_infrastructure_expansion",
+    "parameters": {"subsidy_increase_percent": 33, "budget_allocation_percent": 17, "beneficiary_expansion_percent": 9},
+}
+
+def test_explanation_is_generated_once_and_shared_by_identical_runs(client, auth_headers, monkeypatch):
+    calls = []
+
+    async def explain(scenario_name, parameters, outcomes):
+        calls.append(scenario_name)
+        return f"Explanation {len(calls)}"
+
+    monkeypatch.setattr(ai_service, "explain_policy_simulation", explain)
+
+    first = client.post("/simulation/run", headers=auth_headers, json=RUN).json()
+    assert first["results"]["ai_explanation"] is None
+    assert calls == []
+
+    explained = client.get(f"/simulation/{first['simulation_id']}/explanation", headers=auth_headers).json()
+    assert explained["ai_explanation"] == "Explanation 1"
+    again = client.get(f"/simulation/{first['simulation_id']}/explanation", headers=auth_headers).json()
+    assert again["ai_explanation"] == "Explanation 1" and again["cached"]
+
+    # An identical run is saved with the explanation already cached for it
+    second = client.post("/simulation/run", headers=auth_headers, json=RUN).json()
+    assert second["results"]["cached"]
+    assert second["results"]["ai_explanation"] == "Explanation 1"
+    assert len(calls) == 1
@@ -0,0 +1,16 @@
+import json
+
+def test_sweep_streams_grid(client, auth_headers):
+    response = client.post("/simulation/sweep", headers=auth_headers, json={
+        "scenario_name": "education_subsidy_increase",
+        "ranges": {
+            "subsidy_increase_percent": {"start": 0, "stop": 50, "steps": 11},
+            "budget_allocation_percent": {"start": 1, "stop": 20, "steps": 5},
+        },
+    })
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[0]["type"] == "header" and lines[0]["shape"] == [11, 5]
+    assert [line["index"] for line in lines[1:-1]] == list(range(11))
+    assert all(len(values) == 5 for values in lines[1]["outcomes"].values())
+    assert lines[-1] == {"type": "end", "cells": 55}
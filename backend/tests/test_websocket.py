@@ -0,0 +1,103 @@
+import json
+
+def receive_until(websocket, predicate, limit=200):
+    for _ in range(limit):
+        message = json.loads(websocket.receive_text())
+        if predicate(message):
+            return message
+    raise AssertionError("Expected WebSocket message never arrived")
+
+def test_websocket_echo(client):
+    with client.websocket_connect("/ws") as websocket:
+        websocket.send_text(json.dumps({"type": "ping"}))
+        assert json.loads(websocket.receive_text())["type"] == "echo"
+
+def test_monte_carlo_job_progress_over_websocket(client, auth_headers):
+    response = client.post("/simulation/jobs/monte-carlo", headers=auth_headers, json={
+        "scenario_name": "education_subsidy_increase",
+        "parameters": {"subsidy_increase_percent": 20, "budget_allocation_percent": 10, "beneficiary_expansion_percent": 5},
+        "samples": 200000,
+        "seed": 7,
+    })
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    with client.websocket_connect("/ws") as websocket:
+        websocket.send_text(json.dumps({"type": "subscribe_job", "job_id": job_id, "token": "test-token"}))
+        first = json.loads(websocket.receive_text())
+        assert first["type"] == "job_progress" and first["job_id"] == job_id
+        final = receive_until(websocket, lambda message: message.get("status") in ("completed", "failed", "cancelled"))
+    assert final["status"] == "completed"
+
+def simulate_frame(seq, **fields):
+    return json.dumps({
+        "type": "simulate",
+        "seq": seq,
+        "scenario_name": "education_subsidy_increase",
+        "parameters": {"subsidy_increase_percent": seq, "budget_allocation_percent": 10, "beneficiary_expansion_percent": 0},
+        **fields,
+    })
+
+def test_live_simulation_coalesces_queued_frames(client):
+    with client.websocket_connect("/ws") as websocket:
+        for seq in range(20):
+            websocket.send_text(simulate_frame(seq))
+        reply = json.loads(websocket.receive_text())
+        assert reply["type"] == "outcomes"
+        assert reply["seq"] == 19
+        assert reply["skipped_frames"] == 19
+        assert reply["predicted_outcomes"]["implementation_cost"] > 0
+
+def test_live_simulation_regional_frame(client):
+    with client.websocket_connect("/ws") as websocket:
+        websocket.send_text(simulate_frame(1, regional=True))
+        reply = json.loads(websocket.receive_text())
+        assert reply["type"] == "outcomes"
+        assert set(reply["predicted_outcomes"]) == {"regions", "national"}
+
+def test_live_simulation_commit_saves_run(client):
+    with client.websocket_connect("/ws") as websocket:
+        websocket.send_text(json.dumps({
+            "type": "commit",
+            "seq": 3,
+            "token": "test-token",
+            "scenario_name": "education_subsidy_increase",
+            "parameters": {"subsidy_increase_percent": 15, "budget_allocation_percent": 10, "beneficiary_expansion_percent": 0},
+        }))
+        reply = json.loads(websocket.receive_text())
+    assert reply["type"] == "committed" and reply["seq"] == 3
+    assert reply["simulation_id"]
+
+def test_background_run_notifies_subscriber(client, auth_headers):
+    response = client.post("/simulation/run?background=true", headers=auth_headers, json={
+        "scenario_name": "social_welfare_enhancement",
+        "parameters": {"subsidy_increase_percent": 12, "budget_allocation_percent": 10, "beneficiary_expansion_percent": 5},
+    })
+    assert response.status_code == 202
+    body = response.json()
+    assert body["results"]["predicted_outcomes"]["implementation_cost"] > 0
+    job_id = body["job"]["job_id"]
+
+    with client.websocket_connect("/ws") as websocket:
+        websocket.send_text(json.dumps({"type": "subscribe_job", "job_id": job_id, "token": "test-token"}))
+        final = receive_until(websocket, lambda message: message.get("status") in ("completed", "failed", "cancelled"))
+    assert final["status"] == "completed"
+    assert final["summary"]["simulation_id"]
+    assert final["summary"]["ai_explanation"]
+
+def test_job_subscription_requires_owner(client, auth_headers):
+    response = client.post("/simulation/run?background=true", headers=auth_headers, json={
+        "scenario_name": "social_welfare_enhancement",
+        "parameters": {"subsidy_increase_percent": 8, "budget_allocation_percent": 10, "beneficiary_expansion_percent": 5},
+    })
+    job_id = response.json()["job"]["job_id"]
+
+    from app.services.job_manager import job_manager
+    job = job_manager.get(job_id)
+    owner, job.user_id = job.user_id, -1  # someone else's job
+    try:
+        with client.websocket_connect("/ws") as websocket:
+            websocket.send_text(json.dumps({"type": "subscribe_job", "job_id": job_id, "token": "test-token"}))
+            assert json.loads(websocket.receive_text()) == {"type": "error", "message": "Unknown simulation job"}
+    finally:
+        job.user_id = owner
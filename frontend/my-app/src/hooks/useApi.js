@@ -57,8 +57,8 @@ export const useDocumentVerification = () => {
     }, { successMessage: "Document verification completed!" });
   }, [execute]);
 
-  const getDocumentHistory = useCallback((skip = 0, limit = 20) => {
-    return execute(() => api.documents.getHistory(skip, limit));
+  const getDocumentHistory = useCallback((cursor = null, limit = 20) => {
+    return execute(() => api.documents.getHistory(cursor, limit));
   }, [execute]);
 
   return {
@@ -110,8 +110,8 @@ export const usePolicySimulation = () => {
     return execute(() => api.simulation.getScenarios());
   }, [execute]);
 
-  const getSimulationHistory = useCallback((skip = 0, limit = 20) => {
-    return execute(() => api.simulation.getHistory(skip, limit));
+  const getSimulationHistory = useCallback((cursor = null, limit = 20) => {
+    return execute(() => api.simulation.getHistory(cursor, limit));
   }, [execute]);
 
   return {
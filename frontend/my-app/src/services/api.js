@@ -106,7 +106,7 @@ export const api = {
       }
     },
 
-    getHistory: (skip = 0, limit = 20) => apiClient.get(`/documents/history?skip=${skip}&limit=${limit}`)
+    getHistory: (cursor = null, limit = 20) => apiClient.get(`/documents/history`, { params: { cursor, limit } })
   },
 
   // Dashboard endpoints
@@ -120,7 +120,7 @@ export const api = {
   simulation: {
     run: (simulationData) => apiClient.post('/simulation/run', simulationData),
     getScenarios: () => apiClient.get('/simulation/scenarios'),
-    getHistory: (skip = 0, limit = 20) => apiClient.get(`/simulation/history?skip=${skip}&limit=${limit}`)
+    getHistory: (cursor = null, limit = 20) => apiClient.get(`/simulation/history`, { params: { cursor, limit } })
   },
 
   // Feedback endpoints